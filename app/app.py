@@ -1,12 +1,138 @@
-from flask import Flask, render_template, request
-import pickle
+from flask import Flask, render_template, request, jsonify
+import os
+import json
+import numpy as np
 import pandas as pd
-from data_preprocess import preprocess_transactions, load_model
+import threading
+from batching import MicroBatcher
+from data_preprocess import preprocess_transactions, transform_transactions, load_preprocessor, INPUT_COLUMNS
+from feature_store import load_feature_store
+from inference import load_backend
+from model_registry import load_registered_model
 
 app = Flask(__name__)
 
-# Load the model when starting the app
-model = load_model()
+# Load the fitted preprocessor once when starting the app. The model comes from the model
+# registry (models/) and the customer feature store from customer_features.db on first use,
+# see get_backend() and get_feature_store()
+preprocessor = load_preprocessor()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+_feature_store = None
+_feature_store_pid = None
+_feature_store_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    Return the inference backend (chosen by INFERENCE_BACKEND, see inference.py) for the
+    current registry model, loading it on first use. gunicorn.conf.py calls it in the master
+    process so that the preloaded model is shared by the forked workers.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = load_backend(load_registered_model())
+    return _backend
+
+
+def get_feature_store():
+    """
+    Return this process's customer feature store (None without customer_features.db), opened
+    on first use and again in each forked gunicorn worker: unlike the model, a SQLite
+    connection must not be shared across fork(), so it is never opened in the master.
+    """
+    global _feature_store, _feature_store_pid
+    with _feature_store_lock:
+        if _feature_store_pid != os.getpid():
+            _feature_store = load_feature_store()
+            _feature_store_pid = os.getpid()
+    return _feature_store
+
+
+def parse_batch_request(req):
+    """
+    Parse a batch scoring request body into a list of transaction records.
+
+    Accepts either a JSON array of objects, a JSON object with a 'transactions'
+    array, or NDJSON (one JSON object per line, Content-Type application/x-ndjson).
+    """
+    if req.mimetype in ('application/x-ndjson', 'application/ndjson'):
+        lines = req.get_data(as_text=True).splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+
+    payload = req.get_json(force=True)
+    if isinstance(payload, dict):
+        payload = payload.get('transactions')
+    if not isinstance(payload, list):
+        raise ValueError("Expected a JSON array of transactions or an object with a 'transactions' array.")
+    return payload
+
+
+def prepare_features(df, request_ids=None):
+    """
+    Build model features, applying the fitted preprocessor when one was saved at training
+    time and falling back to refitting on the request otherwise.
+
+    When the customer feature store is available, the per-customer aggregates are read from
+    it, with the request's transactions that have not been ingested yet folded in, so they
+    cover the customer's history and not only the rows in the request. Scoring never writes
+    to the store; transactions are added through the /transactions endpoint.
+
+    request_ids (one per row) marks the requests of a micro-batch, which are featurized as if
+    they had been sent on their own.
+    """
+    aggregate_features = None
+    feature_store = get_feature_store()
+    if feature_store is not None:
+        aggregate_features = feature_store.lookup_pending(df, request_ids)
+
+    if preprocessor is not None:
+        return transform_transactions(df, preprocessor, aggregate_features, request_ids)
+    if request_ids is None:
+        return preprocess_transactions(df, aggregate_features)
+    # The refit path scales over the rows it is given, so each request is preprocessed on its own
+    return pd.concat([
+        preprocess_transactions(part, None if aggregate_features is None else
+                                aggregate_features[aggregate_features['RequestId'] == request_id])
+        for request_id, part in df.groupby(request_ids, sort=False)
+    ])
+
+
+def score_batch(frames):
+    """
+    Score the transactions of several requests with a single preprocess and inference backend call.
+    Each request is featurized as if it had been sent alone: its customer aggregates come from
+    the feature store plus its own pending transactions (CustomerFeatureStore.lookup_pending).
+
+    Returns:
+        list of numpy.ndarray: Probability of the positive class for each request, in its row order.
+    """
+    df = pd.concat([frame[INPUT_COLUMNS] for frame in frames], ignore_index=True)
+    sizes = [len(frame) for frame in frames]
+    request_ids = np.repeat(np.arange(len(frames)), sizes) if len(frames) > 1 else None
+    scores = get_backend().predict_proba(prepare_features(df, request_ids))
+    return np.split(scores, np.cumsum(sizes)[:-1])
+
+
+# Micro-batching of concurrent scoring calls (see batching.py), enabled by setting BATCH_WINDOW_MS.
+# It pays off when a worker serves requests concurrently, e.g. gunicorn with GUNICORN_THREADS > 1
+BATCH_WINDOW_MS = os.environ.get('BATCH_WINDOW_MS')
+batcher = MicroBatcher(score_batch, float(BATCH_WINDOW_MS), int(os.environ.get('BATCH_MAX_ROWS', 4096))) if BATCH_WINDOW_MS else None
+
+
+def score_transactions(df):
+    """
+    Score a DataFrame of transactions, through the micro-batcher when it is enabled.
+
+    Returns:
+        numpy.ndarray: Probability of the positive class, in the input row order.
+    """
+    if batcher is None:
+        return score_batch([df])[0]
+    return batcher.score(df)
 
 
 @app.route('/', methods=['GET', 'POST'])
@@ -53,10 +179,8 @@ def index():
 
         df = input_features.drop(['BatchId', 'AccountId', 'SubscriptionId', 'CurrencyCode', 'CountryCode', 'ChannelId', 'ProviderId','ProductId', 'ProductCategory'], axis=1)
 
-        X = preprocess_transactions(df)
-
         # Make prediction
-        prediction = model.predict(X)[0]
+        prediction = int(score_transactions(df)[0] >= 0.5)
 
         # Render the result.html template
         return render_template('result.html', transaction_id=transaction_id, batch_id=batch_id,
@@ -69,5 +193,50 @@ def index():
 
     return render_template('index.html')
 
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        records = parse_batch_request(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if not records:
+        return jsonify({'predictions': []})
+
+    df = pd.DataFrame.from_records(records)
+    missing = [col for col in INPUT_COLUMNS if col not in df.columns]
+    if missing:
+        return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
+
+    scores = score_transactions(df)
+    predictions = [
+        {'TransactionId': transaction_id, 'score': float(score), 'prediction': int(score >= 0.5)}
+        for transaction_id, score in zip(df['TransactionId'].tolist(), scores)
+    ]
+    return jsonify({'predictions': predictions})
+
+@app.route('/transactions', methods=['POST'])
+def ingest_transactions():
+    """
+    Add transactions to the customer feature store, in the batch endpoint's body formats.
+    Transactions are keyed on TransactionId, so a retried call does not count them twice.
+    """
+    feature_store = get_feature_store()
+    if feature_store is None:
+        return jsonify({'error': 'No customer feature store is configured.'}), 503
+    try:
+        records = parse_batch_request(request)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    df = pd.DataFrame.from_records(records)
+    missing = [col for col in ['TransactionId', 'CustomerId', 'Amount'] if col not in df.columns]
+    if records and missing:
+        return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
+
+    ingested = feature_store.ingest(df) if records else 0
+    return jsonify({'ingested': ingested, 'duplicates': len(records) - ingested})
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,90 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+# Queued in place of a request to stop the batching thread
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Micro-batching scheduler for concurrent scoring calls.
+
+    Callers submit their rows and wait on a future. A background thread takes the queued
+    requests until `window_ms` milliseconds have passed since the first one or `max_rows`
+    rows are waiting, scores them all with one `score_batch(items)` call (which returns one
+    result per item) and resolves each caller's future with its own result.
+    """
+
+    def __init__(self, score_batch, window_ms=5.0, max_rows=4096):
+        self.score_batch = score_batch
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Started on first use, and again in each forked worker, since threads do not survive a fork
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._thread.start()
+            return self._queue
+
+    def submit(self, item):
+        """Queue `item` (anything with a length, e.g. a DataFrame) for the next batch and return its future."""
+        future = Future()
+        self._ensure_started().put((item, future))
+        return future
+
+    def score(self, item):
+        """Submit `item` and wait for its result."""
+        return self.submit(item).result()
+
+    def close(self):
+        """Stop the batching thread once the queued requests are scored."""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(_STOP)
+                self._thread.join()
+            self._thread = None
+
+    def _collect(self, requests):
+        """Take queued requests into the batch until the window closes or it is full."""
+        rows = len(requests[0][0])
+        deadline = time.monotonic() + self.window
+        while rows < self.max_rows:
+            try:
+                request = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return False
+            requests.append(request)
+            rows += len(request[0])
+        return True
+
+    def _run(self):
+        running = True
+        while running:
+            request = self._queue.get()
+            if request is _STOP:
+                break
+            requests = [request]
+            running = self._collect(requests)
+
+            items, futures = zip(*requests)
+            try:
+                results = self.score_batch(list(items))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
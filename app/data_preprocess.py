@@ -1,22 +1,26 @@
+import os
+import json
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler, LabelEncoder, KBinsDiscretizer
+from time_features import add_time_features, parse_timestamps, time_components
 
-def preprocess_transactions(df):
-    # Aggregate features by CustomerId
-    aggregate_features = df.groupby('CustomerId').agg(
-        Total_Transaction_Amount=('Amount', 'sum'),
-        Average_Transaction_Amount=('Amount', 'mean'),
-        Transaction_Count=('TransactionId', 'count')
-    ).reset_index()
+# Transaction columns used by the preprocessing; everything else is dropped
+INPUT_COLUMNS = ['TransactionId', 'CustomerId', 'Amount', 'Value', 'TransactionStartTime', 'PricingStrategy']
 
-    # Convert 'TransactionStartTime' to datetime
-    df['TransactionStartTime'] = pd.to_datetime(df['TransactionStartTime'])
+def preprocess_transactions(df, aggregate_features=None):
+    # Aggregate features by CustomerId, unless they come from the customer feature store
+    if aggregate_features is None:
+        aggregate_features = df.groupby('CustomerId').agg(
+            Total_Transaction_Amount=('Amount', 'sum'),
+            Average_Transaction_Amount=('Amount', 'mean'),
+            Transaction_Count=('TransactionId', 'count')
+        ).reset_index()
+    else:
+        aggregate_features = aggregate_features[['CustomerId', 'Total_Transaction_Amount', 'Average_Transaction_Amount', 'Transaction_Count']]
 
-    # Extract features from 'TransactionStartTime'
-    df['Transaction_Hour'] = df['TransactionStartTime'].dt.hour
-    df['Transaction_Day'] = df['TransactionStartTime'].dt.day
-    df['Transaction_Month'] = df['TransactionStartTime'].dt.month
-    df['Transaction_Year'] = df['TransactionStartTime'].dt.year
+    # Parse 'TransactionStartTime' and extract the hour, day, month and year the model was trained on
+    df = add_time_features(df, weekday=False)
 
     # Merge aggregate features with the original dataframe
     final_df = df.merge(aggregate_features, on='CustomerId', how='left')
@@ -47,11 +51,11 @@ def preprocess_transactions(df):
     # Fill missing values
     for column in final_df.select_dtypes(include=['float64', 'int64']).columns:
         median_value = final_df[column].median()
-        final_df[column].fillna(0, inplace=True)
+        final_df[column] = final_df[column].fillna(0)
 
     for column in final_df.select_dtypes(include=['object']).columns:
         mode_value = final_df[column].mode()[0]
-        final_df[column].fillna(mode_value, inplace=True)
+        final_df[column] = final_df[column].fillna(mode_value)
 
     # Binning RFMS Score into discrete categories
     n_bins = 5  # Number of bins
@@ -64,40 +68,105 @@ def preprocess_transactions(df):
     return X
 
 
-import gdown
-import pickle
-import os
-
-def download_file_from_google_drive(file_id, destination):
+def transform_transactions(df, preprocessor, aggregate_features=None, request_ids=None):
     """
-    Downloads a file from Google Drive using gdown.
-
-    Args:
-        file_id (str): The Google Drive file ID.
-        destination (str): The local file path where the downloaded file will be saved.
+    Transform raw transactions into model features using a preprocessor fitted at training time
+    (see src/feature_engineering.py::fit_serving_preprocessor).
+
+    Nothing is refit per request: the stored vocabulary, min/max ranges and RFMS bin edges are
+    applied with a handful of vectorized NumPy operations. If aggregate_features (one row per
+    CustomerId, e.g. from the customer feature store) is given, it replaces the aggregates
+    computed over the rows in the request; if it also has a Last_Transaction_Year column, that
+    year is used for Recency instead of the customer's latest year in the request. With
+    request_ids, aggregate_features may hold one row per RequestId and CustomerId instead.
+
+    request_ids (one per row) marks the requests in a micro-batch: per-customer values are then
+    computed within each request, so every request gets the features it would get on its own.
     """
-    url = f"https://drive.google.com/uc?id={file_id}"
-    
-    # Use gdown to download the file from Google Drive
-    gdown.download(url, destination, quiet=False)
+    min_max = preprocessor['min_max']
+    features = {}
+    last_years = None
+
+    if request_ids is None:
+        customer_codes, customer_ids = pd.factorize(df['CustomerId'])
+    else:
+        customer_codes, groups = pd.factorize(pd.MultiIndex.from_arrays([request_ids, df['CustomerId']]))
+        customer_ids = groups.get_level_values(1)
+    amount = df['Amount'].to_numpy(dtype='float64')
+    if aggregate_features is None:
+        # Per-customer aggregates over the rows in the request
+        counts = np.bincount(customer_codes).astype('float64')
+        totals = np.bincount(customer_codes, weights=amount)
+        averages = totals / counts
+    else:
+        if request_ids is not None and 'RequestId' in aggregate_features:
+            # Aggregates looked up per request (see CustomerFeatureStore.lookup_pending)
+            aggregates = aggregate_features.set_index(['RequestId', 'CustomerId']).reindex(groups)
+        else:
+            aggregates = aggregate_features.set_index('CustomerId').reindex(customer_ids)
+        counts = aggregates['Transaction_Count'].to_numpy(dtype='float64')
+        totals = aggregates['Total_Transaction_Amount'].to_numpy(dtype='float64')
+        averages = aggregates['Average_Transaction_Amount'].to_numpy(dtype='float64')
+        if 'Last_Transaction_Year' in aggregates:
+            last_years = aggregates['Last_Transaction_Year'].to_numpy(dtype='float64')
+
+    # Time features
+    features.update(time_components(parse_timestamps(df['TransactionStartTime']), weekday=False))
+
+    # Label encoding with the fitted vocabulary; unseen categories become missing
+    classes = np.asarray(preprocessor['pricing_strategy_classes'])
+    pricing = df['PricingStrategy'].astype(str).to_numpy()
+    pricing_codes = np.searchsorted(classes, pricing).clip(max=len(classes) - 1)
+    features['PricingStrategy'] = np.where(classes[pricing_codes] == pricing, pricing_codes, np.nan)
+
+    features['Amount'] = amount
+    features['Value'] = df['Value'].to_numpy(dtype='float64')
+    features['Total_Transaction_Amount'] = totals[customer_codes]
+    features['Average_Transaction_Amount'] = averages[customer_codes]
+    features['Transaction_Count'] = counts[customer_codes]
+
+    for col in preprocessor['scaled_columns']:
+        col_min, col_max = min_max[col]
+        features[col] = (features[col] - col_min) / ((col_max - col_min) or 1.0)
+
+    # RFMS components normalized with the training ranges
+    if last_years is not None:
+        features['Recency'] = last_years[customer_codes]
+    else:
+        recency = np.full(len(customer_ids), np.iinfo('int64').min)
+        np.maximum.at(recency, customer_codes, features['Transaction_Year'].astype('int64'))
+        features['Recency'] = recency[customer_codes]
+    features['Frequency'] = features['Transaction_Count']
+    features['Monetary'] = features['Total_Transaction_Amount']
+    for col in ['Recency', 'Frequency', 'Monetary']:
+        col_min, col_max = min_max[col]
+        if col_max == col_min:
+            # Constant in training, where the 0/0 became missing and was filled with 0
+            features[col] = np.full(len(df), np.nan)
+        else:
+            features[col] = (features[col] - col_min) / (col_max - col_min)
+    features['RFMS_Score'] = (features['Recency'] + features['Frequency'] + features['Monetary']) / 3
+
+    # Fill missing values, then bin the RFMS score with the fitted edges
+    for col in features:
+        features[col] = np.where(np.isnan(features[col]), 0, features[col])
+    features['RFMS_Binned'] = np.searchsorted(preprocessor['rfms_bin_edges'], features['RFMS_Score'], side='right').astype('float64')
+
+    X = pd.DataFrame(features, index=df.index)[preprocessor['feature_columns']]
+
+    return X
 
 
-def load_model():
+def load_preprocessor(preprocessor_path=None):
     """
-    Checks if the model file exists locally. If not, downloads it from Google Drive.
+    Loads the fitted serving preprocessor saved next to the model (or at preprocessor_path), if there is one.
 
     Returns:
-        The loaded model object.
+        dict or None: The fitted preprocessing parameters, or None when preprocessor.json is missing.
     """
-    model_path = 'xgb_model.pkl'
-    
-    # If the model doesn't exist locally, download it
-    if not os.path.exists(model_path):
-        file_id = '1A2B3C4D5EF6GHIJKL'  # Replace with your actual file ID from Google Drive
-        download_file_from_google_drive(file_id, model_path)
-
-    # Load the model using pickle
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
-    
-    return model
+    preprocessor_path = preprocessor_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preprocessor.json')
+    if not os.path.exists(preprocessor_path):
+        return None
+
+    with open(preprocessor_path) as f:
+        return json.load(f)
@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+
+# Aggregate columns served by the store, named as in src/feature_engineering.py::create_aggregate_features
+AGGREGATE_COLUMNS = [
+    'Total_Transaction_Amount', 'Average_Transaction_Amount', 'Transaction_Count', 'Std_Deviation_Transaction_Amount'
+]
+
+# SQLite limits the number of bound parameters per statement
+MAX_QUERY_PARAMS = 500
+
+
+# The two functions below are also used by src/feature_engineering.py, so that training and
+# serving aggregate amounts the same way
+def amount_aggregates(amounts, by):
+    """Count, total, mean and sum of squared deviations (M2) of the amounts in each group."""
+    groups = amounts.astype('float64').groupby(by, observed=True)
+    new = pd.DataFrame({'count': groups.count(), 'total': groups.sum(), 'mean': groups.mean()})
+    new['m2'] = groups.var(ddof=0) * new['count']
+    return new
+
+def merge_amount_aggregates(old, new):
+    """Merge two aligned amount aggregates (Chan et al.'s pairwise update)."""
+    count = old['count'] + new['count']
+    delta = new['mean'] - old['mean']
+    weight = (new['count'] / count).fillna(0)
+    return pd.DataFrame({
+        'count': count,
+        'total': old['total'] + new['total'],
+        'mean': old['mean'] + delta * weight,
+        'm2': old['m2'] + new['m2'] + (delta ** 2 * old['count'] * weight).fillna(0),
+    })
+
+def _aggregate_frame(state):
+    """The served aggregate columns from a running state (count, total, mean, m2)."""
+    count = state['count'].to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.where(count > 1, np.sqrt(state['m2'].to_numpy(dtype='float64') / (count - 1)), np.nan)
+    return pd.DataFrame({
+        'Total_Transaction_Amount': state['total'].to_numpy(dtype='float64'),
+        'Average_Transaction_Amount': state['mean'].to_numpy(dtype='float64'),
+        'Transaction_Count': count,
+        'Std_Deviation_Transaction_Amount': std,
+    })
+
+
+class CustomerFeatureStore:
+    """
+    Per-customer transaction aggregates persisted in SQLite and keyed by CustomerId.
+
+    Each customer keeps a running count, sum, mean and sum of squared deviations (M2).
+    New transactions are folded in incrementally with Welford's update (in its batched
+    form, Chan et al.), so a lookup is a primary-key read instead of a groupby over the
+    customer's history.
+
+    The connection is shared by the threads of a worker (GUNICORN_THREADS > 1); every use
+    of it holds the store's lock, so a lookup never runs inside another thread's write
+    transaction.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        if path != ':memory:':
+            # Let readers in other workers proceed while one of them writes
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS customer_aggregates ('
+            'CustomerId TEXT PRIMARY KEY, '
+            'count INTEGER NOT NULL, '
+            'total REAL NOT NULL, '
+            'mean REAL NOT NULL, '
+            'm2 REAL NOT NULL)'
+        )
+        # TransactionIds already folded into the aggregates, so that each is counted once
+        self.conn.execute('CREATE TABLE IF NOT EXISTS ingested_transactions (TransactionId TEXT PRIMARY KEY)')
+
+    def _fetch_state(self, keys):
+        """Fetch the running state for the given (string) keys as a DataFrame indexed by key."""
+        rows = []
+        for start in range(0, len(keys), MAX_QUERY_PARAMS):
+            chunk = keys[start:start + MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(self.conn.execute(
+                f'SELECT CustomerId, count, total, mean, m2 FROM customer_aggregates WHERE CustomerId IN ({placeholders})',
+                chunk,
+            ).fetchall())
+        state = pd.DataFrame(rows, columns=['CustomerId', 'count', 'total', 'mean', 'm2']).set_index('CustomerId')
+        return state.reindex(keys)
+
+    def _seen_transactions(self, transaction_ids):
+        """The subset of the given (string) TransactionIds that have already been ingested."""
+        seen = set()
+        for start in range(0, len(transaction_ids), MAX_QUERY_PARAMS):
+            chunk = transaction_ids[start:start + MAX_QUERY_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            seen.update(row[0] for row in self.conn.execute(
+                f'SELECT TransactionId FROM ingested_transactions WHERE TransactionId IN ({placeholders})',
+                chunk,
+            ))
+        return seen
+
+    def ingest(self, df):
+        """
+        Fold new transactions (TransactionId, CustomerId, Amount) into the stored aggregates.
+
+        Transactions are keyed on TransactionId: one that was already ingested, or that appears
+        twice in df, is only counted once, so retried or replayed batches leave the aggregates
+        unchanged.
+
+        Returns:
+            int: Number of transactions added.
+        """
+        batch = df[['TransactionId', 'CustomerId', 'Amount']].dropna(subset=['Amount'])
+        transaction_ids = batch['TransactionId'].astype(str)
+        first = ~transaction_ids.duplicated()
+        batch, transaction_ids = batch[first], transaction_ids[first]
+        if batch.empty:
+            return 0
+
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                new_rows = ~transaction_ids.isin(self._seen_transactions(transaction_ids.tolist())).to_numpy()
+                batch, transaction_ids = batch[new_rows], transaction_ids[new_rows]
+                if not batch.empty:
+                    new = amount_aggregates(batch['Amount'], batch['CustomerId'].astype(str))
+                    keys = new.index.tolist()
+                    merged = merge_amount_aggregates(self._fetch_state(keys).fillna(0), new)
+                    self.conn.executemany(
+                        'INSERT INTO ingested_transactions (TransactionId) VALUES (?)',
+                        ((transaction_id,) for transaction_id in transaction_ids),
+                    )
+                    self.conn.executemany(
+                        'INSERT OR REPLACE INTO customer_aggregates (CustomerId, count, total, mean, m2) VALUES (?, ?, ?, ?, ?)',
+                        zip(keys, merged['count'].astype('int64').tolist(), merged['total'].tolist(),
+                            merged['mean'].tolist(), merged['m2'].tolist()),
+                    )
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+        return len(batch)
+
+    def lookup(self, customer_ids):
+        """
+        Look up the aggregates for the given customers.
+
+        Returns:
+            pandas.DataFrame: One row per distinct CustomerId (in order of first appearance) with
+            the aggregate columns; customers without history get NaN.
+        """
+        customer_ids = pd.unique(pd.Series(customer_ids))
+        with self._lock:
+            state = self._fetch_state([str(customer_id) for customer_id in customer_ids])
+        return _aggregate_frame(state).assign(CustomerId=customer_ids)[['CustomerId'] + AGGREGATE_COLUMNS]
+
+    def lookup_pending(self, df, request_ids=None):
+        """
+        Look up the aggregates for the customers of df as if its transactions were ingested,
+        without writing anything: transactions of df that the store has not seen yet are
+        folded into the stored aggregates in memory, so scoring a transaction gives the same
+        features before and after it is ingested, and however often it is scored.
+
+        request_ids (one per row) marks the requests of a micro-batch; each request then only
+        sees its own pending transactions.
+
+        Returns:
+            pandas.DataFrame: One row per distinct CustomerId (per RequestId when request_ids is
+            given, as a RequestId column) with the aggregate columns.
+        """
+        requests = np.zeros(len(df), dtype='int64') if request_ids is None else np.asarray(request_ids)
+        keys = df['CustomerId'].astype(str).to_numpy()
+        transaction_ids = df['TransactionId'].astype(str).to_numpy()
+        pairs = pd.DataFrame({'RequestId': requests, 'key': keys, 'CustomerId': df['CustomerId'].to_numpy()})
+        pairs = pairs.drop_duplicates(['RequestId', 'key'])
+
+        pending = pd.DataFrame({'RequestId': requests, 'key': keys, 'TransactionId': transaction_ids,
+                                'Amount': df['Amount'].to_numpy(dtype='float64')})
+        pending = pending.dropna(subset=['Amount']).drop_duplicates(['RequestId', 'TransactionId'])
+        with self._lock:
+            seen = self._seen_transactions(pd.unique(pending['TransactionId']).tolist())
+            state = self._fetch_state(pd.unique(pairs['key']).tolist())
+        pending = pending[~pending['TransactionId'].isin(seen)]
+
+        index = pd.MultiIndex.from_frame(pairs[['RequestId', 'key']])
+        new = amount_aggregates(pending['Amount'], [pending['RequestId'], pending['key']]).reindex(index).fillna(0)
+        old = state.reindex(pairs['key']).fillna(0).set_axis(index)
+        merged = merge_amount_aggregates(old, new)
+        merged.loc[merged['count'] == 0] = np.nan
+
+        aggregates = _aggregate_frame(merged).assign(CustomerId=pairs['CustomerId'].to_numpy())
+        if request_ids is None:
+            return aggregates[['CustomerId'] + AGGREGATE_COLUMNS]
+        return aggregates.assign(RequestId=pairs['RequestId'].to_numpy())[['RequestId', 'CustomerId'] + AGGREGATE_COLUMNS]
+
+    def clear(self):
+        """Remove all stored aggregates and ingested TransactionIds (e.g. before rebuilding from the full history)."""
+        with self._lock:
+            self.conn.execute('DELETE FROM customer_aggregates')
+            self.conn.execute('DELETE FROM ingested_transactions')
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def load_feature_store():
+    """
+    Opens the customer feature store saved next to the model, if there is one.
+
+    Returns:
+        CustomerFeatureStore or None: The store, or None when customer_features.db is missing.
+    """
+    store_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'customer_features.db')
+    if not os.path.exists(store_path):
+        return None
+
+    return CustomerFeatureStore(store_path)
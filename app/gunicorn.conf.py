@@ -0,0 +1,17 @@
+# gunicorn settings for the app (picked up by `gunicorn app:app` run from this directory)
+import os
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Threads per worker; with more than one, BATCH_WINDOW_MS micro-batches their concurrent requests
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+# Import the app in the master process, before forking the workers
+preload_app = True
+
+
+def when_ready(server):
+    # Load the registry model in the master too: the forked workers share its memory
+    # copy-on-write instead of each loading their own copy. Only the read-only model is
+    # preloaded; each worker opens its own feature store connection (get_feature_store)
+    from app import get_backend
+    get_backend()
@@ -0,0 +1,58 @@
+import os
+import numpy as np
+
+# Backend used when INFERENCE_BACKEND is not set
+DEFAULT_BACKEND = 'inplace'
+
+
+class SklearnBackend:
+    """Scores through the scikit-learn wrapper (XGBClassifier.predict_proba), which builds a DMatrix per call."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)[:, 1]
+
+    def predict(self, X, threshold=0.5):
+        return (self.predict_proba(X) >= threshold).astype(int)
+
+
+class InplaceBackend(SklearnBackend):
+    """
+    Low-latency path: calls Booster.inplace_predict on a float32 NumPy array in the model's
+    feature order, skipping the wrapper and the DMatrix construction.
+    """
+
+    def __init__(self, model, n_threads=None):
+        super().__init__(model)
+        self.booster = model.get_booster()
+        if n_threads:
+            self.booster.set_param({'nthread': n_threads})
+        self.feature_names = self.booster.feature_names
+        # Only the trees the wrapper would use (best_iteration when early stopping was used)
+        best_iteration = getattr(model, 'best_iteration', None)
+        self.iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+
+    def predict_proba(self, X):
+        if self.feature_names is not None and hasattr(X, 'columns'):
+            X = X[self.feature_names]
+        values = np.ascontiguousarray(X, dtype=np.float32)
+        return self.booster.inplace_predict(values, iteration_range=self.iteration_range, validate_features=False)
+
+
+# Available inference backends by name
+BACKENDS = {
+    'sklearn': SklearnBackend,
+    'inplace': InplaceBackend,
+}
+
+def load_backend(model, name=None):
+    """
+    Wrap the loaded model in an inference backend: `name`, else the INFERENCE_BACKEND
+    environment variable, else DEFAULT_BACKEND.
+    """
+    name = name or os.environ.get('INFERENCE_BACKEND', DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}'; expected one of {', '.join(BACKENDS)}.")
+    return BACKENDS[name](model)
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+import xgboost as xgb
+
+# Registry used by the app: a manifest plus one native XGBoost model file per version
+REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+MANIFEST_FILE = 'manifest.json'
+MODEL_FORMATS = ['ubj', 'json']
+
+
+# Function to compute the SHA-256 checksum of a file
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Versioned XGBoost models stored in XGBoost's native UBJSON/JSON format, with a manifest
+    holding each version's file, feature schema and SHA-256 checksum.
+
+    Loading never unpickles: the checksum is verified and the file is read with
+    XGBClassifier.load_model. Models are loaded on first use and then cached, so under
+    gunicorn's preload_app the master loads them once and the forked workers share them.
+    """
+
+    def __init__(self, registry_dir=REGISTRY_DIR):
+        self.registry_dir = registry_dir
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.registry_dir, MANIFEST_FILE)
+
+    def exists(self):
+        return os.path.exists(self.manifest_path)
+
+    def read_manifest(self):
+        if not self.exists():
+            return {'current': None, 'versions': {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        # Write to a temporary file and rename it, so readers never see a partial manifest
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def register(self, model, version=None, model_format='ubj', make_current=True):
+        """
+        Save a fitted XGBClassifier as a new version and record it in the manifest.
+
+        Returns:
+            str: The registered version.
+        """
+        if model_format not in MODEL_FORMATS:
+            raise ValueError(f"Unknown model format '{model_format}'; expected one of {', '.join(MODEL_FORMATS)}.")
+        manifest = self.read_manifest()
+        if version is None:
+            version = max((int(v) for v in manifest['versions'] if v.isdigit()), default=0) + 1
+        version = str(version)
+        if version in manifest['versions']:
+            raise ValueError(f"Model version '{version}' is already registered.")
+
+        os.makedirs(self.registry_dir, exist_ok=True)
+        filename = f'xgb_model-v{version}.{model_format}'
+        path = os.path.join(self.registry_dir, filename)
+        model.save_model(path)
+
+        booster = model.get_booster()
+        manifest['versions'][version] = {
+            'file': filename,
+            'format': model_format,
+            'sha256': file_sha256(path),
+            'feature_names': booster.feature_names,
+            'feature_types': booster.feature_types,
+            'xgboost_version': xgb.__version__,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        if make_current or manifest['current'] is None:
+            manifest['current'] = version
+        self._write_manifest(manifest)
+        return version
+
+    def load(self, version=None):
+        """
+        Load a registered version (the current one by default), verifying its checksum and
+        feature schema against the manifest. Loaded models are cached.
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+            version = str(version or manifest['current'])
+            if version in self._models:
+                return self._models[version]
+            if version not in manifest['versions']:
+                raise ValueError(f"Model version '{version}' is not registered in {self.manifest_path}.")
+
+            entry = manifest['versions'][version]
+            path = os.path.join(self.registry_dir, entry['file'])
+            if file_sha256(path) != entry['sha256']:
+                raise ValueError(f"Checksum mismatch for {path}; the model file does not match the manifest.")
+
+            model = xgb.XGBClassifier()
+            model.load_model(path)
+            if entry['feature_names'] is not None and model.get_booster().feature_names != entry['feature_names']:
+                raise ValueError(f"Feature schema of {path} does not match the manifest.")
+
+            self._models[version] = model
+            return model
+
+
+# Shared registry of the app models
+registry = ModelRegistry()
+
+def load_registered_model(version=None):
+    """Load a model from the app registry (the current version by default)."""
+    return registry.load(version)
+
+
+if __name__ == '__main__':
+    # Convert a trusted legacy pickle (e.g. xgb_model.pkl) into a registry version
+    parser = argparse.ArgumentParser(description='Register a pickled XGBClassifier in the model registry.')
+    parser.add_argument('pickle_path')
+    parser.add_argument('--version')
+    parser.add_argument('--format', default='ubj', choices=MODEL_FORMATS)
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR)
+    args = parser.parse_args()
+
+    import pickle
+    with open(args.pickle_path, 'rb') as f:
+        model = pickle.load(f)
+    version = ModelRegistry(args.registry_dir).register(model, args.version, args.format)
+    print(f'Registered {args.pickle_path} as version {version} in {args.registry_dir}', file=sys.stderr)
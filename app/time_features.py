@@ -0,0 +1,151 @@
+"""
+Time features of transaction timestamps, shared by the training code and the app.
+
+It lives in app/ so that the deployed app stays self-contained; the training code
+in src/ imports it from here.
+"""
+import numpy as np
+import pandas as pd
+
+# Fixed-width timestamps as in the Xente data, e.g. '2018-11-15T02:18:49Z': separator bytes
+# by position, and the (start, stop) positions of year, month, day, hour, minute and second
+TIMESTAMP_WIDTH = 20
+TIMESTAMP_SEPARATORS = {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':', 19: 'Z'}
+TIMESTAMP_FIELDS = [(0, 4), (5, 7), (8, 10), (11, 13), (14, 16), (17, 19)]
+
+# Period of the features that get cyclical (sin/cos) encodings
+CYCLE_PERIODS = {'Transaction_Hour': 24, 'Transaction_Weekday': 7, 'Transaction_Month': 12}
+
+# Ticks per second of each datetime64 unit
+TICKS_PER_SECOND = {'s': 1, 'ms': 10 ** 3, 'us': 10 ** 6, 'ns': 10 ** 9}
+
+def days_from_civil(year, month, day):
+    """Days since 1970-01-01 of proleptic Gregorian dates (H. Hinnant's algorithm, vectorized)."""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+def civil_from_days(days):
+    """Year, month and day of days since 1970-01-01 (inverse of days_from_civil)."""
+    days = days + 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    shifted_month = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * shifted_month + 2) // 5 + 1
+    month = shifted_month + np.where(shifted_month < 10, 3, -9)
+    year = year_of_era + era * 400 + (month <= 2)
+    return year, month, day
+
+def _parse_fixed_width(values):
+    """
+    Epoch seconds of 'YYYY-MM-DDTHH:MM:SSZ' strings, read straight from their bytes.
+
+    Returns None if any value does not have exactly that layout or is not a valid date and
+    time, so that pandas parses (or rejects) the values instead.
+    """
+    try:
+        # One spare byte so longer strings are detected instead of truncated
+        raw = np.asarray(values, dtype=f'S{TIMESTAMP_WIDTH + 1}')
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    raw = raw.view(np.uint8).reshape(-1, TIMESTAMP_WIDTH + 1)
+
+    if raw[:, TIMESTAMP_WIDTH].any():
+        return None
+    for position, separator in TIMESTAMP_SEPARATORS.items():
+        if (raw[:, position] != ord(separator)).any():
+            return None
+
+    fields = []
+    for start, stop in TIMESTAMP_FIELDS:
+        digits = raw[:, start:stop].astype(np.int64) - ord('0')
+        if ((digits < 0) | (digits > 9)).any():
+            return None
+        fields.append(digits @ 10 ** np.arange(stop - start - 1, -1, -1))
+    year, month, day, hour, minute, second = fields
+    if ((month < 1) | (month > 12) | (day < 1) | (day > 31) | (hour > 23) | (minute > 59) | (second > 59)).any():
+        return None
+    # Days past the end of the month (e.g. 02-30, or 02-29 outside leap years) do not round-trip
+    days = days_from_civil(year, month, day)
+    if (civil_from_days(days)[2] != day).any():
+        return None
+
+    return days * 86400 + hour * 3600 + minute * 60 + second
+
+def parse_timestamps(values, unit='s'):
+    """
+    Parse timestamps into a UTC datetime Series.
+
+    Strings in the Xente layout ('2018-11-15T02:18:49Z') are decoded from their bytes
+    without strptime; other strings go through pandas' ISO 8601 parser and are converted to
+    UTC. Integers are read as epoch times in `unit`, and datetimes are returned as they are
+    (in their own time zone, if any).
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit=unit, utc=True)
+
+    seconds = _parse_fixed_width(values.to_numpy())
+    if seconds is None:
+        return pd.to_datetime(values, format='ISO8601', utc=True)
+    return pd.Series(pd.to_datetime(seconds, unit='s', utc=True), index=values.index)
+
+def time_components(timestamps, weekday=True, cyclical=False):
+    """
+    Hour, day, month, year and (optionally) weekday of datetimes in one vectorized pass over
+    their epoch ticks, as small integers (int8, and int16 for the year). Missing datetimes
+    make the components float32 with NaN.
+
+    With cyclical=True, hour, weekday and month also get sin/cos encodings (float32), so
+    e.g. 23:00 and 00:00 end up close together.
+
+    Returns:
+        dict: Feature name -> NumPy array.
+    """
+    index = pd.DatetimeIndex(timestamps)
+    if index.tz is not None:
+        # Components are the wall-clock time in the timestamps' time zone: UTC for the output
+        # of parse_timestamps, the local time for datetimes in another zone
+        index = index.tz_localize(None)
+    missing = index.isna()
+    seconds = np.where(missing, 0, index.asi8 // TICKS_PER_SECOND[index.unit])
+
+    days = seconds // 86400
+    year, month, day = civil_from_days(days)
+    components = {
+        'Transaction_Hour': ((seconds - days * 86400) // 3600).astype(np.int8),
+        'Transaction_Day': day.astype(np.int8),
+        'Transaction_Month': month.astype(np.int8),
+        'Transaction_Year': year.astype(np.int16),
+    }
+    if weekday:
+        # 1970-01-01 was a Thursday (Monday = 0)
+        components['Transaction_Weekday'] = ((days + 3) % 7).astype(np.int8)
+    if missing.any():
+        for name, values in components.items():
+            components[name] = np.where(missing, np.nan, values).astype(np.float32)
+
+    if cyclical:
+        for name, period in CYCLE_PERIODS.items():
+            if name in components:
+                angle = (2 * np.pi / period) * components[name].astype(np.float32)
+                components[f'{name}_Sin'] = np.sin(angle)
+                components[f'{name}_Cos'] = np.cos(angle)
+    return components
+
+def add_time_features(df, column='TransactionStartTime', weekday=True, cyclical=False):
+    """
+    Parse df[column] in place with parse_timestamps and add its time components as columns
+    (see time_components).
+    """
+    df[column] = parse_timestamps(df[column])
+    for name, values in time_components(df[column], weekday=weekday, cyclical=cyclical).items():
+        df[name] = values
+    return df
@@ -0,0 +1,70 @@
+"""
+Throughput benchmark: per-row HTML form scoring vs the /predict/batch endpoint.
+
+Usage:
+    python benchmarks/bench_batch_scoring.py [n_transactions]
+"""
+import os
+import sys
+import time
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from app import app
+
+
+def make_transactions(n, seed=42):
+    rng = np.random.default_rng(seed)
+    amounts = rng.normal(1000, 5000, size=n).round(2)
+    return [
+        {
+            'TransactionId': i,
+            'BatchId': i,
+            'AccountId': int(rng.integers(1, 5000)),
+            'SubscriptionId': int(rng.integers(1, 5000)),
+            'CustomerId': int(rng.integers(1, 500)),
+            'CurrencyCode': 'UGX',
+            'CountryCode': '256',
+            'ProviderId': int(rng.integers(1, 7)),
+            'ProductId': int(rng.integers(1, 28)),
+            'ProductCategory': 'airtime',
+            'ChannelId': int(rng.integers(1, 6)),
+            'Amount': float(amounts[i]),
+            'Value': float(abs(amounts[i])),
+            'TransactionStartTime': f'2018-{rng.integers(1, 13):02d}-{rng.integers(1, 29):02d}T02:18:49Z',
+            'PricingStrategy': str(rng.integers(0, 5)),
+        }
+        for i in range(n)
+    ]
+
+
+def bench_form(client, transactions):
+    start = time.perf_counter()
+    for t in transactions:
+        client.post('/', data={k: str(v) for k, v in t.items()})
+    return time.perf_counter() - start
+
+
+def bench_batch(client, transactions):
+    start = time.perf_counter()
+    response = client.post('/predict/batch', json=transactions)
+    assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    transactions = make_transactions(n)
+    client = app.test_client()
+
+    form_seconds = bench_form(client, transactions)
+    batch_seconds = bench_batch(client, transactions)
+
+    print(f"Transactions: {n}")
+    print(f"Per-row form path: {form_seconds:.3f}s ({n / form_seconds:,.0f} tx/s)")
+    print(f"Batch endpoint:    {batch_seconds:.3f}s ({n / batch_seconds:,.0f} tx/s)")
+    print(f"Speedup: {form_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Cross-validation benchmark: folds fitted one after another on per-fold DataFrame copies
+(df.iloc[train]) vs cross_validate_models, which fits the folds in parallel from index arrays
+over one shared memory-mapped matrix. Each mode runs in its own process; the peak RSS is the
+largest of that process and its workers.
+
+Usage:
+    python benchmarks/bench_cross_validation.py [n_rows] [n_splits]    (default: 500000 5)
+"""
+import os
+import sys
+import json
+import time
+import resource
+import subprocess
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+N_FEATURES = 20
+MODEL_NAMES = ['Logistic Regression', 'XGBoost']
+
+
+def make_final_df(n, seed=42):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((n, N_FEATURES)), columns=[f'Feature_{j}' for j in range(N_FEATURES)])
+    df['CustomerId'] = rng.integers(0, n // 20, n)
+    df['TransactionStartTime'] = pd.Timestamp('2019-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 90 * 86400, n), unit='s')
+    df['Risk_Label'] = (df['Feature_0'] + df['Feature_1'] + rng.normal(0, 0.3, n) > 1).astype(int)
+    return df
+
+def copy_per_fold(df, n_splits):
+    from cross_validation import make_folds
+    from modeling import ESTIMATORS
+    from model_evaluation import evaluate_scores
+    X = df.drop(columns=['CustomerId', 'TransactionStartTime', 'Risk_Label'])
+    for name in MODEL_NAMES:
+        for train, test in make_folds(df, 'stratified', n_splits):
+            X_train, X_test = X.iloc[train].copy(), X.iloc[test].copy()
+            y_train, y_test = df['Risk_Label'].iloc[train].copy(), df['Risk_Label'].iloc[test].copy()
+            model = ESTIMATORS[name](os.cpu_count()).fit(X_train, y_train)
+            evaluate_scores(y_test, model.predict_proba(X_test)[:, 1], thresholds=[])
+
+def run_mode(mode, n, n_splits):
+    from cross_validation import cross_validate_models
+    df = make_final_df(n)
+    start = time.perf_counter()
+    if mode == 'copy per fold':
+        copy_per_fold(df, n_splits)
+    else:
+        cross_validate_models(df, 'stratified', n_splits, model_names=MODEL_NAMES)
+    print(json.dumps({
+        'Mode': mode,
+        'Cores': os.cpu_count(),
+        'Time (s)': time.perf_counter() - start,
+        # ru_maxrss is in kilobytes on Linux
+        'Peak RSS (MB)': max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                             resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024,
+    }))
+
+def main(n, n_splits):
+    results = []
+    for mode in ['copy per fold', 'shared memmap, parallel']:
+        output = subprocess.run([sys.executable, __file__, '--mode', mode, str(n), str(n_splits)],
+                                check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    print(f'{n:,} rows x {N_FEATURES} features, {n_splits} folds x {len(MODEL_NAMES)} models')
+    print(pd.DataFrame(results).round(2).to_string(index=False))
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--mode']:
+        run_mode(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 5)
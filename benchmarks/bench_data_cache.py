@@ -0,0 +1,73 @@
+"""
+Load benchmark: cold CSV parse (load_data + pd.to_datetime) vs the warm Parquet cache.
+
+Usage:
+    python benchmarks/bench_data_cache.py [n_rows]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from load_data import load_data, load_data_cached, build_parquet_cache
+
+
+def write_transactions_csv(filepath, n, seed=42):
+    rng = np.random.default_rng(seed)
+    amounts = rng.normal(1000, 5000, size=n).round(2)
+    start_times = pd.Timestamp('2018-11-15') + pd.to_timedelta(np.sort(rng.integers(0, 90 * 86400, size=n)), unit='s')
+    pd.DataFrame({
+        'TransactionId': 'TransactionId_' + pd.Series(np.arange(n)).astype(str),
+        'BatchId': 'BatchId_' + pd.Series(rng.integers(1, n, size=n)).astype(str),
+        'AccountId': 'AccountId_' + pd.Series(rng.integers(1, 5000, size=n)).astype(str),
+        'SubscriptionId': 'SubscriptionId_' + pd.Series(rng.integers(1, 5000, size=n)).astype(str),
+        'CustomerId': 'CustomerId_' + pd.Series(rng.integers(1, 7500, size=n)).astype(str),
+        'CurrencyCode': 'UGX',
+        'CountryCode': 256,
+        'ProviderId': 'ProviderId_' + pd.Series(rng.integers(1, 7, size=n)).astype(str),
+        'ProductId': 'ProductId_' + pd.Series(rng.integers(1, 28, size=n)).astype(str),
+        'ProductCategory': rng.choice(['airtime', 'financial_services', 'utility_bill', 'tv'], size=n),
+        'ChannelId': 'ChannelId_' + pd.Series(rng.integers(1, 6, size=n)).astype(str),
+        'Amount': amounts,
+        'Value': np.abs(amounts),
+        'TransactionStartTime': start_times.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'PricingStrategy': rng.integers(0, 5, size=n),
+        'FraudResult': (rng.random(n) < 0.002).astype(int),
+    }).to_csv(filepath, index=False)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'data.csv')
+        cache_dir = os.path.join(tmp, 'cache')
+        write_transactions_csv(csv_path, n)
+
+        def cold_load():
+            df = load_data(csv_path)
+            df['TransactionStartTime'] = pd.to_datetime(df['TransactionStartTime'])
+            return df
+
+        _, cold_seconds = timed(cold_load)
+        _, build_seconds = timed(lambda: build_parquet_cache(csv_path, cache_dir))
+        _, warm_seconds = timed(lambda: load_data_cached(csv_path, cache_dir=cache_dir))
+        _, projected_seconds = timed(lambda: load_data_cached(csv_path, cache_dir=cache_dir, columns=['CustomerId', 'Amount']))
+
+    print(f"Rows: {n:,}")
+    print(f"Cold CSV load + datetime parse: {cold_seconds:.3f}s")
+    print(f"Cache build (one-off):          {build_seconds:.3f}s")
+    print(f"Warm cache load (all columns):  {warm_seconds:.3f}s ({cold_seconds / warm_seconds:.1f}x)")
+    print(f"Warm cache load (2 columns):    {projected_seconds:.3f}s ({cold_seconds / projected_seconds:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Encoding memory benchmark: the original get_dummies + LabelEncoder encode_features vs the
+CategoricalEncoder version, and the dense float64 model matrix vs the CSR one (encoding.to_csr).
+The default size is the full Xente training set (95,662 transactions), with its category levels.
+
+Usage:
+    python benchmarks/bench_encoding.py [n_rows ...]
+"""
+import os
+import sys
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from encoding import to_csr
+from feature_engineering import encode_features
+
+
+def legacy_encode_features(df):
+    """encode_features before the CategoricalEncoder: dense dummies and a refit LabelEncoder."""
+    df_one_hot = pd.get_dummies(df, columns=['ProductCategory', 'ChannelId', 'CurrencyCode'], drop_first=True)
+    label_encoder = LabelEncoder()
+    for col in ['ProviderId', 'PricingStrategy', 'CountryCode']:
+        df_one_hot[col] = label_encoder.fit_transform(df_one_hot[col])
+    return df_one_hot
+
+def make_features(n, n_numeric=15, seed=42):
+    """Feature frame as it reaches encode_features, with the Xente category levels."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.random((n, n_numeric)), columns=[f'Numeric_{i}' for i in range(n_numeric)])
+    df['ProductCategory'] = rng.choice(['airtime', 'financial_services', 'utility_bill', 'data_bundles', 'tv',
+                                        'ticket', 'movies', 'transport', 'other'], size=n)
+    df['ChannelId'] = rng.choice(['ChannelId_1', 'ChannelId_2', 'ChannelId_3', 'ChannelId_5'], size=n)
+    df['CurrencyCode'] = 'UGX'
+    df['ProviderId'] = 'ProviderId_' + pd.Series(rng.integers(1, 7, size=n)).astype(str)
+    df['PricingStrategy'] = rng.choice([0, 1, 2, 4], size=n)
+    df['CountryCode'] = 256
+    return df
+
+def traced(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak / 2 ** 20
+
+def csr_bytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+def main(sizes):
+    rows = []
+    for n in sizes:
+        df = make_features(n)
+
+        legacy, legacy_peak = traced(legacy_encode_features, df)
+        encoded, peak = traced(encode_features, df)
+        dense = legacy.to_numpy(dtype='float64')
+        (matrix, _), csr_peak = traced(to_csr, encoded)
+
+        rows.append({
+            'Rows': n,
+            'Encoded frame (MB) old': legacy.memory_usage(deep=True).sum() / 2 ** 20,
+            'Encoded frame (MB) new': encoded.memory_usage(deep=True).sum() / 2 ** 20,
+            'Encode peak (MB) old': legacy_peak,
+            'Encode peak (MB) new': peak,
+            'Model matrix (MB) dense': dense.nbytes / 2 ** 20,
+            'Model matrix (MB) CSR': csr_bytes(matrix) / 2 ** 20,
+            'to_csr peak (MB)': csr_peak,
+        })
+    print(pd.DataFrame(rows).round(2).to_string(index=False))
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [95_662, 1_000_000])
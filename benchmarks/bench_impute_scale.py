@@ -0,0 +1,70 @@
+"""
+Imputation + scaling memory benchmark: handle_missing_values + normalize_features as they were
+(per-column fillna, then a MinMaxScaler over the float64 block) vs the fused impute_and_scale.
+The original fillna(inplace=True) calls are a no-op under pandas copy-on-write, so the old
+version is measured with the fills assigned back.
+
+Usage:
+    python benchmarks/bench_impute_scale.py [n_rows ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from feature_engineering import impute_and_scale
+
+
+def legacy_impute_and_scale(final_df):
+    for column in final_df.select_dtypes(include=['float64', 'int64']).columns:
+        final_df[column] = final_df[column].fillna(final_df[column].median())
+    for column in final_df.select_dtypes(include=['object', 'string']).columns:
+        final_df[column] = final_df[column].fillna(final_df[column].mode()[0])
+
+    numerical_columns = final_df.select_dtypes(include=['float64', 'int64']).columns
+    final_df[numerical_columns] = MinMaxScaler().fit_transform(final_df[numerical_columns])
+    return final_df
+
+def make_features(n, n_float=16, n_int=6, seed=42):
+    """Numeric features with 5% missing values plus two low-cardinality text columns."""
+    rng = np.random.default_rng(seed)
+    floats = rng.normal(size=(n, n_float))
+    floats[rng.random((n, n_float)) < 0.05] = np.nan
+    df = pd.DataFrame(floats, columns=[f'Float_{i}' for i in range(n_float)])
+    for i in range(n_int):
+        df[f'Int_{i}'] = rng.integers(0, 100, size=n)
+    df['ProviderId'] = rng.choice(['ProviderId_1', 'ProviderId_4', 'ProviderId_6', None], size=n)
+    df['ProductCategory'] = rng.choice(['airtime', 'financial_services', 'utility_bill'], size=n)
+    return df
+
+def measure(fn, df):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(df)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak / 2 ** 20
+
+def main(sizes):
+    rows = []
+    for n in sizes:
+        df = make_features(n)
+        _, old_seconds, old_peak = measure(legacy_impute_and_scale, df.copy())
+        _, new_seconds, new_peak = measure(lambda frame: impute_and_scale(frame)[0], df.copy())
+        rows.append({
+            'Rows': n,
+            'Input (MB)': df.memory_usage(deep=True).sum() / 2 ** 20,
+            'Peak (MB) old': old_peak,
+            'Peak (MB) fused': new_peak,
+            'Time (s) old': old_seconds,
+            'Time (s) fused': new_seconds,
+        })
+    print(pd.DataFrame(rows).round(3).to_string(index=False))
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [95_662, 1_000_000])
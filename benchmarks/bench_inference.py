@@ -0,0 +1,54 @@
+"""
+Inference latency benchmark for the served model (app/xgb_model.pkl): p50/p99 of one
+predict_proba call per backend in app/inference.py, for single rows and 1k-row batches.
+
+Usage:
+    python benchmarks/bench_inference.py [n_calls]    (default: 2000)
+"""
+import os
+import sys
+import time
+import pickle
+import warnings
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from inference import BACKENDS, load_backend
+
+
+def latencies(backend, X, n_calls):
+    backend.predict_proba(X)  # Warm up
+    timings = np.empty(n_calls)
+    for i in range(n_calls):
+        start = time.perf_counter()
+        backend.predict_proba(X)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+def main(n_calls):
+    with warnings.catch_warnings():
+        # The pickle comes from an older XGBoost release
+        warnings.simplefilter('ignore')
+        with open(os.path.join(os.path.dirname(__file__), '../app/xgb_model.pkl'), 'rb') as f:
+            model = pickle.load(f)
+
+    feature_names = model.get_booster().feature_names
+    X = pd.DataFrame(np.random.default_rng(42).random((1000, len(feature_names))), columns=feature_names)
+
+    rows = []
+    for batch_rows in [1, 1000]:
+        batch = X.iloc[:batch_rows]
+        for name in BACKENDS:
+            timings = latencies(load_backend(model, name), batch, n_calls)
+            rows.append({
+                'Backend': name,
+                'Batch Rows': batch_rows,
+                'p50 (us)': np.percentile(timings, 50),
+                'p99 (us)': np.percentile(timings, 99),
+                'Rows/s': batch_rows / (np.median(timings) / 1e6),
+            })
+    print(pd.DataFrame(rows).round(1).to_string(index=False))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
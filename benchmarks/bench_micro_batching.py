@@ -0,0 +1,68 @@
+"""
+Load test of the micro-batching scorer: concurrent clients (threads with their own Flask test
+client) post single transactions to /predict/batch, with micro-batching off and at several
+batch windows. Reports throughput and p50/p99 request latency.
+
+Usage:
+    python benchmarks/bench_micro_batching.py [n_clients] [requests_per_client]    (default: 16 100)
+"""
+import os
+import sys
+import time
+import threading
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import app as server
+from batching import MicroBatcher
+from feature_engineering import fit_serving_preprocessor
+from bench_batch_scoring import make_transactions
+
+BATCH_WINDOWS_MS = [None, 0, 1, 2, 5, 10]
+
+
+def client_loop(transactions, latencies):
+    client = server.app.test_client()
+    for transaction in transactions:
+        start = time.perf_counter()
+        response = client.post('/predict/batch', json=[transaction])
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+
+def run(window_ms, transactions, n_clients):
+    server.batcher = MicroBatcher(server.score_batch, window_ms) if window_ms is not None else None
+    latencies = [[] for _ in range(n_clients)]
+    threads = [threading.Thread(target=client_loop, args=(transactions[i::n_clients], latencies[i]))
+               for i in range(n_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if server.batcher is not None:
+        server.batcher.close()
+
+    latencies = np.concatenate(latencies) * 1000
+    return {
+        'Batch Window (ms)': 'off' if window_ms is None else window_ms,
+        'Requests/s': len(latencies) / elapsed,
+        'p50 (ms)': np.percentile(latencies, 50),
+        'p99 (ms)': np.percentile(latencies, 99),
+    }
+
+def main(n_clients, requests_per_client):
+    transactions = make_transactions(n_clients * requests_per_client)
+    # Score with a fitted preprocessor, as in production (the refit path is per request anyway)
+    server.preprocessor = fit_serving_preprocessor(pd.DataFrame(transactions))
+
+    run(None, transactions[:n_clients * 5], n_clients)  # Warm up
+    results = [run(window_ms, transactions, n_clients) for window_ms in BATCH_WINDOWS_MS]
+    print(f'{n_clients} concurrent clients x {requests_per_client} single-transaction requests')
+    print(pd.DataFrame(results).round(2).to_string(index=False))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 100)
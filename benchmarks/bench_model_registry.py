@@ -0,0 +1,107 @@
+"""
+Model cold-start benchmark: pickle.load of app/xgb_model.pkl vs ModelRegistry.load of the
+native UBJ/JSON registry files (checksum verification included), plus the memory each forked
+worker adds when the model is preloaded in the parent (gunicorn's preload_app) or loaded per worker.
+Each measurement runs in its own process.
+
+Usage:
+    python benchmarks/bench_model_registry.py [n_workers]    (default: 4)
+"""
+import os
+import sys
+import json
+import time
+import pickle
+import tempfile
+import warnings
+import subprocess
+import pandas as pd
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../app'))
+sys.path.append(APP_DIR)
+
+PICKLE_PATH = os.path.join(APP_DIR, 'xgb_model.pkl')
+
+
+# Function to read a process's memory (RSS and its private part) from /proc, in MB
+def memory_mb(pid='self'):
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Private_Clean:', 'Private_Dirty:'):
+                fields[parts[0]] = int(parts[1]) / 1024
+    return fields['Rss:'], fields['Private_Clean:'] + fields['Private_Dirty:']
+
+def load(mode, registry_dir):
+    if mode == 'pickle':
+        with warnings.catch_warnings():
+            # The pickle comes from an older XGBoost release
+            warnings.simplefilter('ignore')
+            with open(PICKLE_PATH, 'rb') as f:
+                return pickle.load(f)
+    from model_registry import ModelRegistry
+    return ModelRegistry(os.path.join(registry_dir, mode)).load()
+
+def run_cold_start(mode, registry_dir):
+    import xgboost  # Imported up front: only the model load is timed
+    start = time.perf_counter()
+    model = load(mode, registry_dir)
+    model.get_booster().inplace_predict([[0.0] * model.n_features_in_])
+    print(json.dumps({'Load': mode, 'Cold Start (ms)': (time.perf_counter() - start) * 1000}))
+
+def run_workers(mode, registry_dir, n_workers):
+    """Fork workers that score once; report the private memory each adds on top of the parent."""
+    import xgboost
+    model = load('ubj', registry_dir) if mode == 'preload' else None
+    children = []
+    for _ in range(n_workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            worker_model = model if model is not None else load('ubj', registry_dir)
+            worker_model.get_booster().inplace_predict([[0.0] * worker_model.n_features_in_])
+            os.write(write_fd, json.dumps(memory_mb()).encode())
+            os.close(write_fd)
+            os._exit(0)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+    private = []
+    for pid, read_fd in children:
+        private.append(json.loads(os.read(read_fd, 1024))[1])
+        os.waitpid(pid, 0)
+    print(json.dumps({'Workers': mode, 'Private MB per Worker': sum(private) / len(private)}))
+
+def main(n_workers):
+    from model_registry import ModelRegistry
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with open(PICKLE_PATH, 'rb') as f:
+            model = pickle.load(f)
+
+    with tempfile.TemporaryDirectory() as registry_dir:
+        for model_format in ['ubj', 'json']:
+            ModelRegistry(os.path.join(registry_dir, model_format)).register(model, model_format=model_format)
+
+        results = []
+        for mode in ['pickle', 'ubj', 'json']:
+            output = subprocess.run([sys.executable, __file__, '--cold-start', mode, registry_dir],
+                                    check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        print(pd.DataFrame(results).round(2).to_string(index=False))
+
+        results = []
+        for mode in ['per-worker', 'preload']:
+            output = subprocess.run([sys.executable, __file__, '--workers', mode, registry_dir, str(n_workers)],
+                                    check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+        print(f'\n{n_workers} forked workers')
+        print(pd.DataFrame(results).round(2).to_string(index=False))
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--cold-start']:
+        run_cold_start(sys.argv[2], sys.argv[3])
+    elif sys.argv[1:2] == ['--workers']:
+        run_workers(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,88 @@
+"""
+Offline scoring benchmark: the whole transaction file read and scored in memory as one
+request vs scripts/batch_score.py streaming it in chunks through worker processes.
+Each mode runs in its own process; the peak RSS is the largest of that process and its workers.
+
+Usage:
+    python benchmarks/bench_offline_scoring.py [n_rows] [chunksize]    (default: 2000000 250000)
+"""
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+
+def write_transactions(path, n, seed=42, chunk_rows=500_000):
+    """Write a synthetic transaction CSV in pieces, without holding all of it."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, chunk_rows):
+        rows = min(chunk_rows, n - start)
+        amounts = rng.normal(1000, 5000, rows).round(2)
+        times = pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(rng.integers(0, 90 * 86400, rows), unit='s')
+        pd.DataFrame({
+            'TransactionId': np.char.add('TransactionId_', np.arange(start, start + rows).astype(str)),
+            'CustomerId': np.char.add('CustomerId_', rng.integers(0, 50_000, rows).astype(str)),
+            'Amount': amounts,
+            'Value': np.abs(amounts),
+            'TransactionStartTime': times.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'PricingStrategy': rng.integers(0, 5, rows),
+        }).to_csv(path, mode='a', header=start == 0, index=False)
+
+def run_mode(mode, input_path, preprocessor_path, output_path, chunksize):
+    from data_preprocess import transform_transactions, load_preprocessor, INPUT_COLUMNS
+    from model_registry import load_registered_model
+    from inference import load_backend
+    from batch_score import score_file
+
+    start = time.perf_counter()
+    if mode == 'in memory':
+        df = pd.read_csv(input_path, usecols=INPUT_COLUMNS)
+        scores = load_backend(load_registered_model()).predict_proba(
+            transform_transactions(df, load_preprocessor(preprocessor_path)))
+        pd.DataFrame({'TransactionId': df['TransactionId'], 'score': scores,
+                      'Risk_Label': (scores >= 0.5).astype('int8')}).to_parquet(output_path, index=False)
+    else:
+        score_file(input_path, output_path, chunksize, preprocessor_path=preprocessor_path)
+    print(json.dumps({
+        'Mode': mode,
+        'Cores': os.cpu_count(),
+        'Time (s)': time.perf_counter() - start,
+        # ru_maxrss is in kilobytes on Linux
+        'Peak RSS (MB)': max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                             resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024,
+    }))
+
+def main(n, chunksize):
+    from feature_engineering import fit_serving_preprocessor
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, 'transactions.csv')
+        write_transactions(input_path, n)
+        preprocessor_path = os.path.join(tmp_dir, 'preprocessor.json')
+        with open(preprocessor_path, 'w') as f:
+            json.dump(fit_serving_preprocessor(pd.read_csv(input_path, nrows=200_000)), f)
+
+        results = []
+        for mode in ['in memory', 'streamed']:
+            output_path = os.path.join(tmp_dir, f'scores-{mode.replace(" ", "-")}.parquet')
+            output = subprocess.run([sys.executable, __file__, '--mode', mode, input_path, preprocessor_path, output_path, str(chunksize)],
+                                    check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            result['Rows/s'] = n / result['Time (s)']
+            results.append(result)
+    print(f'{n:,} transactions, {chunksize:,} rows per chunk')
+    print(pd.DataFrame(results).round(2).to_string(index=False))
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--mode']:
+        run_mode(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5], int(sys.argv[6]))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 250_000)
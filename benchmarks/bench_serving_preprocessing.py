@@ -0,0 +1,56 @@
+"""
+Latency benchmark: refit-per-request preprocess_transactions vs the fitted transform_transactions.
+
+Usage:
+    python benchmarks/bench_serving_preprocessing.py [repeats]
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from data_preprocess import preprocess_transactions, transform_transactions
+from feature_engineering import fit_serving_preprocessor
+
+
+def make_transactions(n, seed=42):
+    rng = np.random.default_rng(seed)
+    amounts = rng.normal(1000, 5000, size=n).round(2)
+    start_times = pd.Timestamp('2018-11-15') + pd.to_timedelta(rng.integers(0, 90 * 86400, size=n), unit='s')
+    return pd.DataFrame({
+        'TransactionId': np.arange(n),
+        'CustomerId': rng.integers(1, max(n // 20, 2), size=n),
+        'Amount': amounts,
+        'Value': np.abs(amounts),
+        'TransactionStartTime': start_times.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'PricingStrategy': rng.choice(['0', '1', '2', '4'], size=n),
+    })
+
+
+def time_call(fn, df, repeats):
+    timings = []
+    for _ in range(repeats):
+        batch = df.copy()
+        start = time.perf_counter()
+        fn(batch)
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    preprocessor = fit_serving_preprocessor(make_transactions(100_000))
+
+    print(f"{'rows':>8} {'refit (ms)':>12} {'fitted (ms)':>12} {'speedup':>8}")
+    for n in [1, 100, 10_000]:
+        df = make_transactions(n, seed=n)
+        refit_ms = time_call(preprocess_transactions, df, repeats)
+        fitted_ms = time_call(lambda batch: transform_transactions(batch, preprocessor), df, repeats)
+        print(f"{n:>8} {refit_ms:>12.3f} {fitted_ms:>12.3f} {refit_ms / fitted_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
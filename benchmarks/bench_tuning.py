@@ -0,0 +1,54 @@
+"""
+Hyperparameter search benchmark: the same XGBoost configurations evaluated on all training rows
+(random search) vs successive halving from a fraction of the rows, and a rerun of the halving
+search that resumes from its trial cache.
+
+Usage:
+    python benchmarks/bench_tuning.py [n_rows] [n_configs]    (default: 100000 27)
+"""
+import os
+import sys
+import time
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from tuning import tune_model
+
+N_FEATURES = 20
+
+
+def make_data(n, seed=42):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.random((n, N_FEATURES)), columns=[f'Feature_{j}' for j in range(N_FEATURES)])
+    y = pd.Series((X['Feature_0'] * X['Feature_1'] + 0.3 * X['Feature_2'] + rng.normal(0, 0.2, n) > 0.4).astype(int))
+    return X, y
+
+def run(label, X, y, model_dir, **kwargs):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(None):
+        _, log = tune_model('XGBoost', X, y, model_dir=model_dir, **kwargs)
+    return {
+        'Search': label,
+        'Trials': len(log),
+        'Trials Fitted': int((~log['Cached']).sum()),
+        'Best Validation AUC': log.loc[log['Rows'] == log['Rows'].max(), 'AUC'].max(),
+        'Time (s)': time.perf_counter() - start,
+    }
+
+def main(n, n_configs):
+    X, y = make_data(n)
+    max_rows = int(n * 0.8)
+    results = []
+    with tempfile.TemporaryDirectory() as full_dir, tempfile.TemporaryDirectory() as halving_dir:
+        results.append(run('all rows', X, y, full_dir, n_configs=n_configs, min_rows=max_rows))
+        results.append(run('successive halving', X, y, halving_dir, n_configs=n_configs))
+        results.append(run('successive halving, resumed', X, y, halving_dir, n_configs=n_configs))
+    print(f'{n:,} rows x {N_FEATURES} features, {n_configs} XGBoost configurations')
+    print(pd.DataFrame(results).round(4).to_string(index=False))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 27)
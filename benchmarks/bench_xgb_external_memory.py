@@ -0,0 +1,72 @@
+"""
+XGBoost training memory benchmark: XGBClassifier.fit on the concatenated training chunks
+(train_and_evaluate_xgboost) vs train_xgboost_external_memory streaming the same Parquet chunks.
+Each mode runs in its own process so the reported peak RSS is its own.
+
+Usage:
+    python benchmarks/bench_xgb_external_memory.py [n_rows] [chunk_rows]    (default: 2000000 200000)
+"""
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+N_FEATURES = 20
+
+
+def write_chunks(chunk_dir, n, chunk_rows, seed=42):
+    """Write synthetic feature chunks without ever holding the full dataset."""
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i, start in enumerate(range(0, n, chunk_rows)):
+        rows = min(chunk_rows, n - start)
+        chunk = pd.DataFrame(rng.random((rows, N_FEATURES), dtype=np.float32),
+                             columns=[f'Feature_{j}' for j in range(N_FEATURES)])
+        chunk['Risk_Label'] = (chunk['Feature_0'] + chunk['Feature_1'] + rng.normal(0, 0.2, rows) > 1).astype('int8')
+        path = os.path.join(chunk_dir, f'part-{i:05d}.parquet')
+        chunk.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+def run_mode(mode, chunk_dir):
+    import xgboost as xgb
+    from modeling import train_xgboost_external_memory
+
+    paths = sorted(os.path.join(chunk_dir, name) for name in os.listdir(chunk_dir))
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as model_dir:
+        if mode == 'in-memory':
+            df = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+            xgb.XGBClassifier(eval_metric='logloss', random_state=42).fit(df.drop(columns='Risk_Label'), df['Risk_Label'])
+        else:
+            train_xgboost_external_memory(paths, model_dir=model_dir)
+    print(json.dumps({
+        'Mode': mode,
+        'Train Time (s)': time.perf_counter() - start,
+        # ru_maxrss is in kilobytes on Linux
+        'Peak RSS (MB)': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+def main(n, chunk_rows):
+    with tempfile.TemporaryDirectory() as chunk_dir:
+        write_chunks(chunk_dir, n, chunk_rows)
+        results = []
+        for mode in ['in-memory', 'external-memory']:
+            output = subprocess.run([sys.executable, __file__, '--mode', mode, chunk_dir],
+                                    check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+    print(f'{n:,} rows x {N_FEATURES} features, {chunk_rows:,} rows per chunk')
+    print(pd.DataFrame(results).round(2).to_string(index=False))
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--mode']:
+        run_mode(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+             int(sys.argv[2]) if len(sys.argv) > 2 else 200_000)
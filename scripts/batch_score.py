@@ -0,0 +1,251 @@
+"""
+Batch offline scoring of a CSV or Parquet transaction file with the app's preprocessing and model.
+
+Usage:
+    python scripts/batch_score.py transactions.csv scores.parquet [--chunksize 250000] [--workers N]
+                                  [--aggregates file|store] [--threshold 0.5]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from data_preprocess import transform_transactions, load_preprocessor, INPUT_COLUMNS
+from time_features import parse_timestamps, time_components
+from feature_store import load_feature_store
+from model_registry import ModelRegistry, REGISTRY_DIR
+from inference import load_backend
+
+DEFAULT_CHUNKSIZE = 250_000
+OUTPUT_COLUMNS = ['TransactionId', 'score', 'Risk_Label']
+# Settings of the run, kept with its completed chunks to check that a restart resumes the same run
+STATE_FILE = 'state.json'
+# Staged input chunks: their count, and the customer aggregates over all of them
+CHUNKS_FILE = 'chunks.json'
+AGGREGATES_FILE = 'customer_aggregates.parquet'
+STORE_AGGREGATES_FILE = 'store_aggregates.parquet'
+AGGREGATE_SOURCES = ['file', 'store']
+
+
+# Function to stream a CSV or Parquet file in chunks of rows
+def read_chunks(path, chunksize, columns=None):
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        with pd.read_csv(path, chunksize=chunksize, usecols=columns) as reader:
+            yield from reader
+
+def _aggregate_partial(chunk):
+    """Per-customer amount total, row count and last transaction year of one chunk."""
+    years = time_components(parse_timestamps(chunk['TransactionStartTime']), weekday=False)['Transaction_Year']
+    return chunk[['CustomerId', 'Amount']].assign(Year=years).groupby('CustomerId').agg(
+        total=('Amount', 'sum'), count=('Amount', 'size'), year=('Year', 'max'))
+
+def _combine_aggregates(partials):
+    """
+    Per-customer aggregates over the whole file from the chunk partials: the amount total, mean
+    and transaction count, and the last transaction year (used for Recency), as
+    transform_transactions would compute them if the file were scored in one request.
+    """
+    combined = pd.concat(partials).groupby(level=0).agg({'total': 'sum', 'count': 'sum', 'year': 'max'})
+    return pd.DataFrame({
+        'CustomerId': combined.index,
+        'Total_Transaction_Amount': combined['total'].to_numpy(dtype='float64'),
+        'Average_Transaction_Amount': (combined['total'] / combined['count']).to_numpy(dtype='float64'),
+        'Transaction_Count': combined['count'].to_numpy(dtype='float64'),
+        'Last_Transaction_Year': combined['year'].to_numpy(dtype='float64'),
+    })
+
+def customer_aggregates(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Per-customer aggregates over a whole CSV or Parquet file, in one streaming pass."""
+    return _combine_aggregates([_aggregate_partial(chunk) for chunk in
+                                read_chunks(path, chunksize, ['CustomerId', 'Amount', 'TransactionStartTime'])])
+
+def stage_chunks(input_path, parts_dir, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Split the input into numbered Parquet chunk files (the scoring workers read their chunk
+    from disk instead of receiving it pickled) while computing the whole-file customer
+    aggregates in the same pass. Returns the number of chunks.
+    """
+    partials = []
+    n_chunks = 0
+    for index, chunk in enumerate(read_chunks(input_path, chunksize, INPUT_COLUMNS)):
+        chunk.to_parquet(os.path.join(parts_dir, f'input-{index:05d}.parquet'), index=False)
+        partials.append(_aggregate_partial(chunk))
+        n_chunks = index + 1
+    if partials:
+        _combine_aggregates(partials).to_parquet(os.path.join(parts_dir, AGGREGATES_FILE), index=False)
+    # Written last: marks the staging as complete
+    with open(os.path.join(parts_dir, CHUNKS_FILE), 'w') as f:
+        json.dump({'n_chunks': n_chunks}, f)
+    return n_chunks
+
+def store_aggregates(input_path, file_aggregates, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Per-customer aggregates from the customer feature store with the transactions of the whole
+    file folded in through lookup_pending, as /predict/batch does for one request, and the last
+    transaction year of the file (file_aggregates) for Recency. Reads only the columns
+    lookup_pending needs and does not write to the store.
+    """
+    transactions = pd.concat(read_chunks(input_path, chunksize, ['TransactionId', 'CustomerId', 'Amount']),
+                             ignore_index=True)
+    store = load_feature_store()
+    try:
+        aggregates = store.lookup_pending(transactions)
+    finally:
+        store.close()
+    return aggregates.merge(file_aggregates[['CustomerId', 'Last_Transaction_Year']], on='CustomerId', how='left')
+
+
+# State of a scoring worker process, set up once by _init_worker
+_worker = {}
+
+def _init_worker(registry_dir, preprocessor_path, aggregates_path, n_threads):
+    model = ModelRegistry(registry_dir).load()
+    model.get_booster().set_param({'nthread': n_threads})
+    _worker['backend'] = load_backend(model)
+    _worker['preprocessor'] = load_preprocessor(preprocessor_path)
+    _worker['aggregates'] = pd.read_parquet(aggregates_path) if aggregates_path else None
+
+def _score_chunk(chunk_path, part_path, threshold):
+    """Worker: preprocess and score one staged chunk, then write its part file atomically."""
+    chunk = pd.read_parquet(chunk_path)
+    scores = _worker['backend'].predict_proba(transform_transactions(chunk, _worker['preprocessor'], _worker['aggregates']))
+
+    part = pd.DataFrame({
+        'TransactionId': chunk['TransactionId'].to_numpy(),
+        'score': scores.astype('float64'),
+        'Risk_Label': (scores >= threshold).astype('int8'),
+    })
+    tmp_path = part_path + '.tmp'
+    part.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, part_path)
+    return len(part)
+
+def _write_output(part_paths, output_path):
+    """Concatenate the part files, in input order, into the output Parquet file."""
+    tmp_path = output_path + '.tmp'
+    if not part_paths:
+        pd.DataFrame({'TransactionId': [], 'score': np.array([], dtype='float64'),
+                      'Risk_Label': np.array([], dtype='int8')}).to_parquet(tmp_path, index=False)
+    else:
+        writer = None
+        for path in part_paths:
+            table = pq.read_table(path)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+        writer.close()
+    os.replace(tmp_path, output_path)
+
+def score_file(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, n_workers=None, aggregates='file',
+               threshold=0.5, registry_dir=REGISTRY_DIR, preprocessor_path=None):
+    """
+    Score a CSV or Parquet transaction file into a Parquet file of TransactionId, score and
+    Risk_Label (score >= threshold), in input order.
+
+    A first pass streams the file into Parquet chunks in output_path.parts/ (stage_chunks),
+    computing the per-customer aggregates over the whole file as it goes. n_worker processes
+    then score the chunks through transform_transactions (with the fitted preprocessor.json)
+    and the current model of the model registry, with the aggregates of the whole file
+    ('file') or of the customer feature store with the file's new transactions folded in
+    ('store', read only; see store_aggregates). Recency always uses each customer's last
+    transaction year over the whole file, so the scores do not depend on chunksize.
+
+    Each scored chunk is written to output_path.parts/ as it completes; a run that is
+    interrupted and started again with the same arguments only scores the missing chunks.
+    The parts are concatenated into output_path at the end.
+
+    Returns:
+        dict: Number of chunks, chunks resumed from an earlier run, rows and seconds.
+    """
+    start = time.perf_counter()
+    if aggregates not in AGGREGATE_SOURCES:
+        raise ValueError(f"Unknown aggregates source '{aggregates}'; expected one of {', '.join(AGGREGATE_SOURCES)}.")
+    if load_preprocessor(preprocessor_path) is None:
+        raise ValueError('Batch scoring needs the fitted preprocessor.json (written by scripts/main.py).')
+    if aggregates == 'store':
+        store = load_feature_store()
+        if store is None:
+            raise ValueError('No customer feature store (customer_features.db) to read the aggregates from.')
+        store.close()
+
+    registry = ModelRegistry(registry_dir)
+    manifest = registry.read_manifest()
+    parts_dir = output_path + '.parts'
+    os.makedirs(parts_dir, exist_ok=True)
+    state = {
+        'input': os.path.abspath(input_path),
+        'input_size': os.path.getsize(input_path),
+        'input_mtime': os.path.getmtime(input_path),
+        'chunksize': chunksize,
+        'aggregates': aggregates,
+        'threshold': threshold,
+        'model_sha256': manifest['versions'][manifest['current']]['sha256'],
+    }
+    state_path = os.path.join(parts_dir, STATE_FILE)
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            if json.load(f) != state:
+                raise ValueError(f'{parts_dir} holds a run with another input, model or settings; remove it to start over.')
+    else:
+        with open(state_path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+    chunks_path = os.path.join(parts_dir, CHUNKS_FILE)
+    if os.path.exists(chunks_path):
+        with open(chunks_path) as f:
+            n_chunks = json.load(f)['n_chunks']
+    else:
+        n_chunks = stage_chunks(input_path, parts_dir, chunksize)
+    aggregates_path = os.path.join(parts_dir, AGGREGATES_FILE) if n_chunks else None
+    if aggregates == 'store' and n_chunks:
+        file_aggregates_path, aggregates_path = aggregates_path, os.path.join(parts_dir, STORE_AGGREGATES_FILE)
+        if not os.path.exists(aggregates_path):
+            tmp_path = aggregates_path + '.tmp'
+            store_aggregates(input_path, pd.read_parquet(file_aggregates_path), chunksize).to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, aggregates_path)
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_threads = max(1, (os.cpu_count() or 1) // n_workers)
+    part_paths = [os.path.join(parts_dir, f'part-{index:05d}.parquet') for index in range(n_chunks)]
+    pending = [index for index in range(n_chunks) if not os.path.exists(part_paths[index])]
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(registry_dir, preprocessor_path, aggregates_path, n_threads)) as executor:
+        futures = [
+            executor.submit(_score_chunk, os.path.join(parts_dir, f'input-{index:05d}.parquet'), part_paths[index], threshold)
+            for index in pending
+        ]
+        n_rows = sum(future.result() for future in futures)
+
+    _write_output(part_paths, output_path)
+    shutil.rmtree(parts_dir)
+    return {'chunks': n_chunks, 'resumed_chunks': n_chunks - len(pending), 'rows_scored': n_rows,
+            'seconds': time.perf_counter() - start}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score a CSV or Parquet transaction file into a Parquet file.')
+    parser.add_argument('input_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='rows per chunk')
+    parser.add_argument('--workers', type=int, help='scoring processes (default: one per core)')
+    parser.add_argument('--aggregates', default='file', choices=AGGREGATE_SOURCES,
+                        help='per-customer aggregates from a pass over the whole file or from the customer feature store')
+    parser.add_argument('--threshold', type=float, default=0.5, help='score from which Risk_Label is 1')
+    parser.add_argument('--registry-dir', default=REGISTRY_DIR)
+    parser.add_argument('--preprocessor', help='fitted preprocessor JSON (default: app/preprocessor.json)')
+    args = parser.parse_args()
+
+    summary = score_file(args.input_path, args.output_path, args.chunksize, args.workers, args.aggregates,
+                         args.threshold, args.registry_dir, args.preprocessor)
+    print(f"Scored {summary['rows_scored']:,} rows in {summary['chunks']} chunks "
+          f"({summary['resumed_chunks']} resumed) in {summary['seconds']:.1f}s into {args.output_path}")
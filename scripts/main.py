@@ -1,65 +1,67 @@
 import os
 import sys
+import json
+import argparse
 # Append the correct src path for custom module imports
 sys.path.append(os.path.abspath('../src'))
 sys.path.append(os.path.abspath('../data'))
+sys.path.append(os.path.abspath('../app'))
 
-from load_data import load_data
-from eda import (
-    dataset_overview,
-    summary_statistics,
-    plot_numerical_histograms,
-    plot_numerical_boxplots,
-    plot_pairplots,
-    plot_categorical_distributions,
-    plot_categorical_vs_target,
-    correlation_analysis,
-    identify_missing_values,
-    plot_outliers,
-    plot_boxplots,
-)
+from load_data import load_data_cached
+from eda_report import generate_eda_report
+from profiling import profile_csv, diff_profiles
 from feature_engineering import (
-    create_aggregate_features,
     extract_transaction_time_features,
     merge_aggregate_and_time_features,
     reorder_columns,
     encode_features,
-    handle_missing_values,
-    normalize_features
+    fit_feature_encoder,
+    impute_and_scale,
+    fit_serving_preprocessor,
+    save_serving_preprocessor
 )
+from feature_store import CustomerFeatureStore
+from encoding import CategoricalEncoder
 from woe_binning import process_rfms_binning
 from train_test_split import split_data
-
-from modeling import (
-    train_and_evaluate_logistic_regression,
-    train_and_evaluate_random_forest,
-    train_and_evaluate_xgboost,
-    train_and_evaluate_adaboost,
-    train_and_evaluate_decision_tree
-)
-
-def main():
-    # Load the data
-    df = load_data('../data/data.csv')
-
-    # Perform EDA
-    dataset_overview(df)
-    summary_statistics(df)
-    plot_numerical_histograms(df)
-    plot_numerical_boxplots(df)
-    plot_pairplots(df)
-    # plot_categorical_distributions(df)
-    # plot_categorical_vs_target(df)
-    correlation_analysis(df)
-    identify_missing_values(df)
-    plot_outliers(df)
-    plot_boxplots(df)
+from cross_validation import cross_validate_models, CV_MODES
+from tuning import tune_models
+
+from modeling import train_models_in_parallel, record_lineage, load_lineage, refresh_models, MODEL_DIR, TRAINERS
+
+def main(refresh=False, cv=None, tune=False):
+    # Profile the raw CSV in one streaming pass and report what changed since the last run
+    os.makedirs('../reports', exist_ok=True)
+    profile = profile_csv('../data/data.csv').to_dict()
+    if os.path.exists('../reports/profile.json'):
+        print(diff_profiles('../reports/profile.json', profile))
+    with open('../reports/profile.json', 'w') as f:
+        json.dump(profile, f, indent=2)
+
+    # Load the data (from the Parquet cache, rebuilt only when data.csv changes)
+    df = load_data_cached('../data/data.csv', compact=False)
+
+    # Fit the serving preprocessor on the raw transactions and save it next to the app model
+    save_serving_preprocessor(fit_serving_preprocessor(df), '../app/preprocessor.json')
+
+    # Perform EDA: render the plots headlessly into an HTML report (unchanged data is not re-rendered)
+    # (the categorical plots are skipped: the id columns have too many levels to plot).
+    # Histograms and pair plots are binned over all rows; the rest use a sample stratified by FraudResult
+    generate_eda_report(df, '../reports/eda', sample_size=100_000, plots=[
+        'binned_histograms', 'numerical_boxplots', 'binned_pairplots', 'correlation_analysis', 'outliers', 'boxplots'
+    ])
+
+    # Rebuild the customer feature store from the full history; it backs both the
+    # aggregate features below and the per-customer lookups in the app
+    feature_store = CustomerFeatureStore('../app/customer_features.db')
+    feature_store.clear()
+    feature_store.ingest(df)
 
     # Create aggregate features
-    aggregate_features = create_aggregate_features(df)
+    aggregate_features = feature_store.lookup(df['CustomerId'])
 
     # Extract time-based features
-    df = extract_transaction_time_features(df)
+    df = extract_transaction_time_features(df, weekday=True, cyclical=True)
 
     # Merge aggregate features with extracted time-based features
     final_df = merge_aggregate_and_time_features(df, aggregate_features)
@@ -67,44 +69,69 @@ def main():
     # Reorder columns to place 'FraudResult' at the end
     final_df = reorder_columns(final_df)
 
-    # Handle missing values
-    final_df = handle_missing_values(final_df)
-
-    # Encode categorical features
-    final_df = encode_features(final_df)
-
-    # Normalize numerical features
-    final_df = normalize_features(final_df)
+    # Encode categorical features, then impute missing values and normalize numerical features in one
+    # pass (missing categories go to the encoder's unknown bucket). A full run fits the vocabularies
+    # and parameters and keeps them next to the models; a refresh reuses them so new rows match.
+    encoder_path = os.path.join(MODEL_DIR, 'categorical_encoder.json')
+    params_path = os.path.join(MODEL_DIR, 'impute_scale.json')
+    if refresh and os.path.exists(encoder_path) and os.path.exists(params_path):
+        final_df = encode_features(final_df, CategoricalEncoder.load(encoder_path))
+        with open(params_path) as f:
+            final_df, _ = impute_and_scale(final_df, json.load(f))
+    else:
+        encoder = fit_feature_encoder(final_df)
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        encoder.save(encoder_path)
+        final_df = encode_features(final_df, encoder)
+
+        final_df, impute_scale_params = impute_and_scale(final_df)
+        with open(params_path, 'w') as f:
+            json.dump(impute_scale_params, f, indent=2)
 
     # Display the final DataFrame
     print("Final DataFrame after feature engineering:\n", final_df.head())
 
     """Main function to execute the RFMS analysis."""
-    final_df, woe_df = process_rfms_binning(final_df)
+    # Recency is measured from each customer's last transaction to the end of the data
+    final_df, woe_df = process_rfms_binning(final_df, as_of=final_df['TransactionStartTime'].max())
     print(final_df.head())
     print(woe_df.head())
     
 
+    # Incremental refresh: warm-start the saved models on the transactions after their checkpoint
+    if refresh and load_lineage(MODEL_DIR):
+        refresh_models(final_df)
+        return
+
+    # Cross-validate the models first when asked, for scores less noisy than the single split below
+    if cv:
+        cross_validate_models(final_df, mode=cv)
+
     X_train, X_test, y_train, y_test = split_data(final_df)
     print(f"Training set size: {X_train.shape[0]} samples")
     print(f"Testing set size: {X_test.shape[0]} samples")
 
-    # Train and evaluate Logistic Regression
-    train_and_evaluate_logistic_regression(X_train, X_test, y_train, y_test)
-    
-    # Train and evaluate Random Forest
-    train_and_evaluate_random_forest(X_train, X_test, y_train, y_test)
+    if tune:
+        # Search each model family's hyperparameters and save the best models instead of the defaults
+        tune_models(X_train, y_train)
+    else:
+        # Train and evaluate all models concurrently and print the leaderboard
+        train_models_in_parallel(X_train, X_test, y_train, y_test)
 
-    # Train and evaluate XGBoost
-    train_and_evaluate_xgboost(X_train, X_test, y_train, y_test)
+    # Checkpoint the full training in the model lineage, for later refreshes
+    start_time = final_df['TransactionStartTime']
+    for name in TRAINERS:
+        record_lineage(MODEL_DIR, name, 'full', len(X_train), start_time.min(), start_time.max(), X_train.columns)
 
-    # Train and evaluate AdaBoost
-    train_and_evaluate_adaboost(X_train, X_test, y_train, y_test)
-
-    # Train and evaluate Decision Tree
-    train_and_evaluate_decision_tree(X_train, X_test, y_train, y_test)
-    
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--refresh', action='store_true',
+                        help='warm-start the saved models on new transactions instead of retraining from scratch')
+    parser.add_argument('--cv', choices=CV_MODES,
+                        help='also cross-validate the models with stratified, time-ordered or CustomerId-grouped folds')
+    parser.add_argument('--tune', action='store_true',
+                        help='tune the hyperparameters of each model (resumable Hyperband search) instead of using the defaults')
+    args = parser.parse_args()
+    main(refresh=args.refresh, cv=args.cv, tune=args.tune)
 
@@ -0,0 +1,143 @@
+import os
+import sys
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.model_selection import StratifiedKFold, StratifiedGroupKFold
+import joblib
+sys.path.append(os.path.abspath('../src'))
+from model_evaluation import evaluate_scores
+from modeling import ESTIMATORS, MULTITHREADED_TRAINERS, SPARSE_TRAINERS
+from encoding import to_csr
+from train_test_split import NON_FEATURE_COLUMNS
+
+# Fold schemes of make_folds
+CV_MODES = ['stratified', 'time', 'group']
+
+
+# Function to build stratified k-fold splits
+def stratified_folds(y, n_splits=5, seed=42):
+    """Shuffled folds with the class balance of y. Returns a list of (train, test) index arrays."""
+    y = np.asarray(y)
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return [(train, test) for train, test in splitter.split(np.zeros(len(y)), y)]
+
+# Function to build time-ordered splits
+def time_folds(times, n_splits=5):
+    """
+    Expanding-window folds: the rows ordered by time are cut into n_splits + 1 blocks and
+    fold k tests on block k + 1 after training on every earlier block. Rows with the same
+    timestamp stay in one block. Returns a list of (train, test) index arrays.
+    """
+    times = pd.DatetimeIndex(pd.to_datetime(times, utc=True)).asi8
+    order = np.argsort(times, kind='stable')
+    sorted_times = times[order]
+    edges = np.linspace(0, len(order), n_splits + 2).astype(int)
+    # Move each inner edge back to the first row of its timestamp
+    edges[1:-1] = np.searchsorted(sorted_times, sorted_times[edges[1:-1]], side='left')
+    return [(np.sort(order[:edges[k + 1]]), np.sort(order[edges[k + 1]:edges[k + 2]])) for k in range(n_splits)]
+
+# Function to build customer-grouped splits
+def group_folds(y, groups, n_splits=5, seed=42):
+    """
+    Folds that keep all rows of a group (e.g. a CustomerId) on the same side, as close to the
+    class balance of y as the groups allow. Returns a list of (train, test) index arrays.
+    """
+    y = np.asarray(y)
+    splitter = StratifiedGroupKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return [(train, test) for train, test in splitter.split(np.zeros(len(y)), y, np.asarray(groups))]
+
+def make_folds(final_df, mode='stratified', n_splits=5, target_col='Risk_Label', seed=42):
+    """
+    Cross-validation folds over the rows of final_df: 'stratified' on the target, 'time'
+    ordered by TransactionStartTime, or 'group' by CustomerId so no customer is in both
+    the training and the test rows of a fold.
+    """
+    if mode == 'stratified':
+        return stratified_folds(final_df[target_col], n_splits, seed)
+    if mode == 'time':
+        return time_folds(final_df['TransactionStartTime'], n_splits)
+    if mode == 'group':
+        return group_folds(final_df[target_col], final_df['CustomerId'], n_splits, seed)
+    raise ValueError(f"Unknown cross-validation mode '{mode}'; expected one of {', '.join(CV_MODES)}.")
+
+def _fit_fold(name, fold, data_paths, n_jobs):
+    """Worker: memory-map the shared matrix and folds, fit one model on one fold and score it."""
+    X, y, folds = (joblib.load(path, mmap_mode='r') for path in data_paths)
+    train, test = folds[fold]
+    X_train, X_test = X[train], X[test]
+    if sparse.issparse(X) and name not in SPARSE_TRAINERS:
+        X_train, X_test = X_train.toarray(), X_test.toarray()
+
+    model = ESTIMATORS[name](n_jobs)
+    model.fit(X_train, y[train])
+    evaluation = evaluate_scores(y[test], model.predict_proba(X_test)[:, 1], thresholds=[])
+    return {
+        'Model': name,
+        'Fold': fold,
+        'Train Rows': len(train),
+        'Test Rows': len(test),
+        'AUC': evaluation['auc'],
+        'KS': evaluation['ks'],
+        'PR-AUC': evaluation['pr_auc'],
+        'Brier': evaluation['brier'],
+        'Accuracy': evaluation['accuracy'],
+    }
+
+def summarize_cv_scores(fold_scores):
+    """Mean and standard deviation of each fold metric per model, sorted by mean AUC."""
+    metrics = ['AUC', 'KS', 'PR-AUC', 'Brier', 'Accuracy']
+    summary = fold_scores.groupby('Model')[metrics].agg(['mean', 'std'])
+    return summary.sort_values(('AUC', 'mean'), ascending=False)
+
+def cross_validate_models(final_df, mode='stratified', n_splits=5, model_names=None, n_cores=None,
+                          target_col='Risk_Label', seed=42):
+    """
+    Cross-validate the models on final_df, fitting every (model, fold) pair in parallel.
+
+    The features (final_df without NON_FEATURE_COLUMNS; categoricals one-hot encoded into a
+    CSR matrix by encoding.to_csr) and the folds, as index arrays, are dumped once and
+    memory-mapped read-only by the worker processes, which slice their fold's rows from the
+    shared matrix.
+
+    Returns:
+        pandas.DataFrame: One row of test metrics per model and fold (see summarize_cv_scores).
+    """
+    model_names = model_names or list(ESTIMATORS)
+    folds = make_folds(final_df, mode, n_splits, target_col, seed)
+    X = final_df.drop(columns=NON_FEATURE_COLUMNS, errors='ignore')
+    if any(isinstance(dtype, pd.CategoricalDtype) for dtype in X.dtypes):
+        X, _ = to_csr(X)
+    else:
+        X = np.ascontiguousarray(X.to_numpy(dtype='float64'))
+    y = final_df[target_col].to_numpy()
+
+    tasks = [(name, fold) for name in model_names for fold in range(len(folds))]
+    n_cores = n_cores or os.cpu_count() or 1
+    n_workers = min(len(tasks), n_cores)
+    threads = max(1, n_cores // n_workers)
+
+    shared_dir = tempfile.mkdtemp(prefix='cv_')
+    try:
+        data_paths = []
+        for name, data in [('X', X), ('y', y), ('folds', folds)]:
+            path = os.path.join(shared_dir, f'{name}.joblib')
+            joblib.dump(data, path)
+            data_paths.append(path)
+
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [
+                executor.submit(_fit_fold, name, fold, data_paths, threads if name in MULTITHREADED_TRAINERS else 1)
+                for name, fold in tasks
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    fold_scores = pd.DataFrame(results)
+    print(f"{n_splits}-fold {mode} cross-validation:")
+    print(summarize_cv_scores(fold_scores).round(4).to_string())
+    return fold_scores
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 
 def dataset_overview(df):
     print("Overview of the Dataset:")
@@ -112,3 +113,89 @@ def plot_boxplots(df, target_col='FraudResult'):
             plt.xlabel(target_col)
             plt.ylabel(col)
             plt.show()
+
+def stratified_sample(df, n=100_000, target_col='FraudResult', min_per_class=1_000, random_state=42):
+    """
+    Sample about n rows, stratified by target_col: each class is sampled in proportion to
+    its size but keeps at least min_per_class rows (or all of them), so rare classes such
+    as fraud stay visible.
+    """
+    if len(df) <= n:
+        return df
+    if target_col not in df.columns:
+        return df.sample(n=n, random_state=random_state).sort_index()
+    samples = []
+    for _, group in df.groupby(target_col, observed=True):
+        size = min(len(group), max(round(n * len(group) / len(df)), min_per_class))
+        samples.append(group.sample(n=size, random_state=random_state))
+    return pd.concat(samples).sort_index()
+
+def plot_binned_histograms(df, bins=30):
+    """
+    Histograms computed once per column with np.histogram and drawn from the bin counts,
+    so the drawing cost does not grow with the number of rows.
+    """
+    numerical_cols = df.select_dtypes(include='number').columns
+    n_rows = int(np.ceil(len(numerical_cols) / 2))
+    fig, axes = plt.subplots(n_rows, 2, figsize=(15, 4 * n_rows), squeeze=False)
+    for ax, col in zip(axes.flat, numerical_cols):
+        values = df[col].to_numpy(dtype='float64')
+        counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+        ax.stairs(counts, edges, fill=True)
+        ax.set_title(f'Histogram of {col}')
+        ax.set_xlabel(col)
+        ax.set_ylabel('Frequency')
+    for ax in axes.flat[len(numerical_cols):]:
+        ax.set_visible(False)
+    plt.tight_layout()
+    plt.show()
+
+def _equal_width_bins(values, bins):
+    """Equal-width bin code of every value (-1 for missing/infinite) and the bin edges."""
+    finite = np.isfinite(values)
+    low, high = (values[finite].min(), values[finite].max()) if finite.any() else (0.0, 1.0)
+    if high == low:
+        low, high = low - 0.5, high + 0.5
+    edges = np.linspace(low, high, bins + 1)
+    codes = np.full(len(values), -1, dtype=np.int64)
+    codes[finite] = np.minimum(((values[finite] - low) / (high - low) * bins).astype(np.int64), bins - 1)
+    return codes, edges
+
+def plot_binned_pairplots(df, bins=50):
+    """
+    Pair plot of the numerical columns built from 2D histograms (log colour scale) instead
+    of scatter points, with binned histograms on the diagonal. Every column is binned once
+    and each pair is counted with np.bincount on the combined bin codes.
+    """
+    numerical_cols = df.select_dtypes(include='number').columns
+    n = len(numerical_cols)
+    binned = {col: _equal_width_bins(df[col].to_numpy(dtype='float64'), bins) for col in numerical_cols}
+    fig, axes = plt.subplots(n, n, figsize=(2.5 * n, 2.5 * n), squeeze=False)
+    for i, row_col in enumerate(numerical_cols):
+        row_codes, row_edges = binned[row_col]
+        for j, col in enumerate(numerical_cols):
+            codes, edges = binned[col]
+            ax = axes[i, j]
+            if i == j:
+                ax.stairs(np.bincount(codes[codes >= 0], minlength=bins), edges, fill=True)
+            else:
+                mask = (codes >= 0) & (row_codes >= 0)
+                counts = np.bincount(codes[mask] * bins + row_codes[mask], minlength=bins * bins).reshape(bins, bins)
+                ax.pcolormesh(edges, row_edges, np.ma.masked_equal(counts, 0).T, norm=LogNorm(), cmap='viridis')
+            if i == n - 1:
+                ax.set_xlabel(col)
+            if j == 0:
+                ax.set_ylabel(row_col)
+    plt.suptitle('Binned Pair Plot of Numerical Features', y=1.02)
+    plt.tight_layout()
+    plt.show()
+
+def scalable_eda(df, sample_size=100_000, target_col='FraudResult', min_per_class=1_000):
+    """
+    EDA for multi-million-row datasets: binned histograms and pair plots over all rows,
+    and the per-row plots (box plots by target) on a stratified sample.
+    """
+    plot_binned_histograms(df)
+    plot_binned_pairplots(df)
+    sample = stratified_sample(df, n=sample_size, target_col=target_col, min_per_class=min_per_class)
+    plot_boxplots(sample, target_col=target_col)
@@ -0,0 +1,155 @@
+import os
+import io
+import html
+import json
+import hashlib
+import tempfile
+import warnings
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import matplotlib.pyplot as plt
+
+import eda
+
+# Plots rendered into the report, and whether they take the target column
+REPORT_PLOTS = {
+    'numerical_histograms': (eda.plot_numerical_histograms, False),
+    'numerical_boxplots': (eda.plot_numerical_boxplots, False),
+    'pairplots': (eda.plot_pairplots, False),
+    'categorical_distributions': (eda.plot_categorical_distributions, False),
+    'categorical_vs_target': (eda.plot_categorical_vs_target, True),
+    'correlation_analysis': (eda.correlation_analysis, False),
+    'outliers': (eda.plot_outliers, False),
+    'boxplots': (eda.plot_boxplots, True),
+    'binned_histograms': (eda.plot_binned_histograms, False),
+    'binned_pairplots': (eda.plot_binned_pairplots, False),
+}
+
+# Plots drawn from bin counts, which always get the full data
+BINNED_PLOTS = ['binned_histograms', 'binned_pairplots']
+
+# Text sections captured from the printing EDA functions
+REPORT_TEXT = {
+    'Dataset Overview': eda.dataset_overview,
+    'Summary Statistics': eda.summary_statistics,
+    'Missing Values': eda.identify_missing_values,
+}
+
+def hash_dataframe(df):
+    """Content hash of a DataFrame (values, index, column names and dtypes)."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    return digest.hexdigest()
+
+def render_plot(name, data_path, report_dir, target_col):
+    """
+    Worker: render one EDA plot with the Agg backend and save every figure it opens as PNG.
+
+    Returns:
+        tuple: (name, list of PNG file names, error message or None)
+    """
+    plt.switch_backend('Agg')
+    plt.close('all')
+    plot_fn, takes_target = REPORT_PLOTS[name]
+    df = pd.read_pickle(data_path)
+
+    try:
+        with warnings.catch_warnings():
+            # plt.show() is a no-op on Agg; silence its warning and seaborn's
+            warnings.simplefilter('ignore')
+            plot_fn(df, target_col=target_col) if takes_target else plot_fn(df)
+    except Exception as e:
+        plt.close('all')
+        return name, [], f'{type(e).__name__}: {e}'
+
+    files = []
+    for i, num in enumerate(plt.get_fignums()):
+        filename = f'{name}_{i}.png'
+        plt.figure(num).savefig(os.path.join(report_dir, filename), bbox_inches='tight')
+        files.append(filename)
+    plt.close('all')
+    return name, files, None
+
+def _capture_text(df):
+    sections = {}
+    for title, fn in REPORT_TEXT.items():
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer), pd.option_context('display.width', 200):
+            fn(df)
+        sections[title] = buffer.getvalue()
+    return sections
+
+def _write_html(report_dir, text_sections, manifest):
+    parts = ['<!DOCTYPE html>', '<html><head><meta charset="UTF-8"><title>EDA Report</title></head><body>',
+             '<h1>EDA Report</h1>']
+    for title, text in text_sections.items():
+        parts.append(f'<h2>{html.escape(title)}</h2><pre>{html.escape(text)}</pre>')
+    for name, entry in manifest['plots'].items():
+        parts.append(f'<h2>{html.escape(name)}</h2>')
+        if entry['error']:
+            parts.append(f'<p>Failed to render: {html.escape(entry["error"])}</p>')
+        parts.extend(f'<img src="{html.escape(filename)}" alt="{html.escape(name)}">' for filename in entry['files'])
+    parts.append('</body></html>')
+
+    path = os.path.join(report_dir, 'index.html')
+    with open(path, 'w') as f:
+        f.write('\n'.join(parts))
+    return path
+
+def generate_eda_report(df, report_dir, plots=None, target_col='FraudResult', n_jobs=None, sample_size=None):
+    """
+    Render the EDA plots headlessly (Agg backend) in a process pool and write them as PNG
+    files plus an index.html with the overview, summary statistics and missing values.
+
+    If sample_size is given, the per-row plots are drawn from a sample of that size,
+    stratified by target_col (see eda.stratified_sample); the binned plots always use all rows.
+
+    Plots are cached by a hash of the data: a plot whose files were already rendered from
+    identical data is not rendered again.
+
+    Returns:
+        str: Path to the report's index.html.
+    """
+    plots = plots or list(REPORT_PLOTS)
+    os.makedirs(report_dir, exist_ok=True)
+    manifest_path = os.path.join(report_dir, 'manifest.json')
+    manifest = {'plots': {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    data_hash = hash_dataframe(df)
+    cache_key = f'{data_hash}:{target_col}:{sample_size}'
+    to_render = [
+        name for name in plots
+        if manifest['plots'].get(name, {}).get('key') != cache_key
+        or not all(os.path.exists(os.path.join(report_dir, f)) for f in manifest['plots'][name]['files'])
+    ]
+
+    if to_render:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Workers read the data from one pickle rather than each receiving a copy over a pipe
+            data_path = os.path.join(tmp, 'data.pkl')
+            df.to_pickle(data_path)
+            sample_path = data_path
+            if sample_size is not None:
+                sample_path = os.path.join(tmp, 'sample.pkl')
+                eda.stratified_sample(df, n=sample_size, target_col=target_col).to_pickle(sample_path)
+
+            with ProcessPoolExecutor(max_workers=min(n_jobs or os.cpu_count() or 1, len(to_render))) as executor:
+                futures = [
+                    executor.submit(render_plot, name, data_path if name in BINNED_PLOTS else sample_path, report_dir, target_col)
+                    for name in to_render
+                ]
+                for future in futures:
+                    name, files, error = future.result()
+                    manifest['plots'][name] = {'key': cache_key, 'files': files, 'error': error}
+
+    manifest['plots'] = {name: manifest['plots'][name] for name in plots}
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"EDA report: rendered {len(to_render)} of {len(plots)} plots ({len(plots) - len(to_render)} cached).")
+    return _write_html(report_dir, _capture_text(df), manifest)
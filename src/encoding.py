@@ -0,0 +1,124 @@
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Reserved last category that values not seen during fit (and missing values) map to
+UNKNOWN_CATEGORY = '<unknown>'
+
+def one_hot_csr(codes, n_categories):
+    """One-hot encode integer codes as a CSR matrix with one column per category; negative codes get no entry."""
+    codes = np.asarray(codes)
+    rows = np.flatnonzero(codes >= 0)
+    return sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, codes[rows])), shape=(len(codes), n_categories)
+    )
+
+def to_csr(X, dtype='float32'):
+    """
+    Convert a feature DataFrame to a CSR matrix without building dense dummy columns.
+
+    Numeric columns are all stored (zeros included, so XGBoost does not treat them as
+    missing) and each categorical column is one-hot encoded from its category codes, one
+    column per category. The arrays are filled in place, row by row as CSR lays them out.
+    float32 is lossless for XGBoost and the sklearn trees, which train in float32.
+
+    Returns:
+        tuple: (scipy.sparse.csr_matrix, list of feature names)
+    """
+    categorical = [col for col in X.columns if isinstance(X[col].dtype, pd.CategoricalDtype)]
+    numeric = [col for col in X.columns if col not in categorical]
+    n_rows, width = len(X), len(X.columns)
+    index_dtype = np.int32 if n_rows * width < 2 ** 31 else np.int64
+
+    data = np.ones((n_rows, width), dtype=dtype)
+    indices = np.empty((n_rows, width), dtype=index_dtype)
+    present = np.ones((n_rows, width), dtype=bool)
+    for j, col in enumerate(numeric):
+        data[:, j] = X[col].to_numpy(dtype=dtype)
+        indices[:, j] = j
+
+    feature_names = list(numeric)
+    for j, col in enumerate(categorical, start=len(numeric)):
+        codes = X[col].cat.codes.to_numpy()
+        indices[:, j] = len(feature_names) + codes
+        present[:, j] = codes >= 0
+        feature_names.extend(f'{col}_{category}' for category in X[col].cat.categories)
+
+    if present.all():
+        indptr = np.arange(0, n_rows * width + 1, width, dtype=index_dtype)
+        data, indices = data.ravel(), indices.ravel()
+    else:
+        # Missing categories (code -1) get no entry
+        indptr = np.concatenate([[0], np.cumsum(present.sum(axis=1))]).astype(index_dtype)
+        data, indices = data[present], indices[present]
+    return sparse.csr_matrix((data, indices, indptr), shape=(n_rows, len(feature_names))), feature_names
+
+
+class CategoricalEncoder:
+    """
+    Fitted vocabularies for categorical columns.
+
+    Each vocabulary is the column's sorted distinct values as strings (the order
+    LabelEncoder uses) followed by the reserved UNKNOWN_CATEGORY bucket, so the codes of
+    seen values match LabelEncoder and unseen values still get a valid code.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.vocabularies_ = {}
+
+    def fit(self, df):
+        for col in self.columns:
+            values = pd.Index(pd.unique(df[col].dropna())).astype(str)
+            self.vocabularies_[col] = sorted(set(values)) + [UNKNOWN_CATEGORY]
+        return self
+
+    def codes(self, df, col):
+        """Integer codes of one column in the smallest integer dtype that holds them."""
+        unknown = len(self.vocabularies_[col]) - 1
+        # Look up each distinct value once rather than every row
+        codes, uniques = pd.factorize(df[col])
+        lookup = pd.Index(self.vocabularies_[col][:-1]).get_indexer(pd.Index(uniques).astype(str))
+        lookup = np.append(np.where(lookup < 0, unknown, lookup), unknown)
+        return lookup[codes].astype(np.min_scalar_type(unknown))
+
+    def transform(self, df, as_codes=None):
+        """
+        Replace the encoded columns with pandas categoricals on the fitted vocabularies
+        (one small integer code per row). Columns listed in `as_codes` get the plain
+        integer codes (int64) instead.
+        """
+        as_codes = as_codes or []
+        # Shallow copy: the replaced columns are new arrays, the others are shared with df
+        df = df.copy(deep=False)
+        for col in self.columns:
+            codes = self.codes(df, col)
+            if col in as_codes:
+                df[col] = codes.astype('int64')
+            else:
+                df[col] = pd.Categorical.from_codes(codes, categories=self.vocabularies_[col])
+        return df
+
+    def one_hot(self, df):
+        """
+        One-hot encode the columns as a CSR matrix.
+
+        Returns:
+            tuple: (scipy.sparse.csr_matrix, list of feature names)
+        """
+        blocks = [one_hot_csr(self.codes(df, col), len(self.vocabularies_[col])) for col in self.columns]
+        feature_names = [f'{col}_{category}' for col in self.columns for category in self.vocabularies_[col]]
+        return sparse.hstack(blocks, format='csr'), feature_names
+
+    def save(self, filepath):
+        with open(filepath, 'w') as f:
+            json.dump({'columns': self.columns, 'vocabularies': self.vocabularies_}, f, indent=2)
+
+    @classmethod
+    def load(cls, filepath):
+        with open(filepath) as f:
+            data = json.load(f)
+        encoder = cls(data['columns'])
+        encoder.vocabularies_ = data['vocabularies']
+        return encoder
@@ -1,7 +1,14 @@
 import os 
 import sys
+import json
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import OneHotEncoder, LabelEncoder, MinMaxScaler
+from encoding import CategoricalEncoder
+# The time features and amount aggregates are shared with the app, which keeps its modules in app/
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+from time_features import add_time_features
+from feature_store import amount_aggregates, merge_amount_aggregates
 
 def create_aggregate_features(df):
     """
@@ -16,17 +23,54 @@ def create_aggregate_features(df):
 
     return aggregate_features
 
-def extract_transaction_time_features(df):
+def merge_partial_aggregates(left, right):
     """
-    Extract time-based features from the TransactionStartTime column.
+    Merge two partial per-customer aggregates (count, total, mean, m2, transaction_count)
+    indexed by CustomerId, using the parallel form of Welford's variance update.
     """
-    df['TransactionStartTime'] = pd.to_datetime(df['TransactionStartTime'])
-    df['Transaction_Hour'] = df['TransactionStartTime'].dt.hour
-    df['Transaction_Day'] = df['TransactionStartTime'].dt.day
-    df['Transaction_Month'] = df['TransactionStartTime'].dt.month
-    df['Transaction_Year'] = df['TransactionStartTime'].dt.year
+    left, right = left.align(right, join='outer', fill_value=0)
+    return merge_amount_aggregates(left, right).assign(
+        transaction_count=left['transaction_count'] + right['transaction_count'])
 
-    return df
+def partial_aggregates(chunk):
+    """
+    Per-customer partial aggregates of a chunk of transactions (count, total, mean and m2
+    of Amount, plus the TransactionId count), ready for merge_partial_aggregates.
+    """
+    return amount_aggregates(chunk['Amount'], chunk['CustomerId']).assign(
+        transaction_count=chunk.groupby('CustomerId', observed=True)['TransactionId'].count())
+
+def create_aggregate_features_from_chunks(chunks):
+    """
+    Create the same aggregate features as create_aggregate_features from an iterable of
+    transaction chunks (e.g. load_data.load_data_in_chunks), keeping only one partial
+    aggregate row per customer in memory.
+    """
+    partial = None
+    for chunk in chunks:
+        chunk_partial = partial_aggregates(chunk)
+        partial = chunk_partial if partial is None else merge_partial_aggregates(partial, chunk_partial)
+
+    if partial is None:
+        raise ValueError("No transaction chunks to aggregate.")
+
+    std = (partial['m2'] / (partial['count'] - 1)).where(partial['count'] > 1) ** 0.5
+    aggregate_features = pd.DataFrame({
+        'Total_Transaction_Amount': partial['total'],
+        'Average_Transaction_Amount': partial['mean'],
+        'Transaction_Count': partial['transaction_count'].astype('int64'),
+        'Std_Deviation_Transaction_Amount': std,
+    })
+    aggregate_features.index.name = 'CustomerId'
+    return aggregate_features.reset_index()
+
+def extract_transaction_time_features(df, weekday=False, cyclical=False):
+    """
+    Extract time-based features (hour, day, month and year) from the TransactionStartTime column,
+    plus the weekday if weekday is True and sin/cos encodings of the hour, month (and weekday)
+    if cyclical is True (see app/time_features.py).
+    """
+    return add_time_features(df, weekday=weekday, cyclical=cyclical)
 
 def merge_aggregate_and_time_features(df, aggregate_features):
     """
@@ -45,41 +89,164 @@ def reorder_columns(final_df):
     final_df = final_df[column_order]
     return final_df
 
-def encode_features(df):
+# Columns encoded by encode_features: one-hot (categoricals expanded by the models) and label (integer codes)
+ONE_HOT_COLUMNS = ['ProductCategory', 'ChannelId', 'CurrencyCode']
+LABEL_COLUMNS = ['ProviderId', 'PricingStrategy', 'CountryCode']
+
+def fit_feature_encoder(df):
     """
-    Perform One-Hot and Label Encoding on the specified columns.
+    Fit the vocabularies of the encoded columns (see encoding.CategoricalEncoder).
     """
-    # One-Hot Encoding
-    one_hot_columns = ['ProductCategory', 'ChannelId', 'CurrencyCode']
-    df_one_hot = pd.get_dummies(df, columns=one_hot_columns, drop_first=True)
+    return CategoricalEncoder(ONE_HOT_COLUMNS + LABEL_COLUMNS).fit(df)
 
-    # Label Encoding
-    label_columns = ['ProviderId', 'PricingStrategy', 'CountryCode']
-    label_encoder = LabelEncoder()
-    for col in label_columns:
-        df_one_hot[col] = label_encoder.fit_transform(df_one_hot[col])
+def encode_features(df, encoder=None):
+    """
+    Encode the categorical columns with a fitted CategoricalEncoder (fitted on df if not given).
 
-    return df_one_hot
+    The one-hot columns become pandas categoricals, which encoding.to_csr expands into
+    sparse one-hot columns for the models; the label columns become integer codes.
+    Categories not seen when the encoder was fitted map to its reserved unknown bucket.
+    """
+    encoder = encoder or fit_feature_encoder(df)
+    return encoder.transform(df, as_codes=LABEL_COLUMNS)
 
-def handle_missing_values(final_df):
+# Column dtypes imputed with the median and Min-Max scaled
+NUMERIC_DTYPES = ['float64', 'int64', 'float32']
+
+def impute_and_scale(final_df, params=None, impute=True, scale=True):
     """
-    Handle missing values by imputing with median for numeric columns and mode for categorical columns.
+    Fused missing-value imputation and Min-Max scaling.
+
+    Numeric columns get their median and are scaled to [0, 1]; text columns get their mode.
+    Each numeric column is read once into a float32 array, its parameters are fitted from
+    that array and it is filled and scaled in place with NumPy, so the extra memory is one
+    float32 column at a time. The medians, modes and min/max are fitted unless `params`
+    (as returned by an earlier call) are given.
+
+    Returns:
+        tuple: (DataFrame, params) - params can be passed back in to apply the same
+        imputation and scaling to new data.
     """
-    for column in final_df.select_dtypes(include=['float64', 'int64']).columns:
-        median_value = final_df[column].median()
-        final_df[column].fillna(median_value, inplace=True)
+    fit = params is None
+    if fit:
+        params = {
+            'medians': {},
+            'modes': {},
+            'min_max': {},
+            'numeric_columns': final_df.select_dtypes(include=NUMERIC_DTYPES).columns.tolist(),
+            'text_columns': final_df.select_dtypes(include=['object', 'string']).columns.tolist(),
+        }
+
+    for column in params['numeric_columns']:
+        values = final_df[column].to_numpy(dtype='float32', na_value=np.nan)
+        if not values.flags.writeable:
+            # Already float32: the frame's own (read-only) data, so work on a copy
+            values = values.copy()
+        missing = np.isnan(values)
+        has_missing = missing.any()
+        observed = values[~missing] if has_missing else values
+        if fit and impute:
+            params['medians'][column] = float(np.median(observed)) if len(observed) else 0.0
+        if fit and scale:
+            params['min_max'][column] = [float(observed.min()), float(observed.max())] if len(observed) else [0.0, 0.0]
+
+        if impute and has_missing:
+            values[missing] = params['medians'][column]
+        if scale:
+            col_min, col_max = params['min_max'][column]
+            values -= col_min
+            # Constant columns map to 0, as with MinMaxScaler
+            values /= (col_max - col_min) or 1.0
+        if scale or (impute and has_missing):
+            final_df[column] = values
 
-    for column in final_df.select_dtypes(include=['object']).columns:
-        mode_value = final_df[column].mode()[0]
-        final_df[column].fillna(mode_value, inplace=True)
+    if impute:
+        for column in params['text_columns']:
+            if fit:
+                mode = final_df[column].mode()
+                params['modes'][column] = mode[0] if len(mode) else None
+            if final_df[column].isna().any():
+                final_df[column] = final_df[column].fillna(params['modes'][column])
 
+    return final_df, params
+
+def handle_missing_values(final_df):
+    """
+    Handle missing values by imputing with median for numeric columns and mode for categorical columns.
+    """
+    final_df, _ = impute_and_scale(final_df, scale=False)
     return final_df
 
 def normalize_features(final_df):
     """
     Normalize numerical columns using Min-Max scaling.
     """
-    numerical_columns = final_df.select_dtypes(include=['float64', 'int64']).columns
-    min_max_scaler = MinMaxScaler()
-    final_df[numerical_columns] = min_max_scaler.fit_transform(final_df[numerical_columns])
+    final_df, _ = impute_and_scale(final_df, impute=False)
     return final_df
+
+
+# Columns and order expected by the served model (app/xgb_model.pkl)
+SERVING_FEATURE_COLUMNS = [
+    'Amount', 'Value', 'PricingStrategy', 'Transaction_Hour', 'Transaction_Day', 'Transaction_Month',
+    'Transaction_Year', 'Total_Transaction_Amount', 'Average_Transaction_Amount', 'Transaction_Count',
+    'Recency', 'Frequency', 'Monetary', 'RFMS_Score', 'RFMS_Binned'
+]
+
+# Columns min-max scaled before the RFMS components are derived
+SERVING_SCALED_COLUMNS = [
+    'Amount', 'Value', 'PricingStrategy', 'Total_Transaction_Amount', 'Average_Transaction_Amount', 'Transaction_Count'
+]
+
+def fit_serving_preprocessor(df, n_bins=5):
+    """
+    Fit the serving-time preprocessing parameters on the training transactions.
+
+    Runs the same steps as app/data_preprocess.py::preprocess_transactions, but keeps the
+    PricingStrategy vocabulary, the min/max of every scaled column and the RFMS bin edges
+    so the app only has to apply them.
+    """
+    aggregate_features = create_aggregate_features(df)
+    time_df = extract_transaction_time_features(df.copy())
+    final_df = merge_aggregate_and_time_features(time_df, aggregate_features)
+
+    # Label encoding vocabulary (sorted, as LabelEncoder does)
+    classes = np.unique(final_df['PricingStrategy'].astype(str))
+    final_df['PricingStrategy'] = np.searchsorted(classes, final_df['PricingStrategy'].astype(str))
+
+    min_max = {}
+    for col in SERVING_SCALED_COLUMNS:
+        col_min, col_max = float(final_df[col].min()), float(final_df[col].max())
+        min_max[col] = [col_min, col_max]
+        scale = (col_max - col_min) or 1.0
+        final_df[col] = (final_df[col] - col_min) / scale
+
+    rfms = pd.DataFrame({
+        'Recency': final_df.groupby('CustomerId')['Transaction_Year'].transform('max'),
+        'Frequency': final_df['Transaction_Count'],
+        'Monetary': final_df['Total_Transaction_Amount'],
+    })
+    for col in rfms.columns:
+        col_min, col_max = float(rfms[col].min()), float(rfms[col].max())
+        min_max[col] = [col_min, col_max]
+        rfms[col] = (rfms[col] - col_min) / (col_max - col_min)
+    rfms_score = rfms.mean(axis=1, skipna=False).fillna(0)
+
+    # Inner edges of uniform bins, as used by KBinsDiscretizer(strategy='uniform')
+    score_min, score_max = float(rfms_score.min()), float(rfms_score.max())
+    rfms_bin_edges = [] if score_min == score_max else np.linspace(score_min, score_max, n_bins + 1)[1:-1].tolist()
+
+    return {
+        'feature_columns': SERVING_FEATURE_COLUMNS,
+        'scaled_columns': SERVING_SCALED_COLUMNS,
+        'pricing_strategy_classes': classes.tolist(),
+        'min_max': min_max,
+        'rfms_bin_edges': rfms_bin_edges,
+    }
+
+def save_serving_preprocessor(preprocessor, filepath):
+    """
+    Save the fitted serving preprocessor as JSON (e.g. next to app/xgb_model.pkl).
+    """
+    with open(filepath, 'w') as f:
+        json.dump(preprocessor, f, indent=2)
+    print(f"Preprocessor saved as {filepath}.")
@@ -1,6 +1,163 @@
+import os
+import json
+import shutil
+import hashlib
 import pandas as pd
 
+# Prefixed id columns (e.g. 'CustomerId_4406') stored as int32 in streaming mode
+ID_COLUMNS = ['TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId', 'ProductId']
+
+# Low-cardinality columns stored as categoricals in streaming mode
+CATEGORICAL_COLUMNS = ['CurrencyCode', 'ProviderId', 'ChannelId', 'ProductCategory']
+
+# Compact dtypes for the remaining Xente transaction columns
+COMPACT_DTYPES = {
+    'CountryCode': 'int16',
+    'Amount': 'float32',
+    'Value': 'float32',
+    'PricingStrategy': 'int8',
+    'FraudResult': 'int8',
+}
+
+# Position of each row in the source CSV, kept in the Parquet cache to restore the CSV order
+ROW_ORDER_COLUMN = 'SourceRow'
+
+# Layout of the Parquet cache; caches written with another version are rebuilt
+CACHE_VERSION = 2
+
 def load_data(filepath):
     """Load dataset from a CSV file."""
     df = pd.read_csv(filepath)
     return df
+
+def compact_dtypes(chunk):
+    """
+    Convert a chunk of Xente transactions to compact dtypes: int32 ids (the numeric
+    suffix of values such as 'CustomerId_4406'), categoricals for the low-cardinality
+    columns and float32 amounts. Columns that are not present are skipped.
+    """
+    for col in ID_COLUMNS:
+        if col in chunk.columns and not pd.api.types.is_integer_dtype(chunk[col]):
+            chunk[col] = chunk[col].astype(str).str.removeprefix(f'{col}_').astype('int32')
+        elif col in chunk.columns:
+            chunk[col] = chunk[col].astype('int32')
+    for col in CATEGORICAL_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = chunk[col].astype('category')
+    for col, dtype in COMPACT_DTYPES.items():
+        if col in chunk.columns:
+            chunk[col] = chunk[col].astype(dtype)
+    return chunk
+
+def load_data_in_chunks(filepath, chunksize=1_000_000, usecols=None):
+    """
+    Stream a transactions CSV in chunks of `chunksize` rows with compact dtypes,
+    so memory is bounded by the chunk size rather than the file size.
+
+    Categorical columns are typed per chunk; combine chunks with
+    pandas.api.types.union_categoricals if they need a shared vocabulary.
+    """
+    reader = pd.read_csv(
+        filepath,
+        chunksize=chunksize,
+        usecols=usecols,
+        dtype={col: str for col in ID_COLUMNS + CATEGORICAL_COLUMNS},
+    )
+    for chunk in reader:
+        yield compact_dtypes(chunk)
+
+def hash_file(filepath, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _source_is_cached(filepath, manifest_path, compact):
+    """Check a cache manifest against the source CSV, hashing only if its size or mtime changed."""
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get('compact') != compact or manifest.get('version') != CACHE_VERSION:
+        return False
+
+    stat = os.stat(filepath)
+    if manifest.get('size') == stat.st_size and manifest.get('mtime') == stat.st_mtime:
+        return True
+    if manifest.get('sha256') != hash_file(filepath):
+        return False
+
+    # Same content with a new mtime (e.g. copied); refresh the manifest so we don't rehash
+    manifest.update(size=stat.st_size, mtime=stat.st_mtime)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return True
+
+def build_parquet_cache(filepath, cache_dir, chunksize=1_000_000, compact=True):
+    """
+    Write the typed, parsed transactions to a Parquet dataset partitioned by
+    TransactionMonth (e.g. '2018-11'), one chunk at a time.
+
+    With compact=False the columns keep the dtypes load_data gives them, so the cached
+    frame can replace load_data in the existing pipeline.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.makedirs(cache_dir)
+
+    if compact:
+        chunks = load_data_in_chunks(filepath, chunksize=chunksize)
+    else:
+        chunks = pd.read_csv(filepath, chunksize=chunksize)
+
+    start = 0
+    for chunk in chunks:
+        chunk[ROW_ORDER_COLUMN] = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        chunk['TransactionStartTime'] = pd.to_datetime(chunk['TransactionStartTime'], format='ISO8601', utc=True)
+        chunk['TransactionMonth'] = chunk['TransactionStartTime'].dt.strftime('%Y-%m')
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        pq.write_to_dataset(table, cache_dir, partition_cols=['TransactionMonth'])
+
+    stat = os.stat(filepath)
+    manifest = {
+        'source': os.path.abspath(filepath),
+        'sha256': hash_file(filepath),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'compact': compact,
+        'version': CACHE_VERSION,
+    }
+    with open(os.path.join(cache_dir, '_manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def load_data_cached(filepath, cache_dir=None, columns=None, months=None, compact=True):
+    """
+    Load the transactions from a Parquet cache of the CSV, building it first if it is
+    missing, the CSV content changed or it was built with a different `compact` setting.
+
+    Only `columns` are read if given, and only the `months` partitions ('YYYY-MM') if given.
+    Rows come back in CSV order; TransactionStartTime is already parsed (UTC). The
+    TransactionMonth partition column is only returned when it is asked for in `columns`.
+    """
+    if cache_dir is None:
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(filepath)), '.cache', stem)
+
+    if not _source_is_cached(filepath, os.path.join(cache_dir, '_manifest.json'), compact):
+        build_parquet_cache(filepath, cache_dir, compact=compact)
+
+    filters = [('TransactionMonth', 'in', list(months))] if months is not None else None
+    read_columns = None if columns is None else list(dict.fromkeys([*columns, ROW_ORDER_COLUMN]))
+    df = pd.read_parquet(cache_dir, columns=read_columns, filters=filters)
+    # Partitions come back in file order; restore the order of the rows in the CSV
+    df = df.sort_values(ROW_ORDER_COLUMN, kind='stable', ignore_index=True)
+    if columns is None:
+        return df.drop(columns=['TransactionMonth', ROW_ORDER_COLUMN])
+    return df[columns]
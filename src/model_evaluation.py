@@ -1,17 +1,177 @@
 # src/model_evaluation.py
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, confusion_matrix
+import numpy as np
+import pandas as pd
 
-def evaluate_model(y_true, y_preds, model_name):
-    accuracy = accuracy_score(y_true, y_preds)
-    precision = precision_score(y_true, y_preds)
-    recall = recall_score(y_true, y_preds)
-    f1 = f1_score(y_true, y_preds)
-    roc_auc = roc_auc_score(y_true, y_preds)
+# Default grid of decision thresholds for the confusion matrices
+THRESHOLDS = np.round(np.linspace(0, 1, 101), 2)
+
+# Metrics estimated by bootstrap_metrics
+BOOTSTRAP_METRICS = ['auc', 'gini', 'ks', 'pr_auc', 'brier']
+
+
+def _divide(numerator, denominator):
+    """Elementwise ratio that is 0 where the denominator is 0 (scikit-learn's zero_division default)."""
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype='float64'), np.asarray(denominator, dtype='float64'))
+    return np.divide(numerator, denominator, out=np.zeros(numerator.shape), where=denominator != 0)
+
+def _ranking_metrics(y, scores, ks_threshold=False):
+    """
+    AUC, KS and PR-AUC (average precision) for each row of `y`/`scores`, 2-D arrays whose rows
+    are sorted by descending score, from cumulative counts over the groups of tied scores.
+    Rows with a single class get NaN. With ks_threshold (single row), also the score at which
+    the KS separation is reached.
+    """
+    n_rows = y.shape[0]
+    starts = np.ones(y.shape, dtype=bool)
+    starts[:, 1:] = scores[:, 1:] != scores[:, :-1]
+    groups_per_row = starts.sum(axis=1)
+    group = np.cumsum(starts.ravel()) - 1
+    n_groups = group[-1] + 1
+    group_row = np.repeat(np.arange(n_rows), groups_per_row)
+
+    # Positives and negatives in each group of tied scores, and cumulated within each row
+    pos = np.bincount(group, weights=y.ravel(), minlength=n_groups)
+    neg = np.bincount(group, minlength=n_groups) - pos
+    row_first = np.concatenate([[0], np.cumsum(groups_per_row)[:-1]])
+    tp = np.cumsum(pos)
+    fp = np.cumsum(neg)
+    tp -= np.repeat(tp[row_first] - pos[row_first], groups_per_row)
+    fp -= np.repeat(fp[row_first] - neg[row_first], groups_per_row)
+    n_pos = tp[row_first + groups_per_row - 1]
+    n_neg = fp[row_first + groups_per_row - 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Negatives count the positives ranked above them, and half of those tied with them
+        auc = np.bincount(group_row, weights=neg * (tp - pos / 2), minlength=n_rows) / (n_pos * n_neg)
+        separation = tp / n_pos[group_row] - fp / n_neg[group_row]
+        ks = np.maximum.reduceat(separation, row_first)
+        pr_auc = np.bincount(group_row, weights=pos * tp / (tp + fp), minlength=n_rows) / n_pos
+    single_class = (n_pos == 0) | (n_neg == 0)
+    for values in (auc, ks, pr_auc):
+        values[single_class] = np.nan
+
+    metrics = {'auc': auc, 'gini': 2 * auc - 1, 'ks': ks, 'pr_auc': pr_auc}
+    if ks_threshold:
+        metrics['ks_threshold'] = np.nan if single_class[0] else scores[0][starts[0]][np.argmax(separation)]
+    return metrics
+
+def _confusion_counts(y_sorted, scores_sorted, thresholds):
+    """TP/FP/TN/FN of the rule score >= threshold for each threshold, from one sorted array."""
+    n_pos = y_sorted.sum()
+    # Number of scores >= each threshold (scores are in descending order)
+    n_predicted = np.searchsorted(-scores_sorted, -np.asarray(thresholds, dtype='float64'), side='right')
+    tp = np.concatenate([[0], np.cumsum(y_sorted)])[n_predicted]
+    fp = n_predicted - tp
+    return tp, fp, len(y_sorted) - n_pos - fp, n_pos - tp
+
+def evaluate_scores(y_true, y_score, thresholds=THRESHOLDS, threshold=0.5):
+    """
+    Evaluate predicted probabilities of the positive class with one sort of the scores.
+
+    AUC, Gini, KS and PR-AUC (average precision) come from cumulative counts over the sorted
+    scores, and the confusion matrix at each of `thresholds` (positive when score >= threshold)
+    from the same cumulative sums.
+
+    Returns:
+        dict: Scalar metrics (n, positives, auc, gini, ks, ks_threshold, pr_auc, brier), the
+        accuracy, precision, recall, f1 and confusion_matrix ([[TN, FP], [FN, TP]]) at
+        `threshold`, and 'thresholds', a DataFrame with the confusion counts and metrics at
+        every threshold of the grid.
+    """
+    y_true = np.asarray(y_true, dtype='float64').ravel()
+    y_score = np.asarray(y_score, dtype='float64').ravel()
+    order = np.argsort(-y_score, kind='stable')
+    y_sorted, scores_sorted = y_true[order], y_score[order]
+
+    ranking = _ranking_metrics(y_sorted[None, :], scores_sorted[None, :], ks_threshold=True)
+    result = {
+        'n': len(y_true),
+        'positives': int(y_true.sum()),
+        'auc': float(ranking['auc'][0]),
+        'gini': float(ranking['gini'][0]),
+        'ks': float(ranking['ks'][0]),
+        'ks_threshold': float(ranking['ks_threshold']),
+        'pr_auc': float(ranking['pr_auc'][0]),
+        'brier': float(np.mean((y_score - y_true) ** 2)),
+    }
+
+    grid = np.append(np.asarray(thresholds, dtype='float64'), threshold)
+    tp, fp, tn, fn = _confusion_counts(y_sorted, scores_sorted, grid)
+    precision = _divide(tp, tp + fp)
+    recall = _divide(tp, tp + fn)
+    table = pd.DataFrame({
+        'threshold': grid, 'tp': tp, 'fp': fp, 'tn': tn, 'fn': fn,
+        'precision': precision,
+        'recall': recall,
+        'f1': _divide(2 * precision * recall, precision + recall),
+        'accuracy': (tp + tn) / len(y_true),
+    })
+
+    at_threshold = table.iloc[-1]
+    result.update({
+        'threshold': threshold,
+        'accuracy': float(at_threshold['accuracy']),
+        'precision': float(at_threshold['precision']),
+        'recall': float(at_threshold['recall']),
+        'f1': float(at_threshold['f1']),
+        'confusion_matrix': np.array([[at_threshold['tn'], at_threshold['fp']],
+                                      [at_threshold['fn'], at_threshold['tp']]], dtype='int64'),
+        'thresholds': table.iloc[:-1].reset_index(drop=True),
+    })
+    return result
+
+def bootstrap_metrics(y_true, y_score, n_resamples=1000, confidence=0.95, seed=42, block_size=2 ** 21):
+    """
+    Bootstrap confidence intervals of AUC, Gini, KS, PR-AUC and Brier score.
+
+    The scores are sorted once; each resample draws row positions in that order and sorts
+    the positions, so it is already ranked and all resamples of a block (about `block_size`
+    values) are evaluated together by the cumulative-count pass of evaluate_scores.
+
+    Returns:
+        pandas.DataFrame: One row per metric with the full-sample estimate and the lower and
+        upper bounds of the percentile interval.
+    """
+    y_true = np.asarray(y_true, dtype='float64').ravel()
+    y_score = np.asarray(y_score, dtype='float64').ravel()
+    n = len(y_true)
+    order = np.argsort(-y_score, kind='stable')
+    y_sorted, scores_sorted = y_true[order], y_score[order]
+
+    rng = np.random.default_rng(seed)
+    rows_per_block = max(1, block_size // n)
+    samples = {metric: [] for metric in BOOTSTRAP_METRICS}
+    for start in range(0, n_resamples, rows_per_block):
+        positions = np.sort(rng.integers(0, n, (min(rows_per_block, n_resamples - start), n)), axis=1)
+        y, scores = y_sorted[positions], scores_sorted[positions]
+        ranking = _ranking_metrics(y, scores)
+        ranking['brier'] = np.mean((scores - y) ** 2, axis=1)
+        for metric in BOOTSTRAP_METRICS:
+            samples[metric].append(ranking[metric])
+
+    estimate = evaluate_scores(y_true, y_score, thresholds=[])
+    alpha = (1 - confidence) / 2
+    rows = []
+    for metric in BOOTSTRAP_METRICS:
+        values = np.concatenate(samples[metric])
+        rows.append({
+            'metric': metric,
+            'estimate': estimate[metric],
+            'lower': np.nanquantile(values, alpha),
+            'upper': np.nanquantile(values, 1 - alpha),
+        })
+    return pd.DataFrame(rows)
+
+def evaluate_model(y_true, y_score, model_name):
+    """Evaluate predicted probabilities with evaluate_scores, print a summary and return the result."""
+    result = evaluate_scores(y_true, y_score)
 
     print(f"{model_name} Performance:")
-    print(f"Accuracy: {accuracy:.4f}")
-    print(f"Precision: {precision:.4f}")
-    print(f"Recall: {recall:.4f}")
-    print(f"F1 Score: {f1:.4f}")
-    print(f"ROC-AUC: {roc_auc:.4f}")
-    print(f"Confusion Matrix:\n{confusion_matrix(y_true, y_preds)}\n")
+    print(f"Accuracy: {result['accuracy']:.4f}")
+    print(f"Precision: {result['precision']:.4f}")
+    print(f"Recall: {result['recall']:.4f}")
+    print(f"F1 Score: {result['f1']:.4f}")
+    print(f"ROC-AUC: {result['auc']:.4f}")
+    print(f"Gini: {result['gini']:.4f}  KS: {result['ks']:.4f}  PR-AUC: {result['pr_auc']:.4f}  Brier: {result['brier']:.4f}")
+    print(f"Confusion Matrix:\n{result['confusion_matrix']}\n")
+    return result
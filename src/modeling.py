@@ -1,85 +1,499 @@
 import os
 import sys
-from sklearn.linear_model import LogisticRegression
+import json
+import time
+import shutil
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier
 from sklearn.tree import DecisionTreeClassifier
 import xgboost as xgb
 sys.path.append(os.path.abspath('../src'))
-from model_evaluation import evaluate_model
+from model_evaluation import evaluate_model, evaluate_scores
+from encoding import to_csr
 import joblib
 
+try:
+    import resource
+except ImportError:  # Not available on Windows, where peak_memory_mb asks the Win32 API instead
+    resource = None
+
+# Directory the trained models are saved to, and the file of each model in it
+MODEL_DIR = '../notebooks/model'
+MODEL_FILES = {
+    'Logistic Regression': 'logistic_regression_model.pkl',
+    'Random Forest': 'random_forest_model.pkl',
+    'XGBoost': 'xgboost_model.pkl',
+    'AdaBoost': 'adaboost_model.pkl',
+    'Decision Tree': 'decision_tree_model.pkl',
+}
+
+# Training history of the saved models (see record_lineage)
+LINEAGE_FILE = 'lineage.json'
+
+# Unfitted models with the training settings, also used by cross_validation and tuning
+def make_logistic_regression(n_jobs=None):
+    return LogisticRegression(max_iter=1000)
+
+def make_random_forest(n_jobs=None):
+    return RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+
+def make_xgboost(n_jobs=None):
+    return xgb.XGBClassifier(eval_metric='logloss', random_state=42, n_jobs=n_jobs)
+
+def make_adaboost(n_jobs=None):
+    return AdaBoostClassifier()
+
+def make_decision_tree(n_jobs=None):
+    return DecisionTreeClassifier()
+
+ESTIMATORS = {
+    'Logistic Regression': make_logistic_regression,
+    'Random Forest': make_random_forest,
+    'XGBoost': make_xgboost,
+    'AdaBoost': make_adaboost,
+    'Decision Tree': make_decision_tree,
+}
+
 # Function to save the model to a .pkl file
 def save_model(model, filename):
     joblib.dump(model, filename)
     print(f"Model saved as {filename}.")
 
 # Function to train and evaluate Logistic Regression
-def train_and_evaluate_logistic_regression(X_train, X_test, y_train, y_test):
-    log_reg = LogisticRegression(max_iter=1000)
+def train_and_evaluate_logistic_regression(X_train, X_test, y_train, y_test, model_dir=MODEL_DIR):
+    log_reg = make_logistic_regression()
     log_reg.fit(X_train, y_train)
 
-    log_reg_preds_train = log_reg.predict(X_train)
-    log_reg_preds_test = log_reg.predict(X_test)
+    log_reg_preds_train = log_reg.predict_proba(X_train)[:, 1]
+    log_reg_preds_test = log_reg.predict_proba(X_test)[:, 1]
 
 
     evaluate_model(y_train, log_reg_preds_train, "Logistic Regression (Train)")
     evaluate_model(y_test, log_reg_preds_test, "Logistic Regression (Test)")
 
     # Save the model
-    save_model(log_reg, '../notebooks/model/logistic_regression_model.pkl')
+    save_model(log_reg, os.path.join(model_dir, MODEL_FILES['Logistic Regression']))
+
+    return log_reg
 
 # Function to train and evaluate Random Forest
-def train_and_evaluate_random_forest(X_train, X_test, y_train, y_test):
-    rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
+def train_and_evaluate_random_forest(X_train, X_test, y_train, y_test, n_jobs=None, model_dir=MODEL_DIR):
+    rf_model = make_random_forest(n_jobs)
     rf_model.fit(X_train, y_train)
 
-    rf_preds_train = rf_model.predict(X_train)
-    rf_preds_test = rf_model.predict(X_test)
+    rf_preds_train = rf_model.predict_proba(X_train)[:, 1]
+    rf_preds_test = rf_model.predict_proba(X_test)[:, 1]
 
     evaluate_model(y_train, rf_preds_train, "Random Forest (Train)")
     evaluate_model(y_test, rf_preds_test, "Random Forest (Test)")
 
      # Save the model
-    save_model(rf_model, '../notebooks/model/random_forest_model.pkl')
+    save_model(rf_model, os.path.join(model_dir, MODEL_FILES['Random Forest']))
+
+    return rf_model
 
 # Function to train and evaluate XGBoost
-def train_and_evaluate_xgboost(X_train, X_test, y_train, y_test):
-    xgb_model = xgb.XGBClassifier(eval_metric='mlogloss', random_state=42)
+def train_and_evaluate_xgboost(X_train, X_test, y_train, y_test, n_jobs=None, model_dir=MODEL_DIR):
+    xgb_model = make_xgboost(n_jobs)
     xgb_model.fit(X_train, y_train)
 
-    xgb_train_pred = xgb_model.predict(X_train)
-    xgb_test_pred = xgb_model.predict(X_test)
+    xgb_train_pred = xgb_model.predict_proba(X_train)[:, 1]
+    xgb_test_pred = xgb_model.predict_proba(X_test)[:, 1]
 
     evaluate_model(y_train, xgb_train_pred, "XGBoost (Train)")
     evaluate_model(y_test, xgb_test_pred, "XGBoost (Test)")
 
     # Save the model
-    save_model(xgb_model, '../notebooks/model/xgboost_model.pkl')
+    save_model(xgb_model, os.path.join(model_dir, MODEL_FILES['XGBoost']))
+
+    return xgb_model
+
+# Function to write feature-engineered training data as Parquet chunk files
+def save_training_chunks(X, y, chunk_dir, chunk_rows=100_000, target_col='Risk_Label'):
+    """
+    Write features and target to numbered Parquet files of chunk_rows rows each, the input of
+    train_xgboost_external_memory. Returns the file paths in order.
+    """
+    os.makedirs(chunk_dir, exist_ok=True)
+    paths = []
+    for i, start in enumerate(range(0, len(X), chunk_rows)):
+        chunk = X.iloc[start:start + chunk_rows].copy()
+        chunk[target_col] = np.asarray(y)[start:start + chunk_rows]
+        path = os.path.join(chunk_dir, f'part-{i:05d}.parquet')
+        chunk.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+class ParquetChunkIterator(xgb.DataIter):
+    """
+    Feeds Parquet chunk files (features plus target column) to XGBoost one file at a time,
+    so only one chunk is held in memory while XGBoost builds its disk-cached pages.
+    """
+
+    def __init__(self, paths, target_col='Risk_Label', cache_prefix=None):
+        self.paths = list(paths)
+        self.target_col = target_col
+        self._index = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._index == len(self.paths):
+            return False
+        chunk = pd.read_parquet(self.paths[self._index])
+        input_data(data=chunk.drop(columns=self.target_col), label=chunk[self.target_col].to_numpy())
+        self._index += 1
+        return True
+
+    def reset(self):
+        self._index = 0
+
+# Function to train and evaluate XGBoost out of core, streaming the training data from disk
+def train_xgboost_external_memory(train_paths, test_paths=None, target_col='Risk_Label', n_jobs=None,
+                                  model_dir=MODEL_DIR, filename=MODEL_FILES['XGBoost'], n_estimators=100):
+    """
+    Train XGBoost on Parquet chunk files (see save_training_chunks) with external memory: the
+    chunks are streamed through a DataIter into an ExtMemQuantileDMatrix whose quantized pages
+    are cached on disk, so memory scales with the chunk size rather than the dataset size.
+    XGBoost releases without ExtMemQuantileDMatrix (< 3.0) use an external-memory DMatrix.
+
+    The booster is returned as an XGBClassifier with the same defaults as
+    train_and_evaluate_xgboost and pickled like app/xgb_model.pkl, so the app's load_model
+    can serve it. Test chunks, if given, are scored one at a time.
+    """
+    cache_dir = tempfile.mkdtemp(prefix='xgb_cache_')
+    try:
+        iterator = ParquetChunkIterator(train_paths, target_col, cache_prefix=os.path.join(cache_dir, 'train'))
+        ext_mem_matrix = getattr(xgb, 'ExtMemQuantileDMatrix', None)
+        if ext_mem_matrix is not None:
+            dtrain = ext_mem_matrix(iterator, nthread=n_jobs, enable_categorical=True)
+        else:
+            dtrain = xgb.DMatrix(iterator, nthread=n_jobs, enable_categorical=True)
+
+        params = {'objective': 'binary:logistic', 'eval_metric': 'logloss', 'tree_method': 'hist', 'seed': 42}
+        if n_jobs:
+            params['nthread'] = n_jobs
+        booster = xgb.train(params, dtrain, num_boost_round=n_estimators)
+        # Free the matrix (and its cache pages) before the cache directory is removed
+        del dtrain, iterator
+
+        # Round-trip through the JSON model format to get a scikit-learn style classifier
+        model_path = os.path.join(cache_dir, 'model.json')
+        booster.save_model(model_path)
+        xgb_model = xgb.XGBClassifier(n_estimators=n_estimators, random_state=42, n_jobs=n_jobs)
+        xgb_model.load_model(model_path)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    if test_paths:
+        y_test, test_preds = [], []
+        for path in test_paths:
+            chunk = pd.read_parquet(path)
+            y_test.append(chunk[target_col].to_numpy())
+            test_preds.append(xgb_model.predict_proba(chunk.drop(columns=target_col))[:, 1])
+        evaluate_model(np.concatenate(y_test), np.concatenate(test_preds), "XGBoost External Memory (Test)")
+
+    # Pickled (not joblib) so it loads exactly like app/xgb_model.pkl
+    os.makedirs(model_dir, exist_ok=True)
+    model_file = os.path.join(model_dir, filename)
+    with open(model_file, 'wb') as f:
+        pickle.dump(xgb_model, f)
+    print(f"Model saved as {model_file}.")
+
+    return xgb_model
 
 # Function to train and evaluate AdaBoost
-def train_and_evaluate_adaboost(X_train, X_test, y_train, y_test):
-    ada_model = AdaBoostClassifier()
+def train_and_evaluate_adaboost(X_train, X_test, y_train, y_test, model_dir=MODEL_DIR):
+    ada_model = make_adaboost()
     ada_model.fit(X_train, y_train)
 
-    ada_preds_train = ada_model.predict(X_train)
-    ada_preds_test = ada_model.predict(X_test)
+    ada_preds_train = ada_model.predict_proba(X_train)[:, 1]
+    ada_preds_test = ada_model.predict_proba(X_test)[:, 1]
 
     evaluate_model(y_train, ada_preds_train, "AdaBoost (Train)")
     evaluate_model(y_test, ada_preds_test, "AdaBoost (Test)")
 
     # Save the model
-    save_model(ada_model, '../notebooks/model/adaboost_model.pkl')
+    save_model(ada_model, os.path.join(model_dir, MODEL_FILES['AdaBoost']))
+
+    return ada_model
 
 # Function to train and evaluate Decision Tree
-def train_and_evaluate_decision_tree(X_train, X_test, y_train, y_test):
-    dt_model = DecisionTreeClassifier()
+def train_and_evaluate_decision_tree(X_train, X_test, y_train, y_test, model_dir=MODEL_DIR):
+    dt_model = make_decision_tree()
     dt_model.fit(X_train, y_train)
 
-    dt_preds_train = dt_model.predict(X_train)
-    dt_preds_test = dt_model.predict(X_test)
+    dt_preds_train = dt_model.predict_proba(X_train)[:, 1]
+    dt_preds_test = dt_model.predict_proba(X_test)[:, 1]
 
     evaluate_model(y_train, dt_preds_train, "Decision Tree (Train)")
     evaluate_model(y_test, dt_preds_test, "Decision Tree (Test)")
 
     # Save the model
-    save_model(dt_model, '../notebooks/model/decision_tree_model.pkl')
+    save_model(dt_model, os.path.join(model_dir, MODEL_FILES['Decision Tree']))
+
+    return dt_model
+
+# Trainers run by train_models_in_parallel, and the ones that can use several cores
+TRAINERS = {
+    'Logistic Regression': train_and_evaluate_logistic_regression,
+    'Random Forest': train_and_evaluate_random_forest,
+    'XGBoost': train_and_evaluate_xgboost,
+    'AdaBoost': train_and_evaluate_adaboost,
+    'Decision Tree': train_and_evaluate_decision_tree,
+}
+MULTITHREADED_TRAINERS = ['Random Forest', 'XGBoost']
+
+# Trainers given sparse CSR features as they are; the others get them densified
+SPARSE_TRAINERS = ['Logistic Regression', 'XGBoost']
+
+def allocate_cores(model_names, n_cores=None):
+    """
+    Split the available cores across concurrently trained models: one core for each
+    single-threaded model and the rest shared evenly by the multithreaded ones.
+    """
+    n_cores = n_cores or os.cpu_count() or 1
+    threaded = [name for name in model_names if name in MULTITHREADED_TRAINERS]
+    spare = max(n_cores - (len(model_names) - len(threaded)), len(threaded))
+    allocation = {name: 1 for name in model_names}
+    for i, name in enumerate(threaded):
+        allocation[name] = max(1, spare // len(threaded) + (1 if i < spare % len(threaded) else 0))
+    return allocation
+
+def model_input(X, name):
+    """
+    Features in the form train_models_in_parallel gives them to the named model: as they are
+    if there are no categorical columns, else one-hot encoded by to_csr (a CSR matrix for the
+    SPARSE_TRAINERS, a dense DataFrame for the others).
+    """
+    if not any(isinstance(dtype, pd.CategoricalDtype) for dtype in X.dtypes):
+        return X
+    matrix, feature_names = to_csr(X)
+    return matrix if name in SPARSE_TRAINERS else pd.DataFrame(matrix.toarray(), columns=feature_names)
+
+def peak_memory_mb():
+    """Peak resident memory of the current process in MB (its peak working set on Windows)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+            (field, ctypes.c_size_t) for field in [
+                'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage',
+            ]
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    ctypes.windll.psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+    return counters.PeakWorkingSetSize / 2 ** 20
+
+def _run_trainer(name, data_paths, feature_names, n_jobs, model_dir):
+    """Worker: memory-map the shared matrices, train one model and report its cost."""
+    X_train, X_test, y_train, y_test = (joblib.load(path, mmap_mode='r') for path in data_paths)
+    if not sparse.issparse(X_train):
+        X_train = pd.DataFrame(X_train, columns=feature_names, copy=False)
+        X_test = pd.DataFrame(X_test, columns=feature_names, copy=False)
+    elif name not in SPARSE_TRAINERS:
+        X_train = pd.DataFrame(X_train.toarray(), columns=feature_names, copy=False)
+        X_test = pd.DataFrame(X_test.toarray(), columns=feature_names, copy=False)
+
+    kwargs = {'model_dir': model_dir}
+    if name in MULTITHREADED_TRAINERS:
+        kwargs['n_jobs'] = n_jobs
+
+    start = time.perf_counter()
+    model = TRAINERS[name](X_train, X_test, y_train, y_test, **kwargs)
+    wall_seconds = time.perf_counter() - start
+
+    test_preds = model.predict(X_test)
+    evaluation = evaluate_scores(y_test, model.predict_proba(X_test)[:, 1], thresholds=[])
+    return {
+        'Model': name,
+        'Cores': n_jobs,
+        'Test Accuracy': float(np.mean(test_preds == y_test)),
+        'Test AUC': evaluation['auc'],
+        'Test KS': evaluation['ks'],
+        'Wall Time (s)': wall_seconds,
+        # Peak of the worker process, which only trains this model
+        'Peak Memory (MB)': peak_memory_mb(),
+    }
+
+def train_models_in_parallel(X_train, X_test, y_train, y_test, model_names=None, n_cores=None, model_dir=MODEL_DIR):
+    """
+    Train the models concurrently, each in a worker process of its own.
+
+    The train/test matrices are dumped once and memory-mapped read-only by every worker
+    instead of being pickled to each of them. Cores are balanced with allocate_cores.
+
+    If the features have categorical columns (see feature_engineering.encode_features) they
+    are shared as one CSR matrix with the categoricals one-hot encoded (encoding.to_csr);
+    Logistic Regression and XGBoost train on it directly, the other models on a dense copy.
+
+    Returns:
+        pandas.DataFrame: Leaderboard sorted by test accuracy, with test AUC and KS, wall time and peak memory per model.
+    """
+    model_names = model_names or list(TRAINERS)
+    allocation = allocate_cores(model_names, n_cores)
+    feature_names = list(X_train.columns)
+    if any(isinstance(dtype, pd.CategoricalDtype) for dtype in X_train.dtypes):
+        (X_train, feature_names), (X_test, _) = to_csr(X_train), to_csr(X_test)
+
+    shared_dir = tempfile.mkdtemp(prefix='modeling_')
+    try:
+        data_paths = []
+        for name, data in [('X_train', X_train), ('X_test', X_test), ('y_train', y_train), ('y_test', y_test)]:
+            path = os.path.join(shared_dir, f'{name}.joblib')
+            if sparse.issparse(data):
+                joblib.dump(data, path)
+            else:
+                array = np.asarray(data, dtype='float64') if name.startswith('X') else np.asarray(data)
+                joblib.dump(np.ascontiguousarray(array), path)
+            data_paths.append(path)
+
+        # A single-worker pool per model, so each peak memory is measured for that model alone
+        executors = [ProcessPoolExecutor(max_workers=1) for _ in model_names]
+        try:
+            futures = [
+                executor.submit(_run_trainer, name, data_paths, feature_names, allocation[name], model_dir)
+                for executor, name in zip(executors, model_names)
+            ]
+            results = [future.result() for future in futures]
+        finally:
+            for executor in executors:
+                executor.shutdown()
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    leaderboard = pd.DataFrame(results).sort_values('Test Accuracy', ascending=False).reset_index(drop=True)
+    print(leaderboard.to_string(index=False))
+    return leaderboard
+
+
+# Function to append a training run to the model lineage
+def record_lineage(model_dir, name, mode, n_rows, data_start, data_end, feature_names, extra=None):
+    """
+    Append a training run of a saved model to model_dir/lineage.json.
+
+    Each entry has a version (the previous one + 1), its parent version, the mode ('full' or
+    'incremental'), the number of rows and the TransactionStartTime range trained on, and the
+    feature columns. data_end is the checkpoint that the next refresh trains after.
+    """
+    lineage = load_lineage(model_dir)
+    history = lineage.setdefault(name, [])
+    entry = {
+        'version': len(history) + 1,
+        'parent_version': history[-1]['version'] if history else None,
+        'mode': mode,
+        'file': MODEL_FILES[name],
+        'trained_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        'n_rows': int(n_rows),
+        'data_start': pd.Timestamp(data_start).isoformat(),
+        'data_end': pd.Timestamp(data_end).isoformat(),
+        'feature_names': list(feature_names),
+    }
+    entry.update(extra or {})
+    history.append(entry)
+
+    with open(os.path.join(model_dir, LINEAGE_FILE), 'w') as f:
+        json.dump(lineage, f, indent=2)
+    return entry
+
+def load_lineage(model_dir=MODEL_DIR):
+    """Model lineage by model name (see record_lineage); empty if nothing was recorded yet."""
+    path = os.path.join(model_dir, LINEAGE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+# Learning rate of the SGD logistic regression refreshes: small constant steps from the saved coefficients
+SGD_REFRESH_PARAMS = {'loss': 'log_loss', 'learning_rate': 'constant', 'eta0': 0.01, 'random_state': 42}
+
+# Function to refresh Logistic Regression with one SGD pass over the new data
+def refresh_logistic_regression(model, X_new, y_new):
+    if isinstance(model, SGDClassifier):
+        model.partial_fit(X_new, y_new)
+        return model
+    # First refresh of the full-batch model: continue from its coefficients with SGD
+    sgd_model = SGDClassifier(max_iter=1, tol=None, **SGD_REFRESH_PARAMS)
+    sgd_model.fit(X_new, y_new, coef_init=model.coef_, intercept_init=model.intercept_)
+    return sgd_model
+
+# Function to refresh Random Forest by adding trees grown on the new data
+def refresh_random_forest(model, X_new, y_new, n_new_trees=20):
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + n_new_trees)
+    model.fit(X_new, y_new)
+    return model
+
+# Function to refresh XGBoost by continuing boosting from the saved booster
+def refresh_xgboost(model, X_new, y_new, n_new_rounds=20):
+    # No validation set here, so early stopping (e.g. left on by a tuned model) is turned off
+    refreshed = xgb.XGBClassifier(**{**model.get_params(), 'n_estimators': n_new_rounds, 'early_stopping_rounds': None})
+    refreshed.fit(X_new, y_new, xgb_model=model.get_booster())
+    return refreshed
+
+# Models that can be refreshed incrementally; AdaBoost and Decision Tree need full retraining
+REFRESHERS = {
+    'Logistic Regression': refresh_logistic_regression,
+    'Random Forest': refresh_random_forest,
+    'XGBoost': refresh_xgboost,
+}
+
+def refresh_models(final_df, model_names=None, model_dir=MODEL_DIR, target_col='Risk_Label', time_col='TransactionStartTime'):
+    """
+    Warm-start the saved models on the transactions newer than their last checkpoint instead
+    of retraining on the full history.
+
+    For each model, the rows of final_df with time_col after the data_end of its latest lineage
+    entry are selected (with the feature columns it was trained on), the model is updated
+    with its REFRESHERS function, saved over the previous file and a new 'incremental'
+    lineage entry is recorded. Models without new rows, or whose new rows have a single
+    class, are left as they are.
+
+    Returns:
+        pandas.DataFrame: One row per refreshed model with its new version, rows used and wall time.
+    """
+    model_names = model_names or list(REFRESHERS)
+    lineage = load_lineage(model_dir)
+    results = []
+    for name in model_names:
+        if not lineage.get(name):
+            print(f"{name}: no checkpoint in {model_dir}; train it fully first.")
+            continue
+        checkpoint = lineage[name][-1]
+        new_rows = final_df[final_df[time_col] > pd.Timestamp(checkpoint['data_end'])]
+        if new_rows[target_col].nunique() < 2:
+            print(f"{name}: {len(new_rows)} new rows since {checkpoint['data_end']}; not enough to refresh.")
+            continue
+
+        model_path = os.path.join(model_dir, MODEL_FILES[name])
+        model = joblib.load(model_path)
+        X_new = model_input(new_rows[checkpoint['feature_names']], name)
+
+        start = time.perf_counter()
+        model = REFRESHERS[name](model, X_new, new_rows[target_col])
+        wall_seconds = time.perf_counter() - start
+
+        save_model(model, model_path)
+        entry = record_lineage(model_dir, name, 'incremental', len(new_rows), new_rows[time_col].min(),
+                               new_rows[time_col].max(), checkpoint['feature_names'])
+        results.append({'Model': name, 'Version': entry['version'], 'New Rows': len(new_rows), 'Wall Time (s)': wall_seconds})
+
+    summary = pd.DataFrame(results, columns=['Model', 'Version', 'New Rows', 'Wall Time (s)'])
+    print(summary.to_string(index=False))
+    return summary
@@ -0,0 +1,208 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+class TDigest:
+    """
+    Mergeable quantile sketch (a merging t-digest).
+
+    Values are kept as weighted centroids; after each update the centroids are sorted and
+    merged in groups along the k1 scale function, which keeps small centroids in the tails
+    and so gives accurate extreme quantiles with at most ~`compression` centroids.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.array([])
+        self.weights = np.array([])
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5)
+        groups = np.floor(k).astype(np.int64)
+        groups -= groups[0]
+        group_weights = np.bincount(groups, weights=weights)
+        group_sums = np.bincount(groups, weights=weights * means)
+        keep = group_weights > 0
+        self.means = group_sums[keep] / group_weights[keep]
+        self.weights = group_weights[keep]
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        values = values[np.isfinite(values)]
+        if len(values):
+            self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if len(other.means):
+            self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def quantile(self, q):
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan)
+        cumulative = np.cumsum(self.weights)
+        positions = (cumulative - self.weights / 2) / cumulative[-1]
+        return np.interp(q, positions, self.means)
+
+    def to_dict(self):
+        return {'compression': self.compression, 'means': self.means.tolist(), 'weights': self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        digest = cls(data['compression'])
+        digest.means = np.array(data['means'])
+        digest.weights = np.array(data['weights'])
+        return digest
+
+
+class DataProfile:
+    """
+    Streaming profile of a dataset, built one chunk at a time in a single pass.
+
+    Numeric columns keep count, null count, mean and variance (merged with the parallel
+    Welford update), min/max and a TDigest for approximate quantiles. Other columns keep a
+    null count and bounded heavy-hitter counts (Space-Saving): after each chunk only the
+    `top_k` largest counters are kept, and a value that gets a counter again starts from the
+    largest count evicted so far, `count_error`. A reported count is never too low and at
+    most `count_error` too high; a value without a counter occurred at most `count_error` times.
+    """
+
+    QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+    def __init__(self, compression=200, top_k=50):
+        self.compression = compression
+        self.top_k = top_k
+        self.n_rows = 0
+        self.columns = {}
+
+    def _new_column(self, series):
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            return {'kind': 'numeric', 'count': 0, 'null_count': 0, 'mean': 0.0, 'm2': 0.0,
+                    'min': np.inf, 'max': -np.inf, 'digest': TDigest(self.compression)}
+        return {'kind': 'categorical', 'count': 0, 'null_count': 0, 'top_counts': pd.Series(dtype='int64'), 'count_error': 0}
+
+    def _update_numeric(self, stats, series):
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        values = values[~np.isnan(values)]
+        stats['null_count'] += len(series) - len(values)
+        if not len(values):
+            return
+        n_a, n_b = stats['count'], len(values)
+        mean_b = values.mean()
+        delta = mean_b - stats['mean']
+        stats['count'] = n_a + n_b
+        stats['mean'] += delta * n_b / stats['count']
+        stats['m2'] += ((values - mean_b) ** 2).sum() + delta ** 2 * n_a * n_b / stats['count']
+        stats['min'] = min(stats['min'], values.min())
+        stats['max'] = max(stats['max'], values.max())
+        stats['digest'].update(values)
+
+    def _update_categorical(self, stats, series):
+        counts = series.value_counts(dropna=True).astype('int64')
+        stats['null_count'] += int(series.isna().sum())
+        stats['count'] += int(counts.sum())
+        counts.index = counts.index.astype(str)
+        if not counts.index.is_unique:
+            counts = counts.groupby(level=0).sum()
+        # A value that is not counted any more may already have occurred up to count_error
+        # times, so its new counter starts from there (Space-Saving)
+        top_counts = stats['top_counts']
+        updated = counts + top_counts.reindex(counts.index, fill_value=stats['count_error'])
+        top_counts = updated.combine_first(top_counts).astype('int64')
+        if len(top_counts) > self.top_k:
+            ranked = top_counts.nlargest(self.top_k + 1)
+            stats['count_error'] = max(stats['count_error'], int(ranked.iloc[self.top_k]))
+            top_counts = ranked.iloc[:self.top_k]
+        stats['top_counts'] = top_counts
+
+    def update(self, chunk):
+        """Fold one chunk of rows into the profile."""
+        self.n_rows += len(chunk)
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = self._new_column(chunk[col])
+            stats = self.columns[col]
+            if stats['kind'] == 'numeric':
+                self._update_numeric(stats, chunk[col])
+            else:
+                self._update_categorical(stats, chunk[col])
+        return self
+
+    def to_dict(self):
+        """Summary of the profile as plain Python types (JSON-serialisable)."""
+        columns = {}
+        for col, stats in self.columns.items():
+            summary = {
+                'kind': stats['kind'],
+                'count': int(stats['count']),
+                'null_count': int(stats['null_count']),
+                'null_rate': stats['null_count'] / self.n_rows if self.n_rows else 0.0,
+            }
+            if stats['kind'] == 'numeric':
+                has_values = stats['count'] > 0
+                summary.update({
+                    'mean': float(stats['mean']) if has_values else None,
+                    'std': float(np.sqrt(stats['m2'] / (stats['count'] - 1))) if stats['count'] > 1 else None,
+                    'min': float(stats['min']) if has_values else None,
+                    'max': float(stats['max']) if has_values else None,
+                    'quantiles': {str(q): float(v) for q, v in zip(self.QUANTILES, stats['digest'].quantile(self.QUANTILES))} if has_values else {},
+                })
+            else:
+                summary.update({
+                    'top_counts': {value: int(count) for value, count in
+                                   stats['top_counts'].sort_values(ascending=False, kind='stable').items()},
+                    'count_error': int(stats['count_error']),
+                })
+            columns[col] = summary
+        return {'n_rows': int(self.n_rows), 'columns': columns}
+
+    def to_json(self, filepath):
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def profile_chunks(chunks, compression=200, top_k=50):
+    """Profile an iterable of DataFrame chunks in one pass."""
+    profile = DataProfile(compression=compression, top_k=top_k)
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+def profile_csv(filepath, chunksize=1_000_000, compression=200, top_k=50):
+    """Profile a CSV file that may be larger than memory, reading it in chunks."""
+    return profile_chunks(pd.read_csv(filepath, chunksize=chunksize), compression=compression, top_k=top_k)
+
+def diff_profiles(old, new):
+    """
+    Compare two profile summaries (DataProfile.to_dict() output or its saved JSON).
+
+    Returns:
+        pandas.DataFrame: One row per column and statistic with the old value, the new
+        value and the change, for columns present in either profile.
+    """
+    if isinstance(old, str):
+        with open(old) as f:
+            old = json.load(f)
+    if isinstance(new, str):
+        with open(new) as f:
+            new = json.load(f)
+
+    rows = []
+    for col in sorted(set(old['columns']) | set(new['columns'])):
+        old_col, new_col = old['columns'].get(col, {}), new['columns'].get(col, {})
+        stats = ['null_rate', 'mean', 'std', 'min', 'max']
+        for stat in stats:
+            old_value, new_value = old_col.get(stat), new_col.get(stat)
+            if old_value is None and new_value is None:
+                continue
+            change = new_value - old_value if old_value is not None and new_value is not None else None
+            rows.append({'column': col, 'statistic': stat, 'old': old_value, 'new': new_value, 'change': change})
+        for q in sorted(set(old_col.get('quantiles', {})) | set(new_col.get('quantiles', {})), key=float):
+            old_value, new_value = old_col.get('quantiles', {}).get(q), new_col.get('quantiles', {}).get(q)
+            change = new_value - old_value if old_value is not None and new_value is not None else None
+            rows.append({'column': col, 'statistic': f'q{q}', 'old': old_value, 'new': new_value, 'change': change})
+    return pd.DataFrame(rows, columns=['column', 'statistic', 'old', 'new', 'change'])
@@ -1,8 +1,12 @@
 from sklearn.model_selection import train_test_split
 
+# Identifier, target and leakage columns that are not model features
+NON_FEATURE_COLUMNS = ['TransactionId', 'Risk_Label', 'RFMS_Score', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId',
+                       'CountryCode', 'ProviderId', 'ProductId', 'FraudResult', 'TransactionStartTime']
+
 def split_data(final_df):
     # Define features and target variable
-    X = final_df.drop(['TransactionId', 'Risk_Label', 'RFMS_Score', 'TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId', 'CountryCode', 'ProviderId','ProductId','FraudResult', 'TransactionStartTime'], axis=1)  # Drop non-feature columns
+    X = final_df.drop(NON_FEATURE_COLUMNS, axis=1)  # Drop non-feature columns
     y = final_df['Risk_Label']
 
     # Split the data into training and testing sets
@@ -0,0 +1,296 @@
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import hashlib
+import itertools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.model_selection import train_test_split
+import joblib
+sys.path.append(os.path.abspath('../src'))
+from model_evaluation import evaluate_scores
+from modeling import save_model, MODEL_DIR, MODEL_FILES, ESTIMATORS, MULTITHREADED_TRAINERS, SPARSE_TRAINERS
+from encoding import to_csr
+
+# Candidate values of each model family's hyperparameters
+SEARCH_SPACES = {
+    'Logistic Regression': {
+        'C': [0.001, 0.01, 0.1, 1.0, 10.0, 100.0],
+    },
+    'Random Forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [None, 8, 16, 32],
+        'min_samples_leaf': [1, 2, 5, 10],
+        'max_features': ['sqrt', 0.5, 1.0],
+    },
+    'XGBoost': {
+        'max_depth': [3, 4, 6, 8, 10],
+        'learning_rate': [0.01, 0.03, 0.1, 0.3],
+        'subsample': [0.6, 0.8, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0],
+        'min_child_weight': [1, 5, 10],
+        'reg_lambda': [0.1, 1.0, 10.0],
+    },
+    'AdaBoost': {
+        'n_estimators': [50, 100, 200, 400],
+        'learning_rate': [0.1, 0.5, 1.0],
+    },
+    'Decision Tree': {
+        'max_depth': [None, 4, 8, 16, 32],
+        'min_samples_leaf': [1, 5, 20, 50],
+        'criterion': ['gini', 'entropy'],
+    },
+}
+
+# XGBoost trials boost up to XGB_MAX_ROUNDS trees, stopping once the validation loss has not
+# improved for XGB_EARLY_STOPPING_ROUNDS
+XGB_MAX_ROUNDS = 2000
+XGB_EARLY_STOPPING_ROUNDS = 50
+
+# Evaluated trials (in the cache directory) and the search log (in the model directory)
+TRIALS_FILE = 'trials.jsonl'
+SEARCH_LOG_FILE = 'search_log.csv'
+
+
+# Function to draw hyperparameter configurations from a search space
+def sample_configs(space, n_configs, seed=42):
+    """
+    n_configs distinct configurations drawn at random from the grid of `space` (all of them,
+    shuffled, if the grid is smaller). The draw only depends on the seed, so a resumed search
+    evaluates the same configurations.
+    """
+    names = sorted(space)
+    grid = list(itertools.product(*(space[name] for name in names)))
+    chosen = np.random.default_rng(seed).permutation(len(grid))[:n_configs]
+    return [dict(zip(names, grid[i])) for i in chosen]
+
+def build_estimator(name, params, n_jobs=None):
+    """
+    Unfitted model of the family `name` with the trainer defaults overridden by params, and a
+    fixed random_state so that a trial gives the same score when it is evaluated again.
+    """
+    model = ESTIMATORS[name](n_jobs)
+    if 'random_state' in model.get_params():
+        model.set_params(random_state=42)
+    model.set_params(**params)
+    if name == 'XGBoost':
+        model.set_params(n_estimators=XGB_MAX_ROUNDS, early_stopping_rounds=XGB_EARLY_STOPPING_ROUNDS)
+    return model
+
+def stratified_order(y, seed=42):
+    """
+    Shuffled row order in which every prefix keeps the class balance of y, so the nested
+    training subsets of the successive-halving rungs all contain every class.
+    """
+    y = np.asarray(y)
+    permutation = np.random.default_rng(seed).permutation(len(y))
+    y_permuted = y[permutation]
+    position = np.empty(len(y))
+    for cls in np.unique(y):
+        mask = y_permuted == cls
+        position[mask] = (np.arange(mask.sum()) + 0.5) / mask.sum()
+    return permutation[np.argsort(position, kind='stable')]
+
+def hyperband_brackets(max_rows, min_rows, eta=3, n_configs=None):
+    """
+    Successive-halving brackets of a Hyperband search, as lists of (n_configs, n_rows) rungs.
+
+    Bracket s starts many configurations on few rows and keeps the best 1/eta of them at
+    each rung, on eta times more rows, up to max_rows. With n_configs, only the most
+    aggressive bracket is returned, starting n_configs configurations (plain successive halving).
+    """
+    s_max = max(0, int(math.floor(math.log(max_rows / min_rows, eta) + 1e-9)))
+    brackets = []
+    for s in range(s_max, -1, -1):
+        n = n_configs or int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        rungs = []
+        for i in range(s + 1):
+            rungs.append((max(1, n // eta ** i), min(max_rows, int(max_rows * eta ** (i - s)))))
+        brackets.append(rungs)
+        if n_configs:
+            break
+    return brackets
+
+def _trial_key(name, params, n_rows, fingerprint):
+    payload = json.dumps({'model': name, 'params': params, 'n_rows': n_rows, 'data': fingerprint}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _load_trials(cache_dir):
+    """
+    Read the cached trials. A last line cut short by an interruption is removed from the file
+    (so that new trials are appended on a line of their own) and its trial evaluated again.
+    """
+    trials = {}
+    path = os.path.join(cache_dir, TRIALS_FILE)
+    if os.path.exists(path):
+        with open(path, 'rb+') as f:
+            content = f.read()
+            if content and not content.endswith(b'\n'):
+                f.truncate(content.rfind(b'\n') + 1)
+        with open(path) as f:
+            for line in f:
+                try:
+                    trial = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                trials[trial['key']] = trial
+    return trials
+
+def _run_trial(name, params, n_rows, data_paths, n_jobs):
+    """Worker: fit one configuration on the first n_rows training rows and score it on the validation rows."""
+    X_fit, y_fit, X_val, y_val, order = (joblib.load(path, mmap_mode='r') for path in data_paths)
+    rows = np.sort(order[:n_rows])
+    X_train, y_train = X_fit[rows], y_fit[rows]
+    if sparse.issparse(X_fit) and name not in SPARSE_TRAINERS:
+        X_train, X_val = X_train.toarray(), X_val.toarray()
+
+    model = build_estimator(name, params, n_jobs)
+    start = time.perf_counter()
+    if name == 'XGBoost':
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+    else:
+        model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    evaluation = evaluate_scores(y_val, model.predict_proba(X_val)[:, 1], thresholds=[])
+    return {
+        'auc': evaluation['auc'],
+        'brier': evaluation['brier'],
+        'best_iteration': getattr(model, 'best_iteration', None) if name == 'XGBoost' else None,
+        'fit_seconds': fit_seconds,
+    }
+
+def tune_model(name, X_train, y_train, model_dir=MODEL_DIR, cache_dir=None, n_configs=None, eta=3,
+               min_rows=None, validation_size=0.2, n_cores=None, seed=42):
+    """
+    Hyperband search over SEARCH_SPACES[name], then refit and save the best configuration.
+
+    The budget of a trial is its number of training rows: each bracket runs successive
+    halving from min_rows (default: the training rows / eta ** 3) up to all training rows,
+    scoring configurations by AUC on a stratified validation split. XGBoost trials use early
+    stopping on that split. With n_configs, a single successive-halving bracket of n_configs
+    configurations is run instead.
+
+    Trials run in a process pool over memory-mapped copies of the data. Each finished trial
+    is appended to cache_dir/trials.jsonl (default: model_dir/tuning_cache), so a search that
+    is interrupted and run again only evaluates the trials it had not finished.
+
+    The best configuration (highest validation AUC on all training rows) is refit and saved
+    with save_model to MODEL_FILES[name] in model_dir (XGBoost with n_estimators set to its
+    best number of rounds and early stopping off); every trial is appended to the search log,
+    model_dir/search_log.csv.
+
+    Returns:
+        tuple: The fitted best model and a DataFrame of this search's trials.
+    """
+    cache_dir = cache_dir or os.path.join(model_dir, 'tuning_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(model_dir, exist_ok=True)
+
+    if any(isinstance(dtype, pd.CategoricalDtype) for dtype in X_train.dtypes):
+        X, _ = to_csr(X_train)
+    else:
+        X = np.ascontiguousarray(X_train.to_numpy(dtype='float64'))
+    y = np.asarray(y_train)
+    fit_rows, val_rows = train_test_split(np.arange(len(y)), test_size=validation_size, random_state=seed, stratify=y)
+    fit_rows, val_rows = np.sort(fit_rows), np.sort(val_rows)
+    X_fit, y_fit, X_val, y_val = X[fit_rows], y[fit_rows], X[val_rows], y[val_rows]
+    order = stratified_order(y_fit, seed)
+    fingerprint = joblib.hash((X_fit, y_fit, X_val, y_val, order))
+
+    max_rows = len(y_fit)
+    min_rows = min(max_rows, min_rows or max(100, max_rows // eta ** 3))
+    n_cores = n_cores or os.cpu_count() or 1
+    trials = _load_trials(cache_dir)
+    log = []
+
+    shared_dir = tempfile.mkdtemp(prefix='tuning_')
+    try:
+        data_paths = []
+        for data_name, data in [('X_fit', X_fit), ('y_fit', y_fit), ('X_val', X_val), ('y_val', y_val), ('order', order)]:
+            path = os.path.join(shared_dir, f'{data_name}.joblib')
+            joblib.dump(data, path)
+            data_paths.append(path)
+
+        with ProcessPoolExecutor(max_workers=n_cores) as executor, open(os.path.join(cache_dir, TRIALS_FILE), 'a') as cache:
+            for bracket, rungs in enumerate(hyperband_brackets(max_rows, min_rows, eta, n_configs)):
+                configs = sample_configs(SEARCH_SPACES[name], rungs[0][0], seed=seed + bracket)
+                for rung, (n_keep, n_rows) in enumerate(rungs):
+                    configs = configs[:n_keep]
+                    keys = [_trial_key(name, params, n_rows, fingerprint) for params in configs]
+                    pending = [i for i, key in enumerate(keys) if key not in trials]
+                    threads = max(1, n_cores // max(1, len(pending)))
+                    futures = {
+                        executor.submit(_run_trial, name, configs[i], n_rows, data_paths,
+                                        threads if name in MULTITHREADED_TRAINERS else 1): i
+                        for i in pending
+                    }
+                    for future in as_completed(futures):
+                        i = futures[future]
+                        trials[keys[i]] = dict(future.result(), key=keys[i], model=name, params=configs[i], n_rows=n_rows)
+                        cache.write(json.dumps(trials[keys[i]]) + '\n')
+                        cache.flush()
+
+                    for i, params in enumerate(configs):
+                        trial = trials[keys[i]]
+                        log.append({
+                            'Model': name, 'Bracket': bracket, 'Rung': rung, 'Rows': n_rows,
+                            'Params': json.dumps(params, sort_keys=True),
+                            'AUC': trial['auc'], 'Brier': trial['brier'],
+                            'Best Iteration': trial['best_iteration'], 'Fit Time (s)': trial['fit_seconds'],
+                            'Cached': i not in pending,
+                        })
+                    # Promote the best 1/eta of the configurations to the next rung
+                    ranked = np.argsort([-np.nan_to_num(trials[key]['auc'], nan=-1) for key in keys], kind='stable')
+                    configs = [configs[i] for i in ranked]
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+    log = pd.DataFrame(log)
+    full = log[log['Rows'] == max_rows]
+    best = (full if len(full) else log).sort_values('AUC', ascending=False).iloc[0]
+    best_params = json.loads(best['Params'])
+    print(f"{name}: best validation AUC {best['AUC']:.4f} on {best['Rows']} rows with {best_params}")
+
+    # Refit the best configuration on all training rows (on the DataFrame when the features are
+    # dense, so the saved model keeps the feature names like the trainers' models)
+    model = build_estimator(name, best_params, n_cores)
+    if not sparse.issparse(X):
+        X_fit_model, X_val_model = X_train.iloc[fit_rows], X_train.iloc[val_rows]
+    elif name not in SPARSE_TRAINERS:
+        X_fit_model, X_val_model = X_fit.toarray(), X_val.toarray()
+    else:
+        X_fit_model, X_val_model = X_fit, X_val
+    if name == 'XGBoost':
+        model.fit(X_fit_model, y_fit, eval_set=[(X_val_model, y_val)], verbose=False)
+        # Save the rounds up to the best iteration, without early stopping, so that the model can
+        # be refit or refreshed (modeling.refresh_xgboost) without a validation set
+        model = build_estimator(name, best_params, n_cores).set_params(
+            n_estimators=model.best_iteration + 1, early_stopping_rounds=None)
+        model.fit(X_fit_model, y_fit)
+    else:
+        model.fit(X_fit_model, y_fit)
+    save_model(model, os.path.join(model_dir, MODEL_FILES[name]))
+
+    log_path = os.path.join(model_dir, SEARCH_LOG_FILE)
+    log.to_csv(log_path, mode='a', header=not os.path.exists(log_path), index=False)
+    return model, log
+
+def tune_models(X_train, y_train, model_names=None, **kwargs):
+    """
+    Run tune_model for each model family (all of SEARCH_SPACES by default).
+
+    Returns:
+        tuple: The fitted best model of each family by name, and the search log of all of them.
+    """
+    models, logs = {}, []
+    for name in model_names or list(SEARCH_SPACES):
+        models[name], log = tune_model(name, X_train, y_train, **kwargs)
+        logs.append(log)
+    return models, pd.concat(logs, ignore_index=True)
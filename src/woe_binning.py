@@ -3,6 +3,8 @@ import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
 from sklearn.preprocessing import KBinsDiscretizer
+from feature_engineering import partial_aggregates, merge_partial_aggregates
+from time_features import parse_timestamps
 
 def calculate_rfms_components(final_df):
     """Calculate RFMS components."""
@@ -22,7 +24,7 @@ def calculate_rfms_components(final_df):
 
 # Function to apply risk labeling based on a threshold
 def apply_risk_label(final_df, threshold=0.5):
-    final_df['Risk_Label'] = final_df['RFMS_Score'].apply(lambda x: 1 if x > threshold else 0)  # 1: Low Risk, 0: High Risk
+    final_df['Risk_Label'] = (final_df['RFMS_Score'] > threshold).astype(int)  # 1: Low Risk, 0: High Risk
     return final_df
 
 # Function to bin RFMS score
@@ -31,6 +33,216 @@ def bin_rfms_score(final_df, n_bins=5):
     final_df['RFMS_Binned'] = kbin.fit_transform(final_df[['RFMS_Score']])
     return final_df
 
+# Source columns of the RFMS components (Recency is the latest Transaction_Year per customer)
+RFMS_SOURCE_COLUMNS = {
+    'Frequency': 'Transaction_Count',
+    'Monetary': 'Total_Transaction_Amount',
+    'Stability': 'Std_Deviation_Transaction_Amount',
+}
+
+RFMS_COLUMNS = ['Recency', 'Frequency', 'Monetary', 'Stability', 'RFMS_Score', 'Risk_Label', 'RFMS_Binned']
+
+def _as_timestamp(as_of, like):
+    """Convert an as-of date to a Timestamp with the same timezone as the `like` series."""
+    as_of = pd.Timestamp(as_of)
+    tz = like.dt.tz
+    if tz is not None and as_of.tzinfo is None:
+        return as_of.tz_localize(tz)
+    if tz is None and as_of.tzinfo is not None:
+        return as_of.tz_convert(None)
+    return as_of
+
+def build_customer_table(final_df, as_of=None):
+    """
+    Reduce transactions to one row per customer with the RFMS inputs: the latest
+    Transaction_Year and the per-customer aggregate features.
+
+    If `as_of` is given, Recency is taken from each customer's last TransactionStartTime
+    instead: the table also gets Last_Transaction_Time and Recency_Days (days from the last
+    transaction to the as-of date).
+    """
+    codes, customers = pd.factorize(final_df['CustomerId'])
+
+    # First transaction of every customer (factorize numbers customers by first appearance)
+    first_row = np.flatnonzero(np.diff(np.maximum.accumulate(codes), prepend=-1) > 0)
+
+    customer_df = pd.DataFrame({
+        'Transaction_Year': pd.Series(final_df['Transaction_Year'].to_numpy()).groupby(codes).max().to_numpy(),
+    }, index=pd.Index(customers, name='CustomerId'))
+    if as_of is not None:
+        start_time = parse_timestamps(final_df['TransactionStartTime'])
+        last_seen = start_time.groupby(codes).max()
+        customer_df['Last_Transaction_Time'] = last_seen.to_numpy()
+        customer_df['Recency_Days'] = ((_as_timestamp(as_of, last_seen) - last_seen) / pd.Timedelta(days=1)).to_numpy()
+    for source in RFMS_SOURCE_COLUMNS.values():
+        customer_df[source] = final_df[source].to_numpy()[first_row]
+    return customer_df
+
+def _rfms_component_matrix(customer_df):
+    """Raw (unnormalized) Recency, Frequency, Monetary and Stability values, one row per customer."""
+    if 'Last_Transaction_Time' in customer_df.columns:
+        # Later last transaction = more recent; min-max of this equals the inverted min-max of Recency_Days
+        last_seen = customer_df['Last_Transaction_Time']
+        recency = (last_seen - pd.Timestamp(0, tz=last_seen.dt.tz)) / pd.Timedelta(days=1)
+    else:
+        recency = customer_df['Transaction_Year']
+    return np.column_stack(
+        [recency.to_numpy(dtype='float64')] +
+        [customer_df[source].to_numpy(dtype='float64') for source in RFMS_SOURCE_COLUMNS.values()]
+    )
+
+def _score_rfms_components(components, col_min, col_max):
+    """Min-max normalize the component matrix and average the available components."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        normalized = np.clip((components - col_min) / (col_max - col_min), 0, 1)
+        # Mean of the available components, like DataFrame.mean(axis=1)
+        available = ~np.isnan(normalized)
+        score = np.where(available, normalized, 0).sum(axis=1) / available.sum(axis=1)
+    return normalized, score
+
+def fit_rfms_bounds(customer_df, n_bins=5):
+    """
+    Fit the RFMS normalization bounds (per-component min/max) and the inner edges of the
+    uniform RFMS score bins on a customer table.
+    """
+    components = _rfms_component_matrix(customer_df)
+    with np.errstate(invalid='ignore'):
+        col_min, col_max = np.nanmin(components, axis=0), np.nanmax(components, axis=0)
+    _, score = _score_rfms_components(components, col_min, col_max)
+
+    # Uniform bins over the score range, as KBinsDiscretizer(strategy='uniform')
+    score_min, score_max = np.nanmin(score), np.nanmax(score)
+    bin_edges = np.linspace(score_min, score_max, n_bins + 1)[1:-1] if score_max > score_min else np.array([])
+    return {'min': col_min, 'max': col_max, 'bin_edges': bin_edges}
+
+def calculate_customer_rfms(customer_df, threshold=0.5, n_bins=5, bounds=None):
+    """
+    Compute the RFMS components, score, risk label and bin for every customer in one
+    NumPy pass over a customer table (see build_customer_table), so the cost scales with
+    the number of customers rather than transactions.
+
+    `bounds` (from fit_rfms_bounds) defaults to the bounds of customer_df itself; pass
+    previously fitted bounds to score customers consistently with an earlier fit.
+
+    Returns:
+        pandas.DataFrame: RFMS_COLUMNS indexed by CustomerId (plus Last_Transaction_Time and
+        Recency_Days for timestamp-based Recency).
+    """
+    if bounds is None:
+        bounds = fit_rfms_bounds(customer_df, n_bins)
+    components, score = _score_rfms_components(_rfms_component_matrix(customer_df), bounds['min'], bounds['max'])
+
+    rfms_table = pd.DataFrame(components, columns=['Recency', 'Frequency', 'Monetary', 'Stability'], index=customer_df.index)
+    rfms_table['RFMS_Score'] = score
+    rfms_table['Risk_Label'] = (score > threshold).astype(int)
+    rfms_table['RFMS_Binned'] = np.searchsorted(bounds['bin_edges'], score, side='right').astype('float64')
+    for col in ['Last_Transaction_Time', 'Recency_Days']:
+        if col in customer_df.columns:
+            rfms_table[col] = customer_df[col]
+    return rfms_table
+
+def join_rfms(final_df, rfms_table, columns=None):
+    """
+    Attach customer-level RFMS columns to transactions through the CustomerId index of
+    rfms_table. Only the requested `columns` are materialized (all RFMS_COLUMNS by default);
+    customers missing from the table get NaN.
+    """
+    for col in columns or RFMS_COLUMNS:
+        final_df[col] = rfms_table[col].reindex(final_df['CustomerId']).to_numpy()
+    return final_df
+
+def compute_rfms(final_df, threshold=0.5, n_bins=5, as_of=None):
+    """
+    Vectorized RFMS engine, equivalent to calculate_rfms_components, apply_risk_label and
+    bin_rfms_score run in sequence (or, with `as_of`, using timestamp-based Recency as in
+    build_customer_table).
+
+    The components only vary by customer (Frequency, Monetary and Stability come from the
+    per-customer aggregate features), so they are computed once per customer and then
+    broadcast back to the transactions.
+    """
+    rfms_table = calculate_customer_rfms(build_customer_table(final_df, as_of=as_of), threshold=threshold, n_bins=n_bins)
+    return join_rfms(final_df, rfms_table)
+
+
+class IncrementalRFMS:
+    """
+    Customer RFMS table with timestamp-based Recency that is kept up to date incrementally.
+
+    Each customer's last-seen TransactionStartTime and running Amount aggregates are kept.
+    update() folds in a new batch of raw transactions (e.g. one day's) and recomputes RFMS
+    only for the customers in it, with the normalization bounds and bin edges from the last
+    fit() so the untouched customers' scores stay comparable. Call fit() again on the full
+    history from time to time to re-derive the bounds.
+    """
+
+    def __init__(self, threshold=0.5, n_bins=5):
+        self.threshold = threshold
+        self.n_bins = n_bins
+        self.state = None
+        self.bounds = None
+        self.rfms_table = None
+        self.as_of = None
+
+    def _partial_state(self, transactions):
+        state = partial_aggregates(transactions)
+        state['Last_Transaction_Time'] = parse_timestamps(transactions['TransactionStartTime']).groupby(transactions['CustomerId']).max()
+        return state
+
+    def _customer_table(self, state):
+        count = state['count']
+        return pd.DataFrame({
+            'Last_Transaction_Time': state['Last_Transaction_Time'],
+            'Recency_Days': (self.as_of - state['Last_Transaction_Time']) / pd.Timedelta(days=1),
+            'Transaction_Count': state['transaction_count'],
+            'Total_Transaction_Amount': state['total'],
+            'Std_Deviation_Transaction_Amount': (state['m2'] / (count - 1)).where(count > 1) ** 0.5,
+        }, index=state.index)
+
+    def fit(self, transactions, as_of=None):
+        """Build the state and the RFMS table from the full transaction history."""
+        self.state = self._partial_state(transactions)
+        last_seen = self.state['Last_Transaction_Time']
+        self.as_of = _as_timestamp(as_of, last_seen) if as_of is not None else last_seen.max()
+
+        customer_df = self._customer_table(self.state)
+        self.bounds = fit_rfms_bounds(customer_df, self.n_bins)
+        self.rfms_table = calculate_customer_rfms(customer_df, self.threshold, self.n_bins, self.bounds)
+        return self
+
+    def update(self, transactions, as_of=None):
+        """
+        Fold new transactions in and refresh RFMS for the customers they touch.
+
+        Returns:
+            pandas.DataFrame: The refreshed RFMS rows of the touched customers.
+        """
+        new_state = self._partial_state(transactions)
+        touched = new_state.index
+        existing = touched.intersection(self.state.index)
+        added = touched.difference(self.state.index)
+
+        aggregate_columns = ['count', 'total', 'mean', 'm2', 'transaction_count']
+        merged = merge_partial_aggregates(self.state.loc[existing, aggregate_columns], new_state[aggregate_columns])
+        merged['Last_Transaction_Time'] = pd.concat(
+            [self.state.loc[existing, 'Last_Transaction_Time'], new_state['Last_Transaction_Time']], axis=1
+        ).max(axis=1)
+
+        self.state.loc[existing] = merged.loc[existing]
+        self.state = pd.concat([self.state, merged.loc[added]]) if len(added) else self.state
+
+        last_seen = self.state['Last_Transaction_Time']
+        batch_as_of = _as_timestamp(as_of, last_seen) if as_of is not None else merged['Last_Transaction_Time'].max()
+        self.as_of = max(self.as_of, batch_as_of)
+
+        refreshed = calculate_customer_rfms(self._customer_table(self.state.loc[touched]), self.threshold, self.n_bins, self.bounds)
+        self.rfms_table.loc[existing] = refreshed.loc[existing]
+        self.rfms_table = pd.concat([self.rfms_table, refreshed.loc[added]]) if len(added) else self.rfms_table
+
+        # Days since the last transaction move with the as-of date for every customer
+        self.rfms_table['Recency_Days'] = (self.as_of - self.rfms_table['Last_Transaction_Time']) / pd.Timedelta(days=1)
+        return refreshed
+
 # Function to calculate WoE (Weight of Evidence)
 def calculate_woe(df, feature, target):
     woe_df = df.groupby(feature)[target].agg(['count', 'sum'])
@@ -66,20 +278,14 @@ def visualize_rfms_space(final_df):
     plt.show()
 
 # Main function that ties everything together
-def process_rfms_binning(final_df):
-    # Calculate RFMS components
-    final_df = calculate_rfms_components(final_df)
+def process_rfms_binning(final_df, as_of=None):
+    # Calculate RFMS components, risk labels and RFMS bins in one vectorized pass
+    final_df = compute_rfms(final_df, threshold=0.5, n_bins=5, as_of=as_of)
     
     # Visualize RFMS distribution and RFMS space
     plot_rfms_score_distribution(final_df)
     visualize_rfms_space(final_df)
     
-    # Apply risk labeling
-    final_df = apply_risk_label(final_df, threshold=0.5)
-    
-    # Bin RFMS score into discrete categories
-    final_df = bin_rfms_score(final_df, n_bins=5)
-    
     # Apply WoE binning
     woe_df = apply_woe_binning(final_df, 'RFMS_Binned', 'Risk_Label')
     print(woe_df)
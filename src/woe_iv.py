@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+def quantile_bin_edges(values, n_bins=10):
+    """Inner edges of (up to) n_bins equal-frequency bins, ignoring missing values."""
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.array([])
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+    return edges[1:-1]
+
+def merge_to_monotonic(edges, events, totals):
+    """
+    Merge adjacent bins until the event rate is monotonic, in the direction of the overall
+    trend (last bin vs first bin). Works on the per-bin counts only; no re-binning.
+    """
+    edges, events, totals = list(edges), list(events), list(totals)
+    increasing = events[-1] / max(totals[-1], 1) >= events[0] / max(totals[0], 1)
+    i = 0
+    while i < len(events) - 1:
+        rate, next_rate = events[i] / max(totals[i], 1), events[i + 1] / max(totals[i + 1], 1)
+        if (next_rate < rate) if increasing else (next_rate > rate):
+            events[i:i + 2] = [events[i] + events[i + 1]]
+            totals[i:i + 2] = [totals[i] + totals[i + 1]]
+            del edges[i]
+            i = max(i - 1, 0)
+        else:
+            i += 1
+    return np.array(edges), np.array(events), np.array(totals)
+
+def woe_from_counts(events, totals, smoothing=0.5):
+    """
+    WoE and IV contribution per bin, with additive (Laplace) smoothing so empty bins get a
+    finite WoE. Follows calculate_woe: WoE = ln(%good / %bad) with good = target 1.
+    """
+    events = np.asarray(events, dtype='float64')
+    non_events = np.asarray(totals, dtype='float64') - events
+    n_bins = len(events)
+    dist_good = (events + smoothing) / (events.sum() + smoothing * n_bins)
+    dist_bad = (non_events + smoothing) / (non_events.sum() + smoothing * n_bins)
+    woe = np.log(dist_good / dist_bad)
+    return woe, (dist_good - dist_bad) * woe
+
+def fit_woe_column(name, values, target, method='quantile', n_bins=10, smoothing=0.5):
+    """
+    Bin one column and compute its WoE table and Information Value.
+
+    Numeric columns get quantile bins (method='quantile') or quantile bins merged until the
+    event rate is monotonic (method='monotonic'); other columns get one bin per category.
+    Missing values always get their own last bin. Counts come from np.bincount on the
+    integer bin codes.
+    """
+    target = np.asarray(target, dtype='float64')
+    numeric = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+    if numeric:
+        x = pd.Series(values).to_numpy(dtype='float64', na_value=np.nan)
+        edges = quantile_bin_edges(x, n_bins)
+        codes = np.where(np.isnan(x), len(edges) + 1, np.searchsorted(edges, x, side='right'))
+        n_codes = len(edges) + 2
+        categories = None
+    else:
+        codes, categories = pd.factorize(pd.Series(values), use_na_sentinel=True)
+        categories = pd.Index(categories)
+        n_codes = len(categories) + 1
+        codes = np.where(codes < 0, n_codes - 1, codes)
+        edges = None
+
+    events = np.bincount(codes, weights=target, minlength=n_codes)
+    totals = np.bincount(codes, minlength=n_codes)
+
+    if numeric and method == 'monotonic' and len(edges) > 0:
+        edges, bin_events, bin_totals = merge_to_monotonic(edges, events[:-1], totals[:-1])
+        events = np.append(bin_events, events[-1])
+        totals = np.append(bin_totals, totals[-1])
+
+    # Drop the missing bin from the WoE computation when there are no missing values
+    has_missing = totals[-1] > 0
+    woe, iv_parts = woe_from_counts(events if has_missing else events[:-1],
+                                    totals if has_missing else totals[:-1], smoothing)
+    if not has_missing:
+        woe, iv_parts = np.append(woe, 0.0), np.append(iv_parts, 0.0)
+
+    if numeric:
+        bounds = np.concatenate([[-np.inf], edges, [np.inf]])
+        labels = [f'[{lo:.4g}, {hi:.4g})' for lo, hi in zip(bounds[:-1], bounds[1:])] + ['Missing']
+    else:
+        labels = [str(category) for category in categories] + ['Missing']
+
+    table = pd.DataFrame({
+        'bin': labels,
+        'count': totals,
+        'good': events,
+        'bad': totals - events,
+        'woe': woe,
+        'iv': iv_parts,
+    })
+    return name, {'numeric': numeric, 'edges': edges, 'categories': categories, 'woe': woe, 'iv': float(iv_parts.sum()), 'table': table}
+
+def _fit_woe_column_star(args):
+    return fit_woe_column(*args)
+
+
+class WoETransformer:
+    """
+    Fitted WoE binning for many columns at once.
+
+    fit() bins every column and computes its WoE table and Information Value, spreading
+    the columns over a process pool. transform() replaces values with their bin's WoE via
+    array lookups; categories not seen during fit get a WoE of 0.
+    """
+
+    def __init__(self, method='quantile', n_bins=10, smoothing=0.5, n_jobs=None):
+        self.method = method
+        self.n_bins = n_bins
+        self.smoothing = smoothing
+        self.n_jobs = n_jobs
+        self.bins_ = {}
+
+    def fit(self, df, target, columns=None):
+        columns = columns or [col for col in df.columns if col != target]
+        y = df[target].to_numpy()
+        tasks = [(col, df[col], y, self.method, self.n_bins, self.smoothing) for col in columns]
+
+        n_jobs = self.n_jobs or os.cpu_count() or 1
+        if n_jobs == 1 or len(tasks) == 1:
+            results = map(_fit_woe_column_star, tasks)
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as executor:
+                results = list(executor.map(_fit_woe_column_star, tasks))
+
+        self.bins_ = dict(results)
+        return self
+
+    @property
+    def iv_(self):
+        """Information Value per column, highest first."""
+        return pd.Series({col: spec['iv'] for col, spec in self.bins_.items()}, name='IV').sort_values(ascending=False)
+
+    def woe_table(self, column):
+        return self.bins_[column]['table']
+
+    def transform(self, df):
+        woe_df = pd.DataFrame(index=df.index)
+        for col, spec in self.bins_.items():
+            woe = spec['woe']
+            if spec['numeric']:
+                x = df[col].to_numpy(dtype='float64', na_value=np.nan)
+                codes = np.where(np.isnan(x), len(woe) - 1, np.searchsorted(spec['edges'], x, side='right'))
+                woe_df[col] = woe[codes]
+            else:
+                codes = spec['categories'].get_indexer(df[col])
+                codes = np.where(df[col].isna().to_numpy(), len(woe) - 1, codes)
+                # Unseen categories (-1) are neutral
+                woe_df[col] = np.where(codes < 0, 0.0, woe[codes])
+        return woe_df
+
+    def fit_transform(self, df, target, columns=None):
+        return self.fit(df, target, columns).transform(df)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+# Sample data for testing (simulating CSV data without reading a file)
+@pytest.fixture
+def sample_data():
+    data = {
+        "TransactionId": ["TransactionId_76871", "TransactionId_73770", "TransactionId_26203"],
+        "BatchId": ["BatchId_36123", "BatchId_15642", "BatchId_53941"],
+        "AccountId": ["AccountId_3957", "AccountId_4841", "AccountId_4229"],
+        "SubscriptionId": ["SubscriptionId_887", "SubscriptionId_3829", "SubscriptionId_222"],
+        "CustomerId": [4406, 4406, 4683],
+        "CurrencyCode": ["UGX", "UGX", "UGX"],
+        "CountryCode": [256, 256, 256],
+        "ProviderId": ["ProviderId_6", "ProviderId_4", "ProviderId_6"],
+        "ProductId": [10, 6, 1],
+        "ProductCategory": ["airtime", "financial_services", "airtime"],
+        "ChannelId": ["ChannelId_3", "ChannelId_2", "ChannelId_3"],
+        "Amount": [1000.0, -20.0, 500.0],
+        "Value": [1000, 20, 500],
+        "TransactionStartTime": ["2018-11-15T02:18:49Z", "2018-11-15T02:19:08Z", "2018-11-15T02:44:21Z"],
+        "PricingStrategy": ["2", "2", "2"],
+        "FraudResult": [0, 0, 0]
+    }
+
+    df = pd.DataFrame(data)
+    return df
+
+
+# Larger synthetic transactions, for the chunked, batched and parallel code paths
+@pytest.fixture
+def make_transactions():
+    """
+    Factory of n random transactions over n_customers customers in 2018-2019, with a
+    Risk_Label that follows Amount. Tests keep the columns they need.
+    """
+    def make(n=1000, n_customers=60, seed=0):
+        rng = np.random.default_rng(seed)
+        amounts = rng.normal(1000, 5000, n).round(2)
+        df = pd.DataFrame({
+            'TransactionId': [f'TransactionId_{i}' for i in range(n)],
+            'CustomerId': [f'CustomerId_{c}' for c in rng.integers(0, n_customers, n)],
+            'Amount': amounts,
+            'Value': np.abs(amounts),
+            'TransactionStartTime': [f'{y}-{m:02d}-{d:02d}T02:18:49Z' for y, m, d in
+                                     zip(rng.integers(2018, 2020, n), rng.integers(1, 13, n), rng.integers(1, 29, n))],
+            'PricingStrategy': rng.integers(0, 5, n),
+        })
+        df['ProductCategory'] = rng.choice(['airtime', 'financial_services', 'utility_bill', 'movies'], size=n,
+                                           p=[0.5, 0.4, 0.08, 0.02])
+        df['Risk_Label'] = (amounts + rng.normal(0, 2500, n) > 1000).astype(int)
+        return df
+    return make
+
+
+@pytest.fixture
+def make_classification_data():
+    """Factory of n rows of normal features a-d and a binary target that follows a + b."""
+    def make(n=600, seed=0):
+        rng = np.random.default_rng(seed)
+        X = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+        y = pd.Series((X['a'] + X['b'] + rng.normal(0, 0.5, n) > 0).astype(int))
+        return X, y
+    return make
@@ -0,0 +1,160 @@
+import os
+import sys
+import json
+import pytest
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from app import app
+from data_preprocess import preprocess_transactions, transform_transactions, INPUT_COLUMNS
+from feature_engineering import fit_serving_preprocessor
+
+
+@pytest.fixture
+def transactions(sample_data):
+    """The request fields of the sample transactions, as the JSON records a client sends."""
+    return sample_data[INPUT_COLUMNS].to_dict('records')
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_predict_batch_json(client, transactions):
+    """Scores come back one per transaction, in input order."""
+    response = client.post('/predict/batch', json=transactions)
+    assert response.status_code == 200
+    predictions = response.get_json()['predictions']
+    assert [p['TransactionId'] for p in predictions] == [t['TransactionId'] for t in transactions]
+    assert all(0.0 <= p['score'] <= 1.0 for p in predictions)
+    assert all(p['prediction'] == int(p['score'] >= 0.5) for p in predictions)
+
+
+def test_predict_batch_ndjson_matches_json(client, transactions):
+    """NDJSON and JSON bodies produce identical scores."""
+    body = '\n'.join(json.dumps(t) for t in transactions)
+    ndjson = client.post('/predict/batch', data=body, content_type='application/x-ndjson').get_json()
+    wrapped = client.post('/predict/batch', json={'transactions': transactions}).get_json()
+    assert ndjson == wrapped
+
+
+@pytest.mark.parametrize('with_store', [False, True])
+@pytest.mark.parametrize('fitted', [False, True])
+def test_score_batch_matches_separate_requests(monkeypatch, fitted, with_store, transactions):
+    """A micro-batch of requests scores each one as if it had been sent on its own."""
+    import app as server
+    from feature_store import CustomerFeatureStore
+    transactions = pd.DataFrame(transactions)
+    monkeypatch.setattr(server, 'preprocessor', fit_serving_preprocessor(transactions.copy()) if fitted else None)
+    store = None
+    if with_store:
+        # History for the batched customers, and requests that repeat a stored transaction
+        store = CustomerFeatureStore()
+        store.ingest(transactions.iloc[:1].assign(Amount=250.0).assign(TransactionId=['TransactionId_10']))
+        store.ingest(transactions.iloc[2:])
+    monkeypatch.setattr(server, 'get_feature_store', lambda: store)
+
+    requests = [transactions.iloc[:1], transactions.iloc[1:], transactions]
+    batched = server.score_batch(requests)
+    for request_df, scores in zip(requests, batched):
+        np.testing.assert_allclose(scores, server.score_batch([request_df])[0])
+
+
+def test_predict_batch_through_micro_batcher(client, monkeypatch, transactions):
+    """With micro-batching enabled the endpoint returns the same predictions."""
+    import app as server
+    from batching import MicroBatcher
+    expected = client.post('/predict/batch', json=transactions).get_json()
+
+    batcher = MicroBatcher(server.score_batch, window_ms=1)
+    monkeypatch.setattr(server, 'batcher', batcher)
+    assert client.post('/predict/batch', json=transactions).get_json() == expected
+    batcher.close()
+
+
+def test_predict_batch_missing_fields(client):
+    """A batch without required fields is rejected with a 400."""
+    response = client.post('/predict/batch', json=[{'TransactionId': 1}])
+    assert response.status_code == 400
+    assert 'CustomerId' in response.get_json()['error']
+
+
+def test_transform_transactions_matches_refit_on_training_data(transactions):
+    """Applying a preprocessor fitted on a dataset reproduces the refit path on that dataset."""
+    df = pd.DataFrame(transactions + [
+        {'TransactionId': 'TransactionId_4', 'CustomerId': 988, 'Amount': 20000.0, 'Value': 21800.0,
+         'TransactionStartTime': '2019-02-01T03:32:55Z', 'PricingStrategy': '1'},
+        {'TransactionId': 'TransactionId_5', 'CustomerId': 988, 'Amount': -644.0, 'Value': 644.0,
+         'TransactionStartTime': '2018-11-20T03:34:21Z', 'PricingStrategy': '2'},
+    ])
+    preprocessor = fit_serving_preprocessor(df.copy())
+
+    expected = preprocess_transactions(df.copy())
+    actual = transform_transactions(df.copy(), preprocessor)
+
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_transform_transactions_single_row_uses_training_ranges(transactions):
+    """A one-row request is scaled with the fitted ranges instead of collapsing to 0."""
+    preprocessor = fit_serving_preprocessor(pd.DataFrame(transactions))
+    X = transform_transactions(pd.DataFrame(transactions[:1]), preprocessor)
+    assert X['Amount'].iloc[0] == 1.0
+    assert X['Value'].iloc[0] == 1.0
+
+
+def test_transform_transactions_uses_store_aggregates(transactions):
+    """Aggregates from the feature store replace the ones computed over the request."""
+    from feature_store import CustomerFeatureStore
+
+    history = pd.DataFrame(transactions)
+    preprocessor = fit_serving_preprocessor(history.copy())
+    store = CustomerFeatureStore()
+    store.ingest(history)
+
+    request_df = history.iloc[:1].copy()
+    with_store = transform_transactions(request_df.copy(), preprocessor, store.lookup(request_df['CustomerId']))
+    without_store = transform_transactions(request_df.copy(), preprocessor)
+
+    # Customer 4406 has two transactions in its history but only one in the request
+    count_min, count_max = preprocessor['min_max']['Transaction_Count']
+    assert with_store['Transaction_Count'].iloc[0] == (2 - count_min) / (count_max - count_min)
+    assert without_store['Transaction_Count'].iloc[0] == 0.0
+
+
+def test_scoring_is_read_only_and_ingestion_is_deduplicated(client, monkeypatch, transactions):
+    """Scoring does not change the store; /transactions adds each TransactionId once."""
+    import app as server
+    from feature_store import CustomerFeatureStore
+    store = CustomerFeatureStore()
+    monkeypatch.setattr(server, 'get_feature_store', lambda: store)
+
+    first = client.post('/predict/batch', json=transactions).get_json()
+    assert client.post('/predict/batch', json=transactions).get_json() == first
+    assert np.isnan(store.lookup([4406])['Transaction_Count'].iloc[0])
+
+    assert client.post('/transactions', json=transactions).get_json() == {'ingested': 3, 'duplicates': 0}
+    assert client.post('/transactions', json=transactions).get_json() == {'ingested': 0, 'duplicates': 3}
+    assert store.lookup([4406])['Transaction_Count'].iloc[0] == 2
+    # The ingested transactions score as they did while pending
+    assert client.post('/predict/batch', json=transactions).get_json() == first
+
+
+def test_feature_store_is_opened_per_process(monkeypatch):
+    """The store is opened once per process, and again after a fork (a new pid)."""
+    import app as server
+    opened = []
+    monkeypatch.setattr(server, 'load_feature_store', lambda: opened.append(object()) or opened[-1])
+    monkeypatch.setattr(server, '_feature_store', None)
+    monkeypatch.setattr(server, '_feature_store_pid', None)
+
+    first = server.get_feature_store()
+    assert server.get_feature_store() is first
+    monkeypatch.setattr(server.os, 'getpid', lambda: -1)
+    assert server.get_feature_store() is not first
+    assert len(opened) == 2
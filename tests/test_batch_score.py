@@ -0,0 +1,140 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
+
+import batch_score
+from batch_score import score_file, customer_aggregates
+from data_preprocess import transform_transactions, INPUT_COLUMNS
+from feature_engineering import fit_serving_preprocessor
+from inference import load_backend
+from model_registry import load_registered_model
+
+ORIGINAL_SCORE_CHUNK = batch_score._score_chunk
+
+
+@pytest.fixture
+def transactions(make_transactions):
+    """A file of 1,000 transactions with the columns the app scores."""
+    return make_transactions()[INPUT_COLUMNS]
+
+
+@pytest.fixture
+def scoring_inputs(tmp_path, transactions):
+    df = transactions
+    preprocessor = fit_serving_preprocessor(df.copy())
+    preprocessor_path = str(tmp_path / 'preprocessor.json')
+    with open(preprocessor_path, 'w') as f:
+        json.dump(preprocessor, f)
+    # Scores of the whole file scored as a single request
+    expected = load_backend(load_registered_model()).predict_proba(transform_transactions(df.copy(), preprocessor))
+    return df, preprocessor_path, expected
+
+
+def _fail_on_part_3(chunk, part_path, threshold):
+    if part_path.endswith('part-00003.parquet'):
+        raise RuntimeError('interrupted')
+    return ORIGINAL_SCORE_CHUNK(chunk, part_path, threshold)
+
+
+def test_customer_aggregates_cover_the_whole_file(tmp_path, transactions):
+    df = transactions
+    df.to_csv(tmp_path / 'transactions.csv', index=False)
+    aggregates = customer_aggregates(str(tmp_path / 'transactions.csv'), chunksize=97).set_index('CustomerId')
+    expected = df.groupby('CustomerId')['Amount'].agg(['sum', 'size'])
+    assert aggregates['Total_Transaction_Amount'].to_numpy() == pytest.approx(expected['sum'].to_numpy())
+    assert (aggregates['Transaction_Count'].to_numpy() == expected['size'].to_numpy()).all()
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_score_file_matches_single_request(tmp_path, scoring_inputs, file_format):
+    """Chunked, parallel scoring gives the scores of the whole file in one request, in input order."""
+    df, preprocessor_path, expected = scoring_inputs
+    input_path = str(tmp_path / f'transactions.{file_format}')
+    if file_format == 'csv':
+        df.to_csv(input_path, index=False)
+    else:
+        df.to_parquet(input_path, index=False)
+    output_path = str(tmp_path / 'scores.parquet')
+
+    summary = score_file(input_path, output_path, chunksize=128, n_workers=2, preprocessor_path=preprocessor_path)
+
+    scores = pd.read_parquet(output_path)
+    assert summary['chunks'] == 8 and summary['rows_scored'] == len(df)
+    assert list(scores.columns) == ['TransactionId', 'score', 'Risk_Label']
+    assert scores['TransactionId'].tolist() == df['TransactionId'].tolist()
+    np.testing.assert_allclose(scores['score'], expected, rtol=1e-6)
+    assert (scores['Risk_Label'] == (scores['score'] >= 0.5)).all()
+    assert not os.path.exists(output_path + '.parts')
+
+
+def test_score_file_resumes_after_interruption(tmp_path, scoring_inputs, monkeypatch):
+    df, preprocessor_path, expected = scoring_inputs
+    input_path = str(tmp_path / 'transactions.csv')
+    df.to_csv(input_path, index=False)
+    output_path = str(tmp_path / 'scores.parquet')
+
+    monkeypatch.setattr(batch_score, '_score_chunk', _fail_on_part_3)
+    with pytest.raises(RuntimeError, match='interrupted'):
+        score_file(input_path, output_path, chunksize=128, n_workers=1, preprocessor_path=preprocessor_path)
+    monkeypatch.undo()
+    assert not os.path.exists(output_path)
+
+    summary = score_file(input_path, output_path, chunksize=128, n_workers=1, preprocessor_path=preprocessor_path)
+    assert summary['resumed_chunks'] >= 3
+    assert summary['rows_scored'] < len(df)
+    np.testing.assert_allclose(pd.read_parquet(output_path)['score'], expected, rtol=1e-6)
+
+
+def test_score_file_rejects_other_run(tmp_path, scoring_inputs):
+    df, preprocessor_path, _ = scoring_inputs
+    input_path = str(tmp_path / 'transactions.csv')
+    df.to_csv(input_path, index=False)
+    output_path = str(tmp_path / 'scores.parquet')
+    os.makedirs(output_path + '.parts')
+    with open(os.path.join(output_path + '.parts', 'state.json'), 'w') as f:
+        json.dump({'input': 'other.csv'}, f)
+    with pytest.raises(ValueError, match='another input'):
+        score_file(input_path, output_path, preprocessor_path=preprocessor_path)
+
+
+def test_score_file_store_aggregates_do_not_depend_on_chunksize(tmp_path, monkeypatch, transactions):
+    """
+    With --aggregates store, the file's new transactions are folded into the stored aggregates
+    as /predict/batch does, and Recency comes from the whole file, so the chunking does not
+    change the scores.
+    """
+    from feature_store import CustomerFeatureStore
+    # Half of the customers stop in 2018, so Recency differs between customers
+    df = transactions.copy()
+    stopped = df['CustomerId'].str.removeprefix('CustomerId_').astype(int) < 30
+    df.loc[stopped, 'TransactionStartTime'] = '2018' + df.loc[stopped, 'TransactionStartTime'].str[4:]
+    preprocessor_path = str(tmp_path / 'preprocessor.json')
+    with open(preprocessor_path, 'w') as f:
+        json.dump(fit_serving_preprocessor(df.copy()), f)
+    store_path = str(tmp_path / 'customer_features.db')
+    store = CustomerFeatureStore(store_path)
+    store.ingest(df.iloc[:500])
+    monkeypatch.setattr(batch_score, 'load_feature_store', lambda: CustomerFeatureStore(store_path))
+    input_path = str(tmp_path / 'transactions.csv')
+    df.to_csv(input_path, index=False)
+
+    scores = []
+    for chunksize in [97, 1000]:
+        output_path = str(tmp_path / f'scores-{chunksize}.parquet')
+        score_file(input_path, output_path, chunksize=chunksize, n_workers=2, aggregates='store',
+                   preprocessor_path=preprocessor_path)
+        scores.append(pd.read_parquet(output_path)['score'].to_numpy())
+    np.testing.assert_allclose(scores[0], scores[1])
+
+    with open(preprocessor_path) as f:
+        preprocessor = json.load(f)
+    aggregates = store.lookup_pending(df).merge(
+        customer_aggregates(input_path)[['CustomerId', 'Last_Transaction_Year']], on='CustomerId')
+    expected = load_backend(load_registered_model()).predict_proba(transform_transactions(df.copy(), preprocessor, aggregates))
+    np.testing.assert_allclose(scores[0], expected, rtol=1e-6)
@@ -0,0 +1,61 @@
+import os
+import sys
+import threading
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from batching import MicroBatcher
+
+
+def test_concurrent_requests_share_a_batch():
+    """Requests submitted within the window are scored in one call and fanned back in order."""
+    calls = []
+    def score_batch(items):
+        calls.append(items)
+        return [sum(item) for item in items]
+
+    batcher = MicroBatcher(score_batch, window_ms=200)
+    futures = [batcher.submit([i, i]) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6, 8]
+    assert len(calls) == 1
+    batcher.close()
+
+
+def test_batch_is_flushed_at_max_rows():
+    calls = []
+    def score_batch(items):
+        calls.append(len(items))
+        return items
+
+    batcher = MicroBatcher(score_batch, window_ms=10_000, max_rows=4)
+    futures = [batcher.submit([0, 0]) for _ in range(4)]
+    for future in futures:
+        future.result(timeout=5)
+    assert calls == [2, 2]
+    batcher.close()
+
+
+def test_errors_reach_every_caller():
+    def score_batch(items):
+        raise ValueError('bad batch')
+
+    batcher = MicroBatcher(score_batch, window_ms=50)
+    futures = [batcher.submit([1]) for _ in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError, match='bad batch'):
+            future.result(timeout=5)
+    batcher.close()
+
+
+def test_score_from_threads():
+    batcher = MicroBatcher(lambda items: [len(item) for item in items], window_ms=1)
+    results = [None] * 20
+    def worker(i):
+        results[i] = batcher.score([0] * i)
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == list(range(20))
+    batcher.close()
@@ -0,0 +1,53 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from cross_validation import make_folds, time_folds, cross_validate_models, summarize_cv_scores
+
+
+@pytest.fixture
+def final_df(make_transactions):
+    """400 labelled transactions of 40 customers, with Amount and Value as the only features."""
+    return make_transactions(n=400, n_customers=40)[
+        ['TransactionId', 'CustomerId', 'TransactionStartTime', 'Amount', 'Value', 'Risk_Label']]
+
+
+@pytest.mark.parametrize('mode', ['stratified', 'time', 'group'])
+def test_folds_partition_rows(mode, final_df):
+    """Every fold's train and test rows are disjoint and the test rows cover each row at most once."""
+    folds = make_folds(final_df, mode, n_splits=4)
+    assert len(folds) == 4
+    test_rows = np.concatenate([test for _, test in folds])
+    assert len(test_rows) == len(np.unique(test_rows))
+    for train, test in folds:
+        assert not np.intersect1d(train, test).size
+    if mode != 'time':
+        assert len(test_rows) == len(final_df)
+
+
+def test_time_folds_train_on_the_past(final_df):
+    times = final_df['TransactionStartTime']
+    for train, test in time_folds(times, n_splits=3):
+        assert times.iloc[train].max() < times.iloc[test].min()
+
+
+def test_group_folds_keep_customers_together(final_df):
+    for train, test in make_folds(final_df, 'group', n_splits=4):
+        assert not set(final_df['CustomerId'].iloc[train]) & set(final_df['CustomerId'].iloc[test])
+
+
+def test_unknown_mode(final_df):
+    with pytest.raises(ValueError, match='Unknown cross-validation mode'):
+        make_folds(final_df, 'random')
+
+
+def test_cross_validate_models(final_df):
+    fold_scores = cross_validate_models(final_df, mode='group', n_splits=3,
+                                        model_names=['Logistic Regression', 'XGBoost'], n_cores=2)
+    assert len(fold_scores) == 6
+    assert (fold_scores['AUC'] > 0.7).all()
+    summary = summarize_cv_scores(fold_scores)
+    assert list(summary.index) == list(summary[('AUC', 'mean')].sort_values(ascending=False).index)
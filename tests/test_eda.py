@@ -18,6 +18,9 @@ from eda import (
     identify_missing_values,
     plot_outliers,
     plot_boxplots,
+    stratified_sample,
+    plot_binned_histograms,
+    plot_binned_pairplots,
 )
 import matplotlib.pyplot as plt
 
@@ -119,5 +122,26 @@ class TestEDA(unittest.TestCase):
         plot_boxplots(self.df, target_col='FraudResult')
         plt.close()
 
+    def test_stratified_sample(self):
+        """Test that stratified sampling keeps the rare class"""
+        print("\nTesting stratified_sample()...")
+        df = pd.DataFrame({'Amount': np.arange(10000.0), 'FraudResult': [1] * 20 + [0] * 9980})
+        sample = stratified_sample(df, n=500, min_per_class=10)
+        self.assertEqual(sample['FraudResult'].sum(), 10)
+        self.assertEqual(len(sample), 10 + 499)
+        self.assertIs(stratified_sample(self.df, n=500), self.df)
+
+    def test_plot_binned_histograms(self):
+        """Test binned histograms plotting"""
+        print("\nTesting plot_binned_histograms()...")
+        plot_binned_histograms(self.df)
+        plt.close('all')
+
+    def test_plot_binned_pairplots(self):
+        """Test binned pair plots of numerical columns"""
+        print("\nTesting plot_binned_pairplots()...")
+        plot_binned_pairplots(self.df)
+        plt.close('all')
+
 if __name__ == '__main__':
     unittest.main()
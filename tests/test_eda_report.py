@@ -0,0 +1,37 @@
+import os
+import sys
+import json
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from eda_report import generate_eda_report, hash_dataframe
+
+
+def test_generate_eda_report(sample_data, tmp_path, capsys):
+    df = sample_data[['ProductCategory', 'ChannelId', 'Amount', 'Value', 'FraudResult']].copy()
+    plots = ['numerical_histograms', 'categorical_distributions', 'boxplots']
+
+    index_path = generate_eda_report(df, str(tmp_path), plots=plots, n_jobs=2)
+    assert os.path.exists(index_path)
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    assert list(manifest['plots']) == plots
+    assert all(entry['error'] is None for entry in manifest['plots'].values())
+    assert len(manifest['plots']['categorical_distributions']['files']) == 2  # One figure per categorical column
+    for entry in manifest['plots'].values():
+        for filename in entry['files']:
+            assert (tmp_path / filename).exists()
+    assert 'Summary Statistics' in open(index_path).read()
+    assert 'rendered 3 of 3 plots' in capsys.readouterr().out
+
+    # Unchanged data is served from the cache; changed data is re-rendered
+    generate_eda_report(df, str(tmp_path), plots=plots, n_jobs=2)
+    assert 'rendered 0 of 3 plots' in capsys.readouterr().out
+    df.loc[0, 'Amount'] = 1.0
+    generate_eda_report(df, str(tmp_path), plots=plots, n_jobs=2)
+    assert 'rendered 3 of 3 plots' in capsys.readouterr().out
+
+
+def test_hash_dataframe(sample_data):
+    df = sample_data
+    assert hash_dataframe(df) == hash_dataframe(df.copy())
+    assert hash_dataframe(df) != hash_dataframe(df.assign(Amount=df['Amount'] + 1))
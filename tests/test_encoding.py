@@ -0,0 +1,56 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from encoding import CategoricalEncoder, to_csr, UNKNOWN_CATEGORY
+
+
+@pytest.fixture
+def categories(sample_data):
+    """The categorical columns of the sample transactions, plus a row without a ProductCategory."""
+    missing = pd.DataFrame({'ProductCategory': [None], 'ChannelId': ['ChannelId_1'], 'Amount': [0.0]})
+    return pd.concat([sample_data[['ProductCategory', 'ChannelId', 'Amount']], missing], ignore_index=True)
+
+
+def test_encoder_vocabulary_and_unknown_bucket(categories, tmp_path):
+    """Vocabularies are sorted with a reserved last bucket for unseen and missing values."""
+    df = categories
+    encoder = CategoricalEncoder(['ProductCategory', 'ChannelId']).fit(df)
+    assert encoder.vocabularies_['ProductCategory'] == ['airtime', 'financial_services', UNKNOWN_CATEGORY]
+
+    new_df = pd.DataFrame({'ProductCategory': ['utility_bill', 'airtime'], 'ChannelId': ['ChannelId_2', 'ChannelId_9']})
+    assert list(encoder.codes(new_df, 'ProductCategory')) == [2, 0]
+    assert list(encoder.codes(df, 'ProductCategory')) == [0, 1, 0, 2]
+
+    encoder.save(str(tmp_path / 'encoder.json'))
+    restored = CategoricalEncoder.load(str(tmp_path / 'encoder.json'))
+    assert list(restored.codes(new_df, 'ChannelId')) == list(encoder.codes(new_df, 'ChannelId'))
+
+
+def test_one_hot_matches_get_dummies(categories):
+    """The sparse one-hot matrix holds the same values as dense dummies."""
+    df = categories.dropna()
+    encoder = CategoricalEncoder(['ProductCategory', 'ChannelId']).fit(df)
+    matrix, feature_names = encoder.one_hot(df)
+
+    dummies = pd.get_dummies(df[['ProductCategory', 'ChannelId']]).astype(float)
+    dense = pd.DataFrame(matrix.toarray(), columns=feature_names, index=df.index)
+    assert matrix.format == 'csr'
+    assert matrix.nnz == 2 * len(df)
+    pd.testing.assert_frame_equal(dense[dummies.columns], dummies)
+    assert (dense['ChannelId_<unknown>'] == 0).all()
+
+
+def test_to_csr(categories):
+    """Numeric columns are kept and categorical columns are expanded from their codes."""
+    df = categories
+    encoded = CategoricalEncoder(['ProductCategory', 'ChannelId']).fit(df).transform(df)
+    matrix, feature_names = to_csr(encoded)
+
+    assert feature_names[0] == 'Amount'
+    assert matrix.shape == (4, 1 + 3 + 4)
+    np.testing.assert_array_equal(matrix[:, 0].toarray().ravel(), df['Amount'].to_numpy())
+    assert matrix[3, feature_names.index('ProductCategory_<unknown>')] == 1
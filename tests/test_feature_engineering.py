@@ -10,39 +10,19 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'
 
 from feature_engineering import (
     create_aggregate_features,
+    create_aggregate_features_from_chunks,
     extract_transaction_time_features,
     merge_aggregate_and_time_features,
     reorder_columns,
     encode_features,
+    fit_feature_encoder,
     handle_missing_values,
-    normalize_features
+    normalize_features,
+    impute_and_scale,
+    fit_serving_preprocessor,
+    SERVING_FEATURE_COLUMNS
 )
 
-# Sample data for testing (simulating CSV data without reading a file)
-@pytest.fixture
-def sample_data():
-    data = {
-        "TransactionId": ["TransactionId_76871", "TransactionId_73770", "TransactionId_26203"],
-        "BatchId": ["BatchId_36123", "BatchId_15642", "BatchId_53941"],
-        "AccountId": ["AccountId_3957", "AccountId_4841", "AccountId_4229"],
-        "SubscriptionId": ["SubscriptionId_887", "SubscriptionId_3829", "SubscriptionId_222"],
-        "CustomerId": [4406, 4406, 4683],
-        "CurrencyCode": ["UGX", "UGX", "UGX"],
-        "CountryCode": [256, 256, 256],
-        "ProviderId": ["ProviderId_6", "ProviderId_4", "ProviderId_6"],
-        "ProductId": [10, 6, 1],
-        "ProductCategory": ["airtime", "financial_services", "airtime"],
-        "ChannelId": ["ChannelId_3", "ChannelId_2", "ChannelId_3"],
-        "Amount": [1000.0, -20.0, 500.0],
-        "Value": [1000, 20, 500],
-        "TransactionStartTime": ["2018-11-15T02:18:49Z", "2018-11-15T02:19:08Z", "2018-11-15T02:44:21Z"],
-        "PricingStrategy": ["2", "2", "2"],
-        "FraudResult": [0, 0, 0]
-    }
-
-    df = pd.DataFrame(data)
-    return df
-
 
 def test_create_aggregate_features(sample_data):
     """Test aggregate feature creation."""
@@ -52,11 +32,21 @@ def test_create_aggregate_features(sample_data):
     assert aggregate_features['Total_Transaction_Amount'].sum() == 1480.0  # Sum of all Amounts
 
 
+def test_create_aggregate_features_from_chunks(sample_data):
+    """Test that chunked aggregation with partial merging matches the in-memory groupby."""
+    chunks = [sample_data.iloc[[i]] for i in range(len(sample_data))]  # One row per chunk forces merges
+    expected = create_aggregate_features(sample_data)
+    actual = create_aggregate_features_from_chunks(chunks)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
 def test_extract_transaction_time_features(sample_data):
     """Test time-based feature extraction."""
     df_with_time_features = extract_transaction_time_features(sample_data)
     assert 'Transaction_Hour' in df_with_time_features.columns
     assert df_with_time_features['Transaction_Hour'].iloc[0] == 2  # Check the hour for first transaction
+    assert 'Transaction_Weekday' not in df_with_time_features.columns
+    assert 'Transaction_Weekday' in extract_transaction_time_features(sample_data.copy(), weekday=True).columns
 
 
 def test_merge_aggregate_and_time_features(sample_data):
@@ -77,11 +67,18 @@ def test_reorder_columns(sample_data):
     assert reordered_df.columns[-1] == 'FraudResult'  # FraudResult should be the last column
 
 
-# def test_encode_features(sample_data):
-#     """Test One-Hot and Label Encoding."""
-#     encoded_df = encode_features(sample_data)
-#     print(encoded_df.columns)  # Debug: Print column names to understand what's happening
-#     assert any('ProductCategory_airtime' in col for col in encoded_df.columns)  # Flexible check
+def test_encode_features(sample_data):
+    """Test categorical and label encoding with a reusable fitted encoder."""
+    encoded_df = encode_features(sample_data)
+    assert isinstance(encoded_df['ProductCategory'].dtype, pd.CategoricalDtype)
+    assert list(encoded_df['ProviderId']) == [1, 0, 1]  # Same codes as LabelEncoder
+
+    encoder = fit_feature_encoder(sample_data)
+    new_data = sample_data.copy()
+    new_data.loc[0, 'ProductCategory'] = 'movies'  # Not seen during fit
+    encoded_new = encode_features(new_data, encoder)
+    assert encoded_new.loc[0, 'ProductCategory'] == '<unknown>'
+    assert encoded_new.loc[1, 'ProductCategory'] == 'financial_services'
 
 
 def test_handle_missing_values(sample_data):
@@ -98,3 +95,29 @@ def test_normalize_features(sample_data):
     final_df = handle_missing_values(final_df)
     normalized_df = normalize_features(final_df)
     assert normalized_df['Total_Transaction_Amount'].max() == approx(1.0, rel=1e-9)  # Handle floating-point comparison
+
+
+def test_impute_and_scale(sample_data):
+    """Test fused imputation and scaling, and reuse of the fitted parameters."""
+    sample_data.loc[0, 'Amount'] = None
+    sample_data.loc[1, 'ChannelId'] = None
+    final_df, params = impute_and_scale(sample_data.copy())
+
+    assert params['medians']['Amount'] == approx(240.0)
+    assert params['min_max']['Amount'] == [-20.0, 500.0]
+    assert final_df['Amount'].dtype == 'float32'
+    assert list(final_df['Amount']) == approx([260 / 520, 0.0, 1.0])
+    assert final_df['ChannelId'].isna().sum() == 0
+
+    # New data is filled and scaled with the fitted parameters
+    new_df, _ = impute_and_scale(sample_data.copy(), params)
+    assert list(new_df['Amount']) == approx(list(final_df['Amount']))
+
+
+def test_fit_serving_preprocessor(sample_data):
+    """Test fitting the serving preprocessor parameters."""
+    preprocessor = fit_serving_preprocessor(sample_data)
+    assert preprocessor['feature_columns'] == SERVING_FEATURE_COLUMNS
+    assert preprocessor['pricing_strategy_classes'] == ['2']
+    assert preprocessor['min_max']['Amount'] == [-20.0, 1000.0]
+    assert 'Transaction_Hour' not in sample_data.columns  # Input left untouched
@@ -0,0 +1,125 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pytest import approx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from feature_store import CustomerFeatureStore
+from feature_engineering import create_aggregate_features
+
+
+@pytest.fixture
+def transactions(make_transactions):
+    """200 transactions of 4 customers, with the columns the store reads."""
+    return make_transactions(n=200, n_customers=4)[['TransactionId', 'CustomerId', 'Amount']]
+
+
+def test_incremental_updates_match_full_groupby(transactions):
+    """Folding transactions in several batches gives the same aggregates as one groupby."""
+    df = transactions
+    store = CustomerFeatureStore()
+    for start in range(0, len(df), 30):
+        store.ingest(df.iloc[start:start + 30])
+
+    expected = create_aggregate_features(df).set_index('CustomerId').sort_index()
+    actual = store.lookup(df['CustomerId']).set_index('CustomerId').sort_index()
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_lookup_order_and_unknown_customers():
+    """Lookups keep the order of first appearance and return NaN for customers without history."""
+    store = CustomerFeatureStore()
+    store.ingest(pd.DataFrame({'TransactionId': [1, 2, 3], 'CustomerId': [7, 7, 8], 'Amount': [10.0, 30.0, 5.0]}))
+
+    aggregates = store.lookup([8, 9, 7, 8])
+    assert aggregates['CustomerId'].tolist() == [8, 9, 7]
+    assert aggregates['Total_Transaction_Amount'].tolist()[::2] == [5.0, 40.0]
+    assert np.isnan(aggregates['Transaction_Count'].iloc[1])
+    assert np.isnan(aggregates['Std_Deviation_Transaction_Amount'].iloc[0])  # Single transaction
+    assert aggregates['Std_Deviation_Transaction_Amount'].iloc[2] == approx(np.std([10.0, 30.0], ddof=1))
+
+
+def test_store_persists_to_disk(tmp_path):
+    """Aggregates survive reopening the SQLite file."""
+    path = str(tmp_path / 'customer_features.db')
+    store = CustomerFeatureStore(path)
+    store.ingest(pd.DataFrame({'TransactionId': [1], 'CustomerId': ['a'], 'Amount': [3.0]}))
+    store.close()
+
+    reopened = CustomerFeatureStore(path)
+    reopened.ingest(pd.DataFrame({'TransactionId': [2], 'CustomerId': ['a'], 'Amount': [5.0]}))
+    aggregates = reopened.lookup(['a'])
+    assert aggregates['Transaction_Count'].iloc[0] == 2
+    assert aggregates['Average_Transaction_Amount'].iloc[0] == 4.0
+
+    reopened.clear()
+    assert np.isnan(reopened.lookup(['a'])['Transaction_Count'].iloc[0])
+    reopened.close()
+
+
+def test_ingest_counts_each_transaction_once(transactions):
+    """Replaying a batch, or a TransactionId repeated within one, does not change the aggregates."""
+    df = transactions
+    store = CustomerFeatureStore()
+    assert store.ingest(df.iloc[:120]) == 120
+    before = store.lookup(df['CustomerId'])
+
+    assert store.ingest(pd.concat([df.iloc[:120], df.iloc[:10]])) == 0
+    pd.testing.assert_frame_equal(store.lookup(df['CustomerId']), before)
+
+    assert store.ingest(pd.concat([df.iloc[100:], df.iloc[150:]])) == 80
+    expected = create_aggregate_features(df).set_index('CustomerId').sort_index()
+    actual = store.lookup(df['CustomerId']).set_index('CustomerId').sort_index()
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_lookup_pending_is_read_only_and_idempotent(transactions):
+    """Pending lookups fold in the unseen transactions without writing, before and after ingestion alike."""
+    df = transactions
+    store = CustomerFeatureStore()
+    store.ingest(df.iloc[:150])
+    request_df = df.iloc[140:]
+
+    pending = store.lookup_pending(request_df)
+    pd.testing.assert_frame_equal(store.lookup_pending(request_df), pending)
+    assert store.lookup(['CustomerId_1'])['Transaction_Count'].iloc[0] == (df.iloc[:150]['CustomerId'] == 'CustomerId_1').sum()
+
+    store.ingest(request_df)
+    pd.testing.assert_frame_equal(store.lookup_pending(request_df), pending)
+    pd.testing.assert_frame_equal(store.lookup(request_df['CustomerId']), pending)
+
+
+def test_lookup_pending_per_request(transactions):
+    """Each request of a micro-batch only sees its own pending transactions."""
+    df = transactions
+    store = CustomerFeatureStore()
+    store.ingest(df.iloc[:100])
+    requests = [df.iloc[100:150], df.iloc[150:]]
+
+    batched = store.lookup_pending(pd.concat(requests), request_ids=np.repeat([0, 1], [50, 50]))
+    for request_id, request_df in enumerate(requests):
+        alone = store.lookup_pending(request_df)
+        per_request = batched[batched['RequestId'] == request_id].drop(columns='RequestId').reset_index(drop=True)
+        pd.testing.assert_frame_equal(per_request, alone)
+
+
+def test_concurrent_ingest_and_lookups(tmp_path, make_transactions):
+    """Threads sharing one store can ingest and look up at the same time."""
+    from concurrent.futures import ThreadPoolExecutor
+    df = make_transactions(n=2000, n_customers=4)[['TransactionId', 'CustomerId', 'Amount']]
+    store = CustomerFeatureStore(str(tmp_path / 'customer_features.db'))
+
+    def work(start):
+        store.ingest(df.iloc[start:start + 50])
+        return store.lookup_pending(df.iloc[start:start + 50])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(0, len(df), 50)))
+
+    expected = create_aggregate_features(df).set_index('CustomerId').sort_index()
+    actual = store.lookup(df['CustomerId']).set_index('CustomerId').sort_index()
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    store.close()
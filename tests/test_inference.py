@@ -0,0 +1,47 @@
+import os
+import sys
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from inference import load_backend, SklearnBackend, InplaceBackend
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), '../app/xgb_model.pkl')
+
+
+@pytest.fixture(scope='module')
+def model():
+    with open(MODEL_PATH, 'rb') as f:
+        return pickle.load(f)
+
+
+@pytest.fixture
+def features(model):
+    """500 rows of random values for the model's features."""
+    feature_names = model.get_booster().feature_names
+    return pd.DataFrame(np.random.default_rng(0).random((500, len(feature_names))), columns=feature_names)
+
+
+def test_inplace_backend_matches_predict_proba(model, features):
+    """The inplace_predict path gives the same probabilities and labels as the sklearn wrapper."""
+    X = features
+    expected = model.predict_proba(X)[:, 1]
+
+    backend = load_backend(model, 'inplace')
+    np.testing.assert_allclose(backend.predict_proba(X), expected, rtol=1e-6)
+    assert np.array_equal(backend.predict(X), model.predict(X))
+
+    # Columns are put in the model's feature order, and single rows work
+    np.testing.assert_allclose(backend.predict_proba(X[X.columns[::-1]]), expected, rtol=1e-6)
+    np.testing.assert_allclose(backend.predict_proba(X.iloc[:1]), expected[:1], rtol=1e-6)
+
+
+def test_load_backend_configuration(model, monkeypatch):
+    monkeypatch.setenv('INFERENCE_BACKEND', 'sklearn')
+    assert type(load_backend(model)) is SklearnBackend
+    monkeypatch.delenv('INFERENCE_BACKEND')
+    assert isinstance(load_backend(model), InplaceBackend)
+    with pytest.raises(ValueError):
+        load_backend(model, 'onnx')
@@ -31,3 +31,87 @@ def test_load_data():
         # Remove the test CSV file after the test
         if os.path.exists(test_filepath):
             os.remove(test_filepath)
+
+def test_load_data_in_chunks(tmp_path):
+    from src.load_data import load_data_in_chunks
+
+    test_df = pd.DataFrame({
+        'TransactionId': ['TransactionId_1', 'TransactionId_2', 'TransactionId_3'],
+        'CustomerId': ['CustomerId_4406', 'CustomerId_4406', 'CustomerId_988'],
+        'ProviderId': ['ProviderId_6', 'ProviderId_4', 'ProviderId_6'],
+        'ChannelId': ['ChannelId_3', 'ChannelId_2', 'ChannelId_3'],
+        'ProductCategory': ['airtime', 'financial_services', 'airtime'],
+        'Amount': [1000.0, -20.0, 500.0],
+        'FraudResult': [0, 0, 1]
+    })
+    test_filepath = tmp_path / 'test_data.csv'
+    test_df.to_csv(test_filepath, index=False)
+
+    chunks = list(load_data_in_chunks(test_filepath, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    first = chunks[0]
+    assert first['TransactionId'].dtype == 'int32'
+    assert first['CustomerId'].tolist() == [4406, 4406]
+    assert all(isinstance(first[col].dtype, pd.CategoricalDtype) for col in ['ProviderId', 'ChannelId', 'ProductCategory'])
+    assert first['Amount'].dtype == 'float32'
+    assert first['FraudResult'].dtype == 'int8'
+
+def test_load_data_cached(tmp_path):
+    from src.load_data import load_data_cached
+
+    test_df = pd.DataFrame({
+        'TransactionId': ['TransactionId_1', 'TransactionId_2', 'TransactionId_3'],
+        'CustomerId': ['CustomerId_4406', 'CustomerId_4406', 'CustomerId_988'],
+        'Amount': [1000.0, -20.0, 500.0],
+        'TransactionStartTime': ['2018-11-15T02:18:49Z', '2018-12-01T10:00:00Z', '2018-12-15T02:44:21Z']
+    })
+    test_filepath = tmp_path / 'data.csv'
+    cache_dir = tmp_path / 'cache'
+    test_df.to_csv(test_filepath, index=False)
+
+    # Cold load builds the cache, partitioned by month
+    cold = load_data_cached(test_filepath, cache_dir=cache_dir)
+    assert sorted(p.name for p in cache_dir.iterdir() if p.is_dir()) == ['TransactionMonth=2018-11', 'TransactionMonth=2018-12']
+    assert pd.api.types.is_datetime64_any_dtype(cold['TransactionStartTime'])
+    assert sorted(cold['TransactionId'].tolist()) == [1, 2, 3]
+
+    # Warm load with column projection and partition pruning
+    warm = load_data_cached(test_filepath, cache_dir=cache_dir, columns=['CustomerId', 'Amount'], months=['2018-12'])
+    assert list(warm.columns) == ['CustomerId', 'Amount']
+    assert sorted(warm['Amount'].tolist()) == [-20.0, 500.0]
+
+    # Changing the CSV content rebuilds the cache
+    test_df.loc[0, 'Amount'] = 1.0
+    test_df.to_csv(test_filepath, index=False)
+    rebuilt = load_data_cached(test_filepath, cache_dir=cache_dir, columns=['Amount'])
+    assert sorted(rebuilt['Amount'].tolist()) == [-20.0, 1.0, 500.0]
+
+    # Non-compact cache keeps the load_data dtypes
+    plain = load_data_cached(test_filepath, cache_dir=cache_dir, compact=False)
+    assert list(plain.columns) == list(test_df.columns)
+    pd.testing.assert_frame_equal(plain.drop(columns='TransactionStartTime'),
+                                  test_df.drop(columns='TransactionStartTime'))
+    assert sorted(plain['TransactionId'].tolist()) == ['TransactionId_1', 'TransactionId_2', 'TransactionId_3']
+    assert plain['Amount'].dtype == 'float64'
+
+def test_load_data_cached_keeps_csv_order(tmp_path):
+    from src.load_data import load_data_cached, load_data
+
+    # Months interleaved, so the month partitions cannot come back in CSV order
+    months = ['2019-01', '2018-11', '2018-12']
+    test_df = pd.DataFrame({
+        'TransactionId': [f'TransactionId_{i}' for i in range(30)],
+        'CustomerId': [f'CustomerId_{i % 4}' for i in range(30)],
+        'Amount': [float(i) for i in range(30)],
+        'TransactionStartTime': [f'{months[i % 3]}-{1 + i % 28:02d}T00:00:00Z' for i in range(30)],
+    })
+    test_filepath = tmp_path / 'data.csv'
+    test_df.to_csv(test_filepath, index=False)
+
+    cached = load_data_cached(test_filepath, cache_dir=tmp_path / 'cache', compact=False)
+    expected = load_data(test_filepath)
+    pd.testing.assert_frame_equal(cached.drop(columns='TransactionStartTime'), expected.drop(columns='TransactionStartTime'))
+
+    projected = load_data_cached(test_filepath, cache_dir=tmp_path / 'cache', columns=['Amount'], months=['2018-12'], compact=False)
+    assert projected['Amount'].tolist() == [float(i) for i in range(2, 30, 3)]
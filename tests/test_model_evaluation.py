@@ -1,13 +1,71 @@
 import os
 import sys
+import numpy as np
 import pytest
 import unittest
 from pytest import approx
+from sklearn.metrics import roc_auc_score, roc_curve, average_precision_score, brier_score_loss, confusion_matrix
 
 #append the relative path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from model_evaluation import evaluate_model
+from model_evaluation import evaluate_model, evaluate_scores, bootstrap_metrics
 
-def test_evaluate_model():
-    pass  
+
+@pytest.fixture
+def make_scores():
+    """Factory of n binary labels and scores that rank them imperfectly, optionally rounded to create ties."""
+    def make(n=2000, decimals=None, seed=0):
+        rng = np.random.default_rng(seed)
+        y = rng.integers(0, 2, n)
+        scores = np.clip(0.3 * y + 0.7 * rng.random(n), 0, 1)
+        return y, scores.round(decimals) if decimals is not None else scores
+    return make
+
+
+@pytest.mark.parametrize('decimals', [None, 1])
+def test_evaluate_scores_matches_sklearn(decimals, make_scores):
+    """The one-pass metrics agree with scikit-learn, with and without tied scores."""
+    y, scores = make_scores(decimals=decimals)
+    result = evaluate_scores(y, scores)
+
+    fpr, tpr, thresholds = roc_curve(y, scores)
+    assert result['auc'] == approx(roc_auc_score(y, scores))
+    assert result['gini'] == approx(2 * roc_auc_score(y, scores) - 1)
+    assert result['ks'] == approx(np.max(tpr - fpr))
+    assert result['ks_threshold'] == thresholds[np.argmax(tpr - fpr)]
+    assert result['pr_auc'] == approx(average_precision_score(y, scores))
+    assert result['brier'] == approx(brier_score_loss(y, scores))
+    np.testing.assert_array_equal(result['confusion_matrix'], confusion_matrix(y, (scores >= 0.5).astype(int)))
+
+
+def test_threshold_grid_confusion_matrices(make_scores):
+    y, scores = make_scores()
+    table = evaluate_scores(y, scores)['thresholds']
+    assert len(table) == 101
+    for _, row in table.iloc[::10].iterrows():
+        (tn, fp), (fn, tp) = confusion_matrix(y, (scores >= row['threshold']).astype(int), labels=[0, 1])
+        assert (row['tn'], row['fp'], row['fn'], row['tp']) == (tn, fp, fn, tp)
+
+
+def test_single_class_has_undefined_ranking_metrics():
+    result = evaluate_scores([1, 1, 1], [0.2, 0.3, 0.9])
+    assert np.isnan(result['auc']) and np.isnan(result['ks'])
+    assert result['recall'] == approx(1 / 3)
+
+
+def test_bootstrap_metrics_brackets_estimate(make_scores):
+    """Blocked resampling gives the same intervals as one block, around the point estimate."""
+    y, scores = make_scores(n=500)
+    intervals = bootstrap_metrics(y, scores, n_resamples=200)
+    assert list(intervals['metric']) == ['auc', 'gini', 'ks', 'pr_auc', 'brier']
+    assert ((intervals['lower'] <= intervals['estimate']) & (intervals['estimate'] <= intervals['upper'])).all()
+
+    blocked = bootstrap_metrics(y, scores, n_resamples=200, block_size=500 * 7)
+    assert blocked[['lower', 'upper']].to_numpy() == approx(intervals[['lower', 'upper']].to_numpy())
+
+
+def test_evaluate_model(make_scores):
+    y, scores = make_scores(n=100)
+    result = evaluate_model(y, scores, "Test Model")
+    assert result['auc'] == approx(roc_auc_score(y, scores))
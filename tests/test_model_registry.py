@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from model_registry import ModelRegistry, load_registered_model
+
+
+def fitted_model():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.random((200, 3)), columns=['Amount', 'Value', 'Recency'])
+    y = (X['Amount'] > 0.5).astype(int)
+    return xgb.XGBClassifier(n_estimators=5, max_depth=2).fit(X, y), X
+
+
+@pytest.mark.parametrize('model_format', ['ubj', 'json'])
+def test_register_and_load_round_trip(tmp_path, model_format):
+    """A registered model loads back with the same schema and probabilities."""
+    model, X = fitted_model()
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.register(model, model_format=model_format) == '1'
+    assert registry.register(model, model_format=model_format) == '2'
+
+    manifest = registry.read_manifest()
+    assert manifest['current'] == '2'
+    assert manifest['versions']['1']['feature_names'] == ['Amount', 'Value', 'Recency']
+    assert manifest['versions']['1']['file'].endswith('.' + model_format)
+
+    loaded = ModelRegistry(str(tmp_path)).load('1')
+    np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+
+
+def test_load_is_cached(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.register(fitted_model()[0])
+    assert registry.load() is registry.load('1')
+
+
+def test_load_rejects_tampered_file(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.register(fitted_model()[0], model_format='json')
+    path = os.path.join(str(tmp_path), registry.read_manifest()['versions']['1']['file'])
+    with open(path, 'a') as f:
+        f.write(' ')
+    with pytest.raises(ValueError, match='Checksum mismatch'):
+        registry.load()
+
+
+def test_load_unknown_version(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    registry.register(fitted_model()[0])
+    with pytest.raises(ValueError, match='not registered'):
+        registry.load('7')
+
+
+def test_app_registry_has_serving_schema():
+    """The shipped registry model expects the columns the app preprocessing produces."""
+    with open(os.path.join(os.path.dirname(__file__), '../app/models/manifest.json')) as f:
+        manifest = json.load(f)
+    model = load_registered_model()
+    assert model.get_booster().feature_names == manifest['versions'][manifest['current']]['feature_names']
@@ -1,8 +1,13 @@
 import os 
 import sys
+import pickle
+import joblib
 import pytest
 import unittest
+import numpy as np
+import pandas as pd
 from pytest import approx
+from sklearn.linear_model import SGDClassifier
 #append the relative path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
@@ -11,7 +16,16 @@ from modeling import (
     train_and_evaluate_random_forest,
     train_and_evaluate_xgboost,
     train_and_evaluate_adaboost,
-    train_and_evaluate_decision_tree
+    train_and_evaluate_decision_tree,
+    allocate_cores,
+    train_models_in_parallel,
+    save_training_chunks,
+    train_xgboost_external_memory,
+    record_lineage,
+    load_lineage,
+    refresh_models,
+    ESTIMATORS,
+    MODEL_FILES
 )
 
 def test_train_and_evaluate_logistic_regression():
@@ -28,3 +42,97 @@ def test_train_and_evaluate_adaboost():
 
 def test_train_and_evaluate_decision_tree():
     pass  
+
+def test_trainers_use_the_shared_estimators(tmp_path):
+    """The trainers fit the same models that cross-validation and tuning build from ESTIMATORS."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(100, 3)), columns=['a', 'b', 'c'])
+    y = pd.Series((X['a'] > 0).astype(int))
+    model = train_and_evaluate_xgboost(X[:80], X[80:], y[:80], y[80:], n_jobs=1, model_dir=str(tmp_path))
+    assert model.get_params() == ESTIMATORS['XGBoost'](1).get_params()
+
+def test_allocate_cores():
+    allocation = allocate_cores(['Logistic Regression', 'Random Forest', 'XGBoost', 'AdaBoost', 'Decision Tree'], n_cores=8)
+    assert allocation == {'Logistic Regression': 1, 'Random Forest': 3, 'XGBoost': 2, 'AdaBoost': 1, 'Decision Tree': 1}
+    assert allocate_cores(['Random Forest', 'XGBoost'], n_cores=1) == {'Random Forest': 1, 'XGBoost': 1}
+
+def test_train_models_in_parallel(tmp_path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 4)), columns=['a', 'b', 'c', 'd'])
+    y = pd.Series((X['a'] + X['b'] > 0).astype(int))
+
+    leaderboard = train_models_in_parallel(X[:150], X[150:], y[:150], y[150:],
+                                           model_names=['Logistic Regression', 'XGBoost'], n_cores=2, model_dir=str(tmp_path))
+
+    assert set(leaderboard['Model']) == {'Logistic Regression', 'XGBoost'}
+    assert {'Wall Time (s)', 'Peak Memory (MB)', 'Test Accuracy', 'Cores'} <= set(leaderboard.columns)
+    assert leaderboard['Test Accuracy'].is_monotonic_decreasing
+    assert (leaderboard['Peak Memory (MB)'] > 0).all()
+    assert (tmp_path / 'xgboost_model.pkl').exists()
+
+def test_train_models_in_parallel_sparse(tmp_path):
+    """Categorical features are shared as a sparse matrix and every model still trains."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 2)), columns=['a', 'b'])
+    X['Channel'] = pd.Categorical(rng.choice(['ChannelId_1', 'ChannelId_2', 'ChannelId_3'], size=200))
+    y = pd.Series((X['a'] + (X['Channel'] == 'ChannelId_1') > 0.5).astype(int))
+
+    leaderboard = train_models_in_parallel(X[:150], X[150:], y[:150], y[150:],
+                                           model_names=['Logistic Regression', 'XGBoost', 'Decision Tree'],
+                                           n_cores=2, model_dir=str(tmp_path))
+
+    assert set(leaderboard['Model']) == {'Logistic Regression', 'XGBoost', 'Decision Tree'}
+    assert (leaderboard['Test Accuracy'] > 0.5).all()
+
+def test_train_xgboost_external_memory(tmp_path):
+    """Training streams Parquet chunks and the pickled model loads like the app's xgb_model.pkl."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(3000, 4)), columns=['Amount', 'Value', 'Transaction_Hour', 'Recency'])
+    y = (X['Amount'] - X['Recency'] > 0).astype(int)
+
+    train_paths = save_training_chunks(X[:2400], y[:2400], str(tmp_path / 'train'), chunk_rows=500)
+    test_paths = save_training_chunks(X[2400:], y[2400:], str(tmp_path / 'test'), chunk_rows=500)
+    assert len(train_paths) == 5
+
+    model = train_xgboost_external_memory(train_paths, test_paths, n_estimators=20, model_dir=str(tmp_path))
+    with open(tmp_path / 'xgboost_model.pkl', 'rb') as f:
+        loaded = pickle.load(f)
+
+    probabilities = loaded.predict_proba(X[2400:])[:, 1]
+    assert np.allclose(probabilities, model.predict_proba(X[2400:])[:, 1])
+    assert np.mean((probabilities > 0.5) == y[2400:]) > 0.9
+
+def test_refresh_models(tmp_path):
+    """Refresh warm-starts the saved models on rows after the checkpoint and records lineage."""
+    rng = np.random.default_rng(0)
+    n = 600
+    final_df = pd.DataFrame(rng.normal(size=(n, 3)), columns=['a', 'b', 'c'])
+    final_df['TransactionStartTime'] = pd.date_range('2018-11-15', periods=n, freq='h', tz='UTC')
+    final_df['Risk_Label'] = (final_df['a'] + final_df['b'] > 0).astype(int)
+    features = ['a', 'b', 'c']
+
+    history = final_df.iloc[:400]
+    X, y = history[features], history['Risk_Label']
+    names = ['Logistic Regression', 'Random Forest', 'XGBoost']
+    for name in names:
+        train_models_in_parallel(X[:300], X[300:], y[:300], y[300:], model_names=[name], n_cores=1, model_dir=str(tmp_path))
+        record_lineage(str(tmp_path), name, 'full', len(history), history['TransactionStartTime'].min(),
+                       history['TransactionStartTime'].max(), features)
+    n_trees = joblib.load(tmp_path / MODEL_FILES['XGBoost']).get_booster().num_boosted_rounds()
+
+    summary = refresh_models(final_df, model_names=names, model_dir=str(tmp_path))
+    assert list(summary['New Rows']) == [200, 200, 200]
+
+    assert isinstance(joblib.load(tmp_path / MODEL_FILES['Logistic Regression']), SGDClassifier)
+    assert joblib.load(tmp_path / MODEL_FILES['Random Forest']).n_estimators == 120
+    assert joblib.load(tmp_path / MODEL_FILES['XGBoost']).get_booster().num_boosted_rounds() == n_trees + 20
+
+    lineage = load_lineage(str(tmp_path))
+    assert [entry['version'] for entry in lineage['XGBoost']] == [1, 2]
+    assert lineage['XGBoost'][1]['parent_version'] == 1
+    assert lineage['XGBoost'][1]['mode'] == 'incremental'
+    assert pd.Timestamp(lineage['XGBoost'][1]['data_end']) == final_df['TransactionStartTime'].max()
+
+    # Nothing newer than the checkpoint: models are left as they are
+    assert refresh_models(final_df, model_names=names, model_dir=str(tmp_path)).empty
+    assert load_lineage(str(tmp_path))['Random Forest'][-1]['version'] == 2
@@ -0,0 +1,107 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from pytest import approx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from profiling import TDigest, DataProfile, profile_chunks, profile_csv, diff_profiles
+
+
+@pytest.fixture
+def profiled_df(make_transactions):
+    """20,000 transactions with a numeric, a discrete and a categorical column; 200 Amounts are missing."""
+    df = make_transactions(n=20_000)[['Amount', 'PricingStrategy', 'ProductCategory']].copy()
+    df.loc[df.index[:200], 'Amount'] = np.nan
+    return df
+
+
+def test_tdigest_quantiles():
+    """Quantiles stay close to the exact ones, with far fewer centroids than values."""
+    values = np.random.default_rng(1).normal(size=100_000)
+    digest = TDigest(compression=200)
+    for chunk in np.split(values, 10):
+        digest.update(chunk)
+    assert len(digest.means) <= 250
+    quantiles = [0.01, 0.5, 0.99]
+    assert digest.quantile(quantiles) == approx(np.quantile(values, quantiles), abs=0.02)
+
+    restored = TDigest.from_dict(json.loads(json.dumps(digest.to_dict())))
+    assert restored.quantile(0.5) == approx(digest.quantile(0.5))
+
+
+def test_profile_matches_full_scan(profiled_df):
+    """Chunked moments and null counts equal the in-memory statistics."""
+    df = profiled_df
+    profile = profile_chunks(df.iloc[start:start + 3_000] for start in range(0, len(df), 3_000)).to_dict()
+
+    assert profile['n_rows'] == len(df)
+    amount = profile['columns']['Amount']
+    assert amount['kind'] == 'numeric'
+    assert amount['null_count'] == 200
+    assert amount['mean'] == approx(df['Amount'].mean())
+    assert amount['std'] == approx(df['Amount'].std())
+    assert amount['min'] == approx(df['Amount'].min())
+    assert amount['max'] == approx(df['Amount'].max())
+    assert amount['quantiles']['0.5'] == approx(df['Amount'].median(), rel=0.02)
+
+    category = profile['columns']['ProductCategory']
+    assert category['kind'] == 'categorical'
+    assert category['top_counts'] == df['ProductCategory'].value_counts().to_dict()
+    assert category['count_error'] == 0
+
+
+def test_heavy_hitters_bound_a_repeatedly_evicted_value():
+    """A value evicted in several chunks is still reported within count_error of its true count."""
+    chunks = [['A', 'B', 'B']] + [['A']] * 5 + [['A'] * 10]
+    profile = DataProfile(top_k=1)
+    for chunk in chunks:
+        profile.update(pd.DataFrame({'Value': chunk}))
+    summary = profile.to_dict()['columns']['Value']
+    assert 16 <= summary['top_counts']['A'] <= 16 + summary['count_error']
+
+    # Alternating values evict each other in every chunk
+    rng = np.random.default_rng(0)
+    values = rng.choice(['A', 'B', 'C', 'D'], size=2_000, p=[0.4, 0.3, 0.2, 0.1])
+    profile = DataProfile(top_k=2)
+    for start in range(0, len(values), 7):
+        profile.update(pd.DataFrame({'Value': values[start:start + 7]}))
+    summary = profile.to_dict()['columns']['Value']
+    true_counts = pd.Series(values).value_counts()
+    for value, true_count in true_counts.items():
+        reported = summary['top_counts'].get(value)
+        if reported is None:
+            assert true_count <= summary['count_error']
+        else:
+            assert true_count <= reported <= true_count + summary['count_error']
+
+
+def test_heavy_hitters_are_bounded():
+    """Only top_k counters are kept and count_error bounds the overcount."""
+    df = pd.DataFrame({'CustomerId': [f'CustomerId_{i}' for i in range(1_000)] + ['CustomerId_0'] * 500})
+    profile = DataProfile(top_k=10)
+    for start in range(0, len(df), 100):
+        profile.update(df.iloc[start:start + 100])
+    summary = profile.to_dict()['columns']['CustomerId']
+
+    assert len(summary['top_counts']) == 10
+    assert next(iter(summary['top_counts'])) == 'CustomerId_0'
+    assert 501 <= summary['top_counts']['CustomerId_0'] <= 501 + summary['count_error']
+
+
+def test_profile_csv_and_diff(tmp_path, profiled_df):
+    """A saved profile can be diffed against a later run."""
+    df = profiled_df
+    csv_path = tmp_path / 'data.csv'
+    df.to_csv(csv_path, index=False)
+    profile_csv(str(csv_path), chunksize=5_000).to_json(str(tmp_path / 'old.json'))
+
+    df['Amount'] = df['Amount'] * 2
+    new_profile = profile_chunks([df]).to_dict()
+    diff = diff_profiles(str(tmp_path / 'old.json'), new_profile).set_index(['column', 'statistic'])
+
+    assert diff.loc[('Amount', 'mean'), 'change'] == approx(df['Amount'].mean() / 2)
+    assert diff.loc[('PricingStrategy', 'mean'), 'change'] == approx(0)
+    assert ('ProductCategory', 'null_rate') in diff.index
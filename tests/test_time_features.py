@@ -0,0 +1,68 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pytest import approx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../app')))
+
+from time_features import parse_timestamps, time_components, add_time_features, civil_from_days, days_from_civil
+
+
+def test_civil_days_round_trip():
+    """Day counts convert to dates and back, matching NumPy's calendar."""
+    days = np.arange(-800_000, 800_000, 997)
+    year, month, day = civil_from_days(days)
+    assert np.array_equal(days_from_civil(year, month, day), days)
+    expected = days.astype('datetime64[D]').astype(str)
+    assert [f'{y:04d}-{m:02d}-{d:02d}' for y, m, d in zip(year[-5:], month[-5:], day[-5:])] == list(expected[-5:])
+
+
+def test_parse_timestamps_matches_pandas():
+    """The fixed-width fast path, the ISO fallback and epoch ints agree with pd.to_datetime."""
+    values = pd.Series(['2018-11-15T02:18:49Z', '2019-02-28T23:59:59Z', '2020-02-29T00:00:00Z'])
+    expected = pd.to_datetime(values)
+    assert (parse_timestamps(values) == expected).all()
+
+    # Not in the fixed layout: falls back to the ISO 8601 parser
+    mixed = pd.Series(['2018-11-15T02:18:49Z', '2018-11-15 02:18:49.500+03:00'])
+    assert parse_timestamps(mixed)[1] == pd.Timestamp('2018-11-14T23:18:49.5Z')
+
+    epochs = pd.Series((expected - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1))
+    assert (parse_timestamps(epochs) == expected).all()
+
+
+def test_parse_timestamps_rejects_invalid_dates():
+    """Days past the end of the month are left to pandas, which rejects them."""
+    assert parse_timestamps(pd.Series(['2020-02-29T00:00:00Z']))[0] == pd.Timestamp('2020-02-29', tz='UTC')
+    for invalid in ['2018-02-30T00:00:00Z', '2019-02-29T00:00:00Z', '2018-04-31T00:00:00Z', '1900-02-29T00:00:00Z']:
+        with pytest.raises(ValueError):
+            pd.to_datetime(pd.Series([invalid]), format='ISO8601', utc=True)
+        with pytest.raises(ValueError):
+            parse_timestamps(pd.Series(['2018-11-15T02:18:49Z', invalid]))
+
+
+def test_time_components():
+    """Components match the .dt accessors, in small integer dtypes, with optional sin/cos."""
+    timestamps = pd.Series(pd.date_range('2018-11-15', periods=500, freq='37h', tz='UTC'))
+    components = time_components(timestamps, cyclical=True)
+
+    assert components['Transaction_Hour'].dtype == np.int8
+    assert components['Transaction_Year'].dtype == np.int16
+    for name, accessor in [('Transaction_Hour', 'hour'), ('Transaction_Day', 'day'), ('Transaction_Month', 'month'),
+                           ('Transaction_Year', 'year'), ('Transaction_Weekday', 'weekday')]:
+        assert np.array_equal(components[name], getattr(timestamps.dt, accessor).to_numpy())
+    assert np.allclose(components['Transaction_Hour_Sin'] ** 2 + components['Transaction_Hour_Cos'] ** 2, 1, atol=1e-6)
+
+    with_missing = time_components(pd.Series([pd.NaT, timestamps[0]]), weekday=False)
+    assert 'Transaction_Weekday' not in with_missing
+    assert np.isnan(with_missing['Transaction_Hour'][0])
+    assert with_missing['Transaction_Hour'][1] == approx(0)
+
+
+def test_add_time_features():
+    df = pd.DataFrame({'TransactionStartTime': ['2018-11-15T02:18:49Z', '2018-11-18T23:00:00Z']})
+    df = add_time_features(df)
+    assert pd.api.types.is_datetime64_any_dtype(df['TransactionStartTime'])
+    assert list(df['Transaction_Hour']) == [2, 23]
+    assert list(df['Transaction_Weekday']) == [3, 6]  # Thursday, Sunday
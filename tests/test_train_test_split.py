@@ -1,29 +1,32 @@
 import os
 import sys
 import unittest
+import numpy as np
 import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-from train_test_split import split_data
+from train_test_split import split_data, NON_FEATURE_COLUMNS
     
 def test_split_data():
-    # Create a sample DataFrame for testing
-    # Note: Use mock data for your actual tests.
-    # df = pd.DataFrame({
-    #     'TransactionId': [1, 2, 3],
-    #     'Risk_Label': [0, 1, 0],
-    #     'RFMS_Score': [1, 2, 3],
-    #     'BatchId': [1, 1, 1],
-    #     'AccountId': [1, 2, 3],
-    #     'SubscriptionId': [1, 2, 3],
-    #     'CustomerId': [1, 2, 3],
-    #     'CountryCode': ['US', 'US', 'US'],
-    #     'ProviderId': [1, 1, 1],
-    #     'ProductId': [1, 2, 3],
-    #     'FraudResult': [0, 1, 0],
-    #     'TransactionStartTime': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'])
-    # })
-    
-    # Call the split_data function with the sample DataFrame
-    # X_train, X_test, y_train, y_test = split_data(df)
-    
-    pass  # Replace with actual assertions after implementing the test
+    n = 20
+    df = pd.DataFrame({
+        'TransactionId': np.arange(n),
+        'Risk_Label': [0, 1] * (n // 2),
+        'RFMS_Score': np.linspace(0, 1, n),
+        'BatchId': 1,
+        'AccountId': np.arange(n),
+        'SubscriptionId': np.arange(n),
+        'CustomerId': np.arange(n) % 4,
+        'CountryCode': 256,
+        'ProviderId': 1,
+        'ProductId': np.arange(n) % 3,
+        'FraudResult': 0,
+        'TransactionStartTime': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'Amount': np.arange(n, dtype='float64'),
+    })
+
+    X_train, X_test, y_train, y_test = split_data(df)
+
+    assert len(NON_FEATURE_COLUMNS) == len(set(NON_FEATURE_COLUMNS))
+    assert list(X_train.columns) == ['Amount']
+    assert (len(X_train), len(X_test)) == (16, 4)
+    assert y_test.sum() == 2
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from tuning import (
+    sample_configs,
+    hyperband_brackets,
+    stratified_order,
+    tune_model,
+    SEARCH_SPACES,
+    TRIALS_FILE,
+    SEARCH_LOG_FILE,
+)
+from modeling import record_lineage, refresh_models, MODEL_FILES
+
+
+def test_sample_configs_is_deterministic():
+    configs = sample_configs(SEARCH_SPACES['XGBoost'], 10, seed=1)
+    assert configs == sample_configs(SEARCH_SPACES['XGBoost'], 10, seed=1)
+    assert len({json.dumps(c, sort_keys=True) for c in configs}) == 10
+    assert len(sample_configs(SEARCH_SPACES['Logistic Regression'], 50)) == 6
+
+
+def test_hyperband_brackets():
+    brackets = hyperband_brackets(2700, 100, eta=3)
+    assert brackets[0] == [(27, 100), (9, 300), (3, 900), (1, 2700)]
+    assert brackets[-1] == [(4, 2700)]
+    assert hyperband_brackets(2700, 100, eta=3, n_configs=9) == [[(9, 100), (3, 300), (1, 900), (1, 2700)]]
+
+
+def test_stratified_order_prefixes_keep_class_balance():
+    y = np.array([0] * 90 + [1] * 10)
+    order = stratified_order(y)
+    assert sorted(order) == list(range(100))
+    assert y[order[:10]].sum() == 1
+    assert y[order[:50]].sum() == 5
+
+
+def test_tune_model_saves_best_and_resumes(tmp_path, make_classification_data):
+    """A second run of the same search is served from the trial cache and picks the same model."""
+    X, y = make_classification_data()
+    model, log = tune_model('XGBoost', X, y, model_dir=str(tmp_path), n_configs=6, min_rows=60, n_cores=1)
+
+    assert (tmp_path / 'xgboost_model.pkl').exists()
+    assert (tmp_path / 'tuning_cache' / TRIALS_FILE).exists()
+    assert not log['Cached'].any()
+    assert log['Rows'].max() == 480
+    assert model.n_estimators < 2000
+    assert model.get_params()['early_stopping_rounds'] is None
+    np.testing.assert_allclose(joblib.load(tmp_path / 'xgboost_model.pkl').predict_proba(X), model.predict_proba(X))
+
+    _, resumed = tune_model('XGBoost', X, y, model_dir=str(tmp_path), n_configs=6, min_rows=60, n_cores=1)
+    assert resumed['Cached'].all()
+    pd.testing.assert_frame_equal(resumed.drop(columns='Cached'), log.drop(columns='Cached'))
+    assert len(pd.read_csv(tmp_path / SEARCH_LOG_FILE)) == 2 * len(log)
+
+
+def test_tune_model_resumes_interrupted_search(tmp_path, make_classification_data):
+    X, y = make_classification_data()
+    _, log = tune_model('Decision Tree', X, y, model_dir=str(tmp_path), n_configs=9, min_rows=60, n_cores=1)
+
+    # Keep only the first trials, as if the search had been stopped there
+    trials_path = tmp_path / 'tuning_cache' / TRIALS_FILE
+    lines = trials_path.read_text().splitlines()
+    trials_path.write_text('\n'.join(lines[:4]) + '\n{"key": "trunc')
+
+    _, resumed = tune_model('Decision Tree', X, y, model_dir=str(tmp_path), n_configs=9, min_rows=60, n_cores=1)
+    assert resumed['Cached'].sum() == 4
+    assert resumed['AUC'].tolist() == log['AUC'].tolist()
+
+    # The trials finished after the truncated line were all recorded
+    assert all(json.loads(line) for line in trials_path.read_text().splitlines())
+    _, again = tune_model('Decision Tree', X, y, model_dir=str(tmp_path), n_configs=9, min_rows=60, n_cores=1)
+    assert again['Cached'].all()
+
+
+def test_tuned_xgboost_can_be_refreshed(tmp_path, make_classification_data):
+    """The saved best XGBoost model is warm-started by refresh_models without a validation set."""
+    X, y = make_classification_data(n=800)
+    final_df = X.assign(TransactionStartTime=pd.date_range('2018-11-15', periods=len(X), freq='h', tz='UTC'), Risk_Label=y)
+    history = final_df.iloc[:600]
+    model, _ = tune_model('XGBoost', history[X.columns], history['Risk_Label'], model_dir=str(tmp_path),
+                          n_configs=3, min_rows=60, n_cores=1)
+    record_lineage(str(tmp_path), 'XGBoost', 'full', len(history), history['TransactionStartTime'].min(),
+                   history['TransactionStartTime'].max(), list(X.columns))
+
+    summary = refresh_models(final_df, model_names=['XGBoost'], model_dir=str(tmp_path))
+    assert list(summary['New Rows']) == [200]
+    refreshed = joblib.load(tmp_path / MODEL_FILES['XGBoost'])
+    assert refreshed.get_booster().num_boosted_rounds() == model.n_estimators + 20
@@ -9,7 +9,12 @@ from woe_binning import (
     calculate_rfms_components, 
     apply_risk_label, 
     bin_rfms_score, 
-    apply_woe_binning, 
+    apply_woe_binning,
+    compute_rfms,
+    build_customer_table,
+    calculate_customer_rfms,
+    join_rfms,
+    IncrementalRFMS,
     process_rfms_binning
 )
                          
@@ -78,3 +83,93 @@ test_apply_risk_label()
 test_bin_rfms_score()
 test_apply_woe_binning()
 test_process_rfms_binning()
+
+# Testing the vectorized RFMS engine against the step-by-step functions
+def test_compute_rfms_matches_stepwise():
+    rng = np.random.default_rng(0)
+    customers = rng.integers(0, 50, size=1000)
+    per_customer = pd.DataFrame({
+        'Transaction_Count': rng.integers(1, 100, size=50),
+        'Total_Transaction_Amount': rng.normal(0, 1000, size=50),
+        'Std_Deviation_Transaction_Amount': np.where(rng.random(50) < 0.1, np.nan, rng.random(50) * 100),
+    })
+    df = pd.DataFrame({
+        'CustomerId': customers,
+        'Transaction_Year': rng.choice([2018, 2019], size=1000),
+    }).join(per_customer, on='CustomerId')
+
+    expected = bin_rfms_score(apply_risk_label(calculate_rfms_components(df.copy())))
+    actual = compute_rfms(df.copy())
+
+    for col in ['Recency', 'Frequency', 'Monetary', 'Stability', 'RFMS_Score', 'Risk_Label', 'RFMS_Binned']:
+        np.testing.assert_allclose(actual[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float), err_msg=col)
+
+# Testing the customer-level RFMS table and the on-demand join
+def test_customer_level_rfms():
+    df = pd.DataFrame({
+        'CustomerId': ['a', 'b', 'a', 'c', 'b'],
+        'Transaction_Year': [2018, 2019, 2019, 2018, 2018],
+        'Transaction_Count': [2, 2, 2, 1, 2],
+        'Total_Transaction_Amount': [300.0, 50.0, 300.0, 10.0, 50.0],
+        'Std_Deviation_Transaction_Amount': [10.0, 5.0, 10.0, np.nan, 5.0],
+    })
+    customer_df = build_customer_table(df)
+    assert customer_df.index.tolist() == ['a', 'b', 'c']
+    assert customer_df['Transaction_Year'].tolist() == [2019, 2019, 2018]
+
+    rfms_table = calculate_customer_rfms(customer_df)
+    assert rfms_table.loc['a', 'Risk_Label'] == 1
+    assert rfms_table.loc['c', 'RFMS_Score'] == 0.0
+
+    joined = join_rfms(pd.DataFrame({'CustomerId': ['c', 'a', 'x']}), rfms_table, columns=['RFMS_Score'])
+    assert list(joined.columns) == ['CustomerId', 'RFMS_Score']
+    assert joined['RFMS_Score'].iloc[1] == rfms_table.loc['a', 'RFMS_Score']
+    assert np.isnan(joined['RFMS_Score'].iloc[2])
+
+# Testing timestamp-based Recency against an as-of date
+def test_compute_rfms_as_of():
+    df = pd.DataFrame({
+        'CustomerId': ['a', 'b', 'a'],
+        'Transaction_Year': [2018, 2018, 2018],
+        'TransactionStartTime': ['2018-11-15T02:18:49Z', '2018-11-20T00:00:00Z', '2018-11-25T00:00:00Z'],
+        'Transaction_Count': [2, 1, 2],
+        'Total_Transaction_Amount': [100.0, 50.0, 100.0],
+        'Std_Deviation_Transaction_Amount': [1.0, 2.0, 1.0],
+    })
+    customer_df = build_customer_table(df, as_of='2018-12-01')
+    assert customer_df['Recency_Days'].tolist() == [6.0, 11.0]
+
+    final_df = compute_rfms(df, as_of='2018-12-01')
+    assert final_df['Recency'].tolist() == [1.0, 0.0, 1.0]  # 'a' was seen most recently
+
+# Testing the incremental RFMS updater
+def test_incremental_rfms_update():
+    rng = np.random.default_rng(1)
+    n = 300
+    transactions = pd.DataFrame({
+        'TransactionId': np.arange(n),
+        'CustomerId': rng.choice(list('abcdefgh'), size=n),
+        'Amount': rng.normal(100, 50, size=n),
+        'TransactionStartTime': pd.Timestamp('2018-11-15', tz='UTC') + pd.to_timedelta(np.sort(rng.integers(0, 3 * 86400, size=n)), unit='s'),
+    })
+    transactions.loc[n - 1, 'CustomerId'] = 'new'  # Customer first seen in the last batch
+    history, new_day = transactions.iloc[:250], transactions.iloc[250:]
+
+    incremental = IncrementalRFMS().fit(history)
+    before = incremental.rfms_table.copy()
+    refreshed = incremental.update(new_day)
+    full = IncrementalRFMS().fit(transactions)
+
+    touched = set(new_day['CustomerId'])
+    assert set(refreshed.index) == touched
+    assert 'new' in incremental.rfms_table.index
+
+    # Running aggregates and last-seen times match a rebuild over the full history
+    columns = ['count', 'total', 'mean', 'm2', 'transaction_count', 'Last_Transaction_Time']
+    pd.testing.assert_frame_equal(incremental.state.sort_index()[columns], full.state.sort_index()[columns], check_dtype=False)
+
+    # Untouched customers keep their scores; Recency_Days follows the new as-of date
+    untouched = sorted(set(before.index) - touched)
+    pd.testing.assert_series_equal(incremental.rfms_table.loc[untouched, 'RFMS_Score'], before.loc[untouched, 'RFMS_Score'])
+    assert incremental.as_of == transactions['TransactionStartTime'].max()
+    np.testing.assert_allclose(incremental.rfms_table.loc[untouched, 'Recency_Days'], full.rfms_table.loc[untouched, 'Recency_Days'])
@@ -0,0 +1,72 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from pytest import approx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from woe_iv import fit_woe_column, merge_to_monotonic, woe_from_counts, WoETransformer
+
+
+@pytest.fixture
+def woe_inputs(make_classification_data):
+    """A predictive column (a + b, which the label follows), a noise column with 50 missing values and a categorical one."""
+    X, y = make_classification_data(n=2000)
+    df = pd.DataFrame({
+        'Signal': X['a'] + X['b'],
+        'Noise': X['c'],
+        'Channel': pd.cut(X['d'], [-np.inf, -0.5, 0.5, np.inf], labels=['ChannelId_1', 'ChannelId_2', 'ChannelId_3']).astype(str),
+        'Risk_Label': y,
+    })
+    df.loc[:49, 'Noise'] = np.nan
+    return df
+
+
+def test_woe_from_counts_smoothing():
+    """Empty bins get a finite WoE and the IV parts are non-negative."""
+    woe, iv_parts = woe_from_counts([10, 0, 5], [20, 10, 5])
+    assert np.all(np.isfinite(woe))
+    assert np.all(iv_parts >= 0)
+
+
+def test_merge_to_monotonic():
+    edges, events, totals = merge_to_monotonic([1.0, 2.0, 3.0], [1, 5, 3, 9], [10, 10, 10, 10])
+    rates = events / totals
+    assert np.all(np.diff(rates) >= 0)
+    assert events.sum() == 18 and totals.sum() == 40
+    assert len(edges) == len(events) - 1
+
+
+def test_fit_woe_column_table(woe_inputs):
+    df = woe_inputs
+    _, spec = fit_woe_column('Noise', df['Noise'], df['Risk_Label'], n_bins=5)
+    table = spec['table']
+    assert table['count'].sum() == len(df)
+    assert table['bin'].iloc[-1] == 'Missing' and table['count'].iloc[-1] == 50
+    assert spec['iv'] == approx(table['iv'].sum())
+
+
+def test_woe_transformer_iv_and_transform(woe_inputs):
+    df = woe_inputs
+    transformer = WoETransformer(method='monotonic', n_bins=8, n_jobs=1).fit(df, 'Risk_Label')
+
+    assert transformer.iv_.index[0] == 'Signal'
+    assert transformer.iv_['Signal'] > 10 * transformer.iv_['Noise']
+    signal_table = transformer.woe_table('Signal').iloc[:-1]
+    assert signal_table['woe'].is_monotonic_increasing
+
+    woe_df = transformer.transform(df)
+    assert list(woe_df.columns) == ['Signal', 'Noise', 'Channel']
+    assert woe_df.notna().all().all()
+
+    # Unseen categories are neutral
+    unseen = transformer.transform(df.head(1).assign(Channel='ChannelId_9'))
+    assert unseen['Channel'].iloc[0] == 0.0
+
+
+def test_woe_transformer_parallel_matches_serial(woe_inputs):
+    df = woe_inputs
+    serial = WoETransformer(n_jobs=1).fit_transform(df, 'Risk_Label')
+    parallel = WoETransformer(n_jobs=2).fit_transform(df, 'Risk_Label')
+    pd.testing.assert_frame_equal(serial, parallel)